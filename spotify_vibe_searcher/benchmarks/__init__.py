@@ -0,0 +1 @@
+"""Offline benchmarks for the search stack (run with `uv run poe benchmark`)."""
@@ -0,0 +1,148 @@
+"""Recall and latency of ChromaDB's HNSW index across a grid of parameters.
+
+For every (M, construction_ef) pair a collection is built once and then
+queried at each search_ef, so the grid shows the recall/latency trade-off
+of every setting exposed as `CHROMADB_HNSW_*`. Exact search is the ground
+truth for recall@k.
+
+    uv run poe benchmark-hnsw --tracks 100000 --m 16 32 --search-ef 50 100 200
+    uv run poe benchmark-hnsw --snapshot  # use the embeddings of your synced library
+"""
+
+import argparse
+import itertools
+import tempfile
+import time
+
+import numpy as np
+from chromadb import Collection, PersistentClient
+from chromadb.api.client import SharedSystemClient
+from pydantic import BaseModel
+
+from spotify_vibe_searcher.infrastructure.vectordb import HnswParameters
+from spotify_vibe_searcher.utils import Settings
+
+from .vector_search import (
+    DEFAULT_DIMENSION,
+    BenchmarkResult,
+    build_collection,
+    hnsw_search,
+    load_engine,
+    perturbed_queries,
+    snapshot_embeddings,
+    summarize,
+    synthetic_embeddings,
+    time_queries,
+)
+
+
+class GridResult(BaseModel):
+    hnsw: HnswParameters
+    build_s: float
+    result: BenchmarkResult
+
+
+def with_search_ef(path: str, collection: Collection, search_ef: int) -> Collection:
+    """Change an existing index's search_ef and reopen it so queries use it.
+
+    search_ef is the one HNSW parameter ChromaDB can change after creation,
+    but an index already loaded in this process keeps its old value until
+    the client is recreated.
+    """
+    collection.modify(configuration={"hnsw": {"ef_search": search_ef}})
+    SharedSystemClient.clear_system_cache()
+    return PersistentClient(path=path).get_collection(collection.name)
+
+
+def run_grid(  # pylint: disable=too-many-locals
+    embeddings: np.ndarray,
+    queries: np.ndarray,
+    grid: list[HnswParameters],
+    search_efs: list[int],
+    n_results: int = 10,
+) -> list[GridResult]:
+    ids = [f"track-{i}" for i in range(len(embeddings))]
+    expected = load_engine(ids, embeddings).search(queries, n_results)[0]
+
+    results = []
+    with tempfile.TemporaryDirectory() as path:
+        for hnsw in grid:
+            start = time.perf_counter()
+            collection = build_collection(
+                PersistentClient(path=path), ids, embeddings, hnsw
+            )
+            build_s = time.perf_counter() - start
+
+            for search_ef in search_efs:
+                collection = with_search_ef(path, collection, search_ef)
+                found, latencies = time_queries(
+                    hnsw_search(collection, n_results), queries
+                )
+                results.append(
+                    GridResult(
+                        hnsw=hnsw.model_copy(update={"search_ef": search_ef}),
+                        build_s=build_s,
+                        result=summarize("hnsw", expected, found, latencies),
+                    )
+                )
+            PersistentClient(path=path).delete_collection(collection.name)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dimension", type=int, default=DEFAULT_DIMENSION)
+    parser.add_argument("-k", "--n-results", type=int, default=10)
+    parser.add_argument("--m", type=int, nargs="+", default=[16, 32])
+    parser.add_argument("--construction-ef", type=int, nargs="+", default=[100, 200])
+    parser.add_argument("--search-ef", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument(
+        "--sync-threshold", type=int, default=Settings.CHROMADB_HNSW_SYNC_THRESHOLD
+    )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Benchmark the embeddings of the configured collection",
+    )
+    parser.add_argument(
+        "--user-id", help="Library to snapshot when MULTI_TENANT is enabled"
+    )
+    args = parser.parse_args()
+
+    embeddings = (
+        snapshot_embeddings(args.user_id)
+        if args.snapshot
+        else synthetic_embeddings(args.tracks, args.dimension)
+    )
+    queries = perturbed_queries(embeddings, args.queries)
+    grid = [
+        HnswParameters(
+            m=m,
+            construction_ef=construction_ef,
+            sync_threshold=args.sync_threshold,
+        )
+        for m, construction_ef in itertools.product(args.m, args.construction_ef)
+    ]
+
+    results = run_grid(embeddings, queries, grid, args.search_ef, args.n_results)
+
+    print(
+        f"\n{len(embeddings)} tracks x {embeddings.shape[1]} dims, k={args.n_results}"
+    )
+    print(
+        f"{'M':>4}{'constr_ef':>11}{'search_ef':>11}{'build s':>9}"
+        f"{'recall@k':>10}{'p50 ms':>9}{'p99 ms':>9}"
+    )
+    for grid_result in results:
+        hnsw, result = grid_result.hnsw, grid_result.result
+        print(
+            f"{hnsw.m:>4}{hnsw.construction_ef:>11}{hnsw.search_ef:>11}"
+            f"{grid_result.build_s:>9.1f}{result.recall:>10.3f}"
+            f"{result.p50_ms:>9.2f}{result.p99_ms:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
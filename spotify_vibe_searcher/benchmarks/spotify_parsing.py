@@ -0,0 +1,167 @@
+"""Time and memory of parsing liked-song pages into domain objects.
+
+Compares validating each item into a `SavedTrack` with reading
+`TrackSummary` tuples without validation (the `SPOTIFY_LEAN_PARSING` sync
+path). Payloads are synthetic
+but shaped like Spotify's, including the markets and images that make
+real responses heavy.
+
+    uv run poe benchmark-parsing --tracks 20000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from pydantic import BaseModel
+
+from spotify_vibe_searcher.domain import SavedTrack, TrackSummary
+
+# Spotify's page size for liked songs
+PAGE_SIZE = 50
+
+# Roughly what Spotify lists per track and album
+N_MARKETS = 180
+N_IMAGES = 3
+
+Page = list[dict[str, Any]]
+
+
+class ParsingResult(BaseModel):
+    parser: str
+    ms_per_1k_tracks: float
+    bytes_per_track: float
+
+
+def synthetic_page(offset: int, size: int = PAGE_SIZE) -> Page:
+    """Saved-track items shaped like a `GET /me/tracks` page."""
+    markets = [f"M{i}" for i in range(N_MARKETS)]
+    images = [
+        {"url": f"https://i.scdn.co/image/{size_px}", "height": size_px}
+        for size_px in (640, 300, 64)[:N_IMAGES]
+    ]
+    added_at = datetime(2024, 1, 1, tzinfo=UTC)
+
+    items = []
+    for index in range(offset, offset + size):
+        artists = [
+            {
+                "id": f"artist-{index % 997}-{position}",
+                "name": f"Artist {index % 997} {position}",
+                "type": "artist",
+                "uri": f"spotify:artist:{index % 997}{position}",
+                "href": f"https://api.spotify.com/v1/artists/{index % 997}{position}",
+                "external_urls": {"spotify": "https://open.spotify.com/artist/x"},
+            }
+            for position in range(1 + index % 2)
+        ]
+        items.append({
+            "added_at": (added_at + timedelta(minutes=index)).isoformat(),
+            "track": {
+                "id": f"track-{index}",
+                "name": f"Track {index}",
+                "artists": artists,
+                "album": {
+                    "id": f"album-{index // 10}",
+                    "name": f"Album {index // 10}",
+                    "album_type": "album",
+                    "artists": artists,
+                    "images": images,
+                    "available_markets": markets,
+                    "release_date": "2020-01-01",
+                    "total_tracks": 10,
+                    "uri": f"spotify:album:{index // 10}",
+                    "external_urls": {"spotify": "https://open.spotify.com/album/x"},
+                },
+                "available_markets": markets,
+                "duration_ms": 200_000,
+                "explicit": False,
+                "popularity": index % 100,
+                "external_urls": {"spotify": f"https://open.spotify.com/track/{index}"},
+                "external_ids": {"isrc": f"ISRC{index}"},
+                "preview_url": None,
+                "uri": f"spotify:track:{index}",
+            },
+        })
+    return items
+
+
+def saved_tracks(page: Page) -> list[SavedTrack]:
+    return [SavedTrack.from_api_response(item) for item in page]
+
+
+def summaries(page: Page) -> list[TrackSummary]:
+    return [TrackSummary.from_api_response(item) for item in page]
+
+
+PARSERS: dict[str, Callable[[Page], list[Any]]] = {
+    "SavedTrack": saved_tracks,
+    "TrackSummary": summaries,
+}
+
+
+def measure(
+    name: str, parse: Callable[[Page], list[Any]], pages: list[Page], repeats: int
+) -> ParsingResult:
+    n_tracks = sum(len(page) for page in pages)
+
+    # Best of several runs with the collector paused: collections triggered
+    # by the previous parser's garbage otherwise dominate the timings
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for page in pages:
+                parse(page)
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        gc.enable()
+
+    # Memory is measured separately: tracing slows parsing down several-fold
+    gc.collect()
+    tracemalloc.start()
+    parsed = [parse(page) for page in pages]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+
+    return ParsingResult(
+        parser=name,
+        ms_per_1k_tracks=min(timings) / n_tracks * 1000,
+        bytes_per_track=retained / n_tracks,
+    )
+
+
+def run_benchmark(n_tracks: int, repeats: int = 5) -> list[ParsingResult]:
+    pages = [
+        synthetic_page(offset, min(PAGE_SIZE, n_tracks - offset))
+        for offset in range(0, n_tracks, PAGE_SIZE)
+    ]
+    return [measure(name, parse, pages, repeats) for name, parse in PARSERS.items()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=20_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.tracks, args.repeats)
+
+    print(f"\n{args.tracks} tracks in pages of {PAGE_SIZE}")
+    print(f"{'parser':<14}{'ms/1k':>10}{'bytes/track':>13}")
+    for result in results:
+        print(
+            f"{result.parser:<14}{result.ms_per_1k_tracks:>10.1f}"
+            f"{result.bytes_per_track:>13.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Recall, latency and memory of exact NumPy search against ChromaDB's HNSW index.
+
+Every engine answers the same queries over the same embeddings, including the
+document and metadata fetch a real search needs. Exact float32 search is the
+ground truth for recall@k. The float16 and int8 engines store a quantized
+matrix and re-score an over-fetched candidate list in float32, as the
+repository does with `VECTOR_QUANTIZATION`.
+
+    uv run poe benchmark --tracks 5000 --queries 200
+    uv run poe benchmark --snapshot  # use the embeddings of your synced library
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+
+import numpy as np
+from chromadb import Collection, PersistentClient
+from chromadb.api import ClientAPI
+from pydantic import BaseModel
+
+from spotify_vibe_searcher.infrastructure import VectorDBRepository
+from spotify_vibe_searcher.infrastructure.vectordb import (
+    ExactSearchEngine,
+    HnswParameters,
+)
+from spotify_vibe_searcher.infrastructure.vectordb.exact import Quantization, rescore
+from spotify_vibe_searcher.utils import Settings
+
+# ChromaDB rejects very large single add() calls
+ADD_BATCH_SIZE = 5000
+
+# nomic-embed-text output size
+DEFAULT_DIMENSION = 768
+
+
+class BenchmarkResult(BaseModel):
+    engine: str
+    recall: float
+    p50_ms: float
+    p99_ms: float
+    bytes_per_vector: float | None = None
+
+
+def synthetic_embeddings(
+    n_tracks: int, dimension: int, n_clusters: int = 50, seed: int = 0
+) -> np.ndarray:
+    """Clustered unit vectors, closer to real vibe embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dimension), dtype=np.float32)
+    labels = rng.integers(n_clusters, size=n_tracks)
+    noise = rng.standard_normal((n_tracks, dimension), dtype=np.float32)
+    embeddings = centers[labels] + 0.5 * noise
+    normalized: np.ndarray = embeddings / np.linalg.norm(
+        embeddings, axis=1, keepdims=True
+    )
+    return normalized
+
+
+def snapshot_embeddings(user_id: str | None = None) -> np.ndarray:
+    """Embeddings of a user's library, read through the configured vector backend."""
+    records = VectorDBRepository.for_user(user_id).store.get(
+        include_embeddings=True, include_documents=False
+    )
+    return np.stack([
+        record.embedding for record in records if record.embedding is not None
+    ]).astype(np.float32)
+
+
+def perturbed_queries(
+    embeddings: np.ndarray, n_queries: int, seed: int = 1
+) -> np.ndarray:
+    """Library vectors plus noise, like a vibe close to known songs."""
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(len(embeddings), size=n_queries)
+    return embeddings[picks] + 0.3 * rng.standard_normal(  # type: ignore[no-any-return]
+        (n_queries, embeddings.shape[1]), dtype=np.float32
+    )
+
+
+def recall_at_k(
+    expected: Sequence[Sequence[str]], found: Sequence[Sequence[str]]
+) -> float:
+    """Mean fraction of the true top-k that was returned, over all queries."""
+    hits = [
+        len(set(truth) & set(result)) / len(truth)
+        for truth, result in zip(expected, found, strict=True)
+        if truth
+    ]
+    return float(np.mean(hits)) if hits else 1.0
+
+
+def time_queries(
+    search: Callable[[list[float]], list[str]], queries: np.ndarray
+) -> tuple[list[list[str]], list[float]]:
+    results, latencies = [], []
+    for query in queries.tolist():
+        start = time.perf_counter()
+        results.append(search(query))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, latencies
+
+
+def summarize(
+    engine: str,
+    expected: list[list[str]],
+    found: list[list[str]],
+    latencies: list,
+    bytes_per_vector: float | None = None,
+) -> BenchmarkResult:
+    return BenchmarkResult(
+        engine=engine,
+        recall=recall_at_k(expected, found),
+        p50_ms=float(np.percentile(latencies, 50)),
+        p99_ms=float(np.percentile(latencies, 99)),
+        bytes_per_vector=bytes_per_vector,
+    )
+
+
+def load_engine(
+    ids: list[str], embeddings: np.ndarray, quantization: Quantization = "none"
+) -> ExactSearchEngine:
+    engine = ExactSearchEngine(quantization=quantization)
+    engine.load(ids, embeddings)
+    return engine
+
+
+def build_collection(
+    client: ClientAPI,
+    ids: list[str],
+    embeddings: np.ndarray,
+    hnsw: HnswParameters | None = None,
+) -> Collection:
+    collection = client.create_collection(
+        "benchmark",
+        embedding_function=None,
+        metadata=(hnsw or HnswParameters()).to_metadata(),
+    )
+    for start in range(0, len(ids), ADD_BATCH_SIZE):
+        batch = slice(start, start + ADD_BATCH_SIZE)
+        collection.add(
+            ids=ids[batch],
+            embeddings=embeddings[batch],
+            documents=[f"Vibe description of {track_id}" for track_id in ids[batch]],
+            metadatas=[{"track_id": track_id} for track_id in ids[batch]],
+        )
+    return collection
+
+
+def hnsw_search(
+    collection: Collection, n_results: int
+) -> Callable[[list[float]], list[str]]:
+    """Queries answered by the collection's HNSW index, with the record fetch."""
+
+    def search(query: list[float]) -> list[str]:
+        results = collection.query(
+            query_embeddings=np.asarray([query], dtype=np.float32),
+            n_results=n_results,
+            include=["documents", "metadatas", "distances"],
+        )
+        return results["ids"][0]
+
+    return search
+
+
+def rescored_search(
+    engine: ExactSearchEngine,
+    collection: Collection,
+    n_results: int,
+    rescore_factor: int,
+) -> Callable[[list[float]], list[str]]:
+    """Quantized candidates re-ranked with the collection's float32 embeddings."""
+
+    def search(query: list[float]) -> list[str]:
+        candidates = engine.search([query], n_results * rescore_factor)[0]
+        results = collection.get(
+            ids=candidates[0], include=["documents", "metadatas", "embeddings"]
+        )
+        stored = dict(zip(results["ids"], results["embeddings"], strict=True))  # type: ignore[arg-type]
+        return rescore([query], candidates, stored, n_results)[0][0]
+
+    return search
+
+
+def run_benchmark(  # pylint: disable=too-many-locals
+    embeddings: np.ndarray,
+    queries: np.ndarray,
+    n_results: int = 10,
+    rescore_factor: int = 4,
+) -> list[BenchmarkResult]:
+    ids = [f"track-{i}" for i in range(len(embeddings))]
+    engine = load_engine(ids, embeddings)
+
+    with tempfile.TemporaryDirectory() as path:
+        collection = build_collection(PersistentClient(path=path), ids, embeddings)
+
+        def exact(query: list[float]) -> list[str]:
+            top_ids = engine.search([query], n_results)[0][0]
+            collection.get(ids=top_ids, include=["documents", "metadatas"])
+            return top_ids
+
+        exact_ids, exact_latencies = time_queries(exact, queries)
+        hnsw_ids, hnsw_latencies = time_queries(
+            hnsw_search(collection, n_results), queries
+        )
+        results = [
+            summarize(
+                "exact",
+                exact_ids,
+                exact_ids,
+                exact_latencies,
+                engine.nbytes / engine.size,
+            ),
+            summarize("hnsw", exact_ids, hnsw_ids, hnsw_latencies),
+        ]
+
+        quantizations: tuple[Quantization, ...] = ("float16", "int8")
+        for quantization in quantizations:
+            quantized = load_engine(ids, embeddings, quantization)
+            found, latencies = time_queries(
+                rescored_search(quantized, collection, n_results, rescore_factor),
+                queries,
+            )
+            results.append(
+                summarize(
+                    quantization,
+                    exact_ids,
+                    found,
+                    latencies,
+                    quantized.nbytes / quantized.size,
+                )
+            )
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dimension", type=int, default=DEFAULT_DIMENSION)
+    parser.add_argument("-k", "--n-results", type=int, default=10)
+    parser.add_argument(
+        "--rescore-factor",
+        type=int,
+        default=Settings.QUANTIZATION_RESCORE_FACTOR,
+        help="Candidates per result re-scored in float32 by quantized engines",
+    )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Benchmark the embeddings of the configured collection",
+    )
+    parser.add_argument(
+        "--user-id", help="Library to snapshot when MULTI_TENANT is enabled"
+    )
+    args = parser.parse_args()
+
+    embeddings = (
+        snapshot_embeddings(args.user_id)
+        if args.snapshot
+        else synthetic_embeddings(args.tracks, args.dimension)
+    )
+    queries = perturbed_queries(embeddings, args.queries)
+
+    results = run_benchmark(embeddings, queries, args.n_results, args.rescore_factor)
+
+    print(
+        f"\n{len(embeddings)} tracks x {embeddings.shape[1]} dims, k={args.n_results}"
+    )
+    print(f"{'engine':<8}{'recall@k':>10}{'p50 ms':>10}{'p99 ms':>10}{'bytes/vec':>11}")
+    for result in results:
+        memory = (
+            "-" if result.bytes_per_vector is None else f"{result.bytes_per_vector:.0f}"
+        )
+        print(
+            f"{result.engine:<8}{result.recall:>10.3f}"
+            f"{result.p50_ms:>10.2f}{result.p99_ms:>10.2f}{memory:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
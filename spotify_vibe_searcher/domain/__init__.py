@@ -1,17 +1,28 @@
-from .search import SearchResult, SearchResults
-from .sync import EnrichedTrack, SyncProgress
-from .track import SavedTrack, SpotifyAlbum, SpotifyArtist, SpotifyImage, SpotifyTrack
+from .search import SearchMode, SearchResult, SearchResults, SeedStrategy
+from .sync import EnrichedTrack, MigrationProgress, SyncProgress
+from .track import (
+    SavedTrack,
+    SpotifyAlbum,
+    SpotifyArtist,
+    SpotifyImage,
+    SpotifyTrack,
+    TrackSummary,
+)
 from .user import SpotifyUser
 
 __all__ = [
     "EnrichedTrack",
+    "MigrationProgress",
     "SavedTrack",
+    "SearchMode",
     "SearchResult",
     "SearchResults",
+    "SeedStrategy",
     "SpotifyAlbum",
     "SpotifyArtist",
     "SpotifyImage",
     "SpotifyTrack",
     "SpotifyUser",
     "SyncProgress",
+    "TrackSummary",
 ]
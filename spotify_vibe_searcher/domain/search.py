@@ -1,6 +1,18 @@
+from enum import Enum
+
 from pydantic import BaseModel, Field
 
 
+class SearchMode(Enum):
+    VECTOR = "vector"  # Semantic similarity over vibe embeddings only
+    HYBRID = "hybrid"  # Semantic similarity fused with exact term matches
+
+
+class SeedStrategy(Enum):
+    CENTROID = "centroid"  # One query at the mean of the seed embeddings
+    FUSION = "fusion"  # One query per seed, rankings merged with RRF
+
+
 class SearchResult(BaseModel):
     track_id: str
     track_name: str = Field(default="")
@@ -22,6 +34,11 @@ class SearchResults(BaseModel):
     query: str
     results: list[SearchResult] = Field(default_factory=list)
     total_results: int
+    query_embedding: list[float] | None = Field(
+        default=None,
+        repr=False,
+        description="Vector the results were retrieved with, for relevance feedback",
+    )
 
     @property
     def has_results(self) -> bool:
@@ -14,6 +14,17 @@ class SyncProgress(BaseModel):
     artist_name: str
 
 
+class MigrationProgress(BaseModel):
+    """Progress of a bulk pass over the stored library.
+
+    Used when re-embedding with a new model and when exporting or
+    importing a snapshot.
+    """
+
+    current: int
+    total: int
+
+
 class EnrichedTrack(BaseModel):
     """Track enriched with lyrics and AI-generated vibe description."""
 
@@ -1,9 +1,12 @@
+from .embedding import EmbeddingClient
 from .genius import GeniusClient
 from .llm import LLMClient
-from .spotify import SpotifyAuthManager, SpotifyClient
+from .spotify import AsyncSpotifyClient, SpotifyAuthManager, SpotifyClient
 from .vectordb import VectorDBRepository
 
 __all__ = [
+    "AsyncSpotifyClient",
+    "EmbeddingClient",
     "GeniusClient",
     "LLMClient",
     "SpotifyAuthManager",
@@ -0,0 +1,6 @@
+"""Embedding infrastructure exports."""
+
+from .cache import EmbeddingCache
+from .client import EmbeddingClient
+
+__all__ = ["EmbeddingCache", "EmbeddingClient"]
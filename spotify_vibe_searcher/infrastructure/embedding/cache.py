@@ -0,0 +1,135 @@
+"""Content-addressed on-disk cache of document embeddings."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+from pydantic import BaseModel, PrivateAttr
+
+from spotify_vibe_searcher.utils import LogLevel, Settings, log
+
+from .config import SQLITE_BATCH_SIZE
+
+
+class EmbeddingCache(BaseModel):
+    """SQLite store of embeddings keyed by model name and document hash.
+
+    Vectors are kept as raw float32 bytes, so re-indexing unchanged text with
+    an unchanged model reads them back instead of calling the model. Once
+    more than `max_entries` vectors are stored the least recently used ones
+    are evicted; `max_entries=0` disables the cache.
+    """
+
+    max_entries: int = 100_000
+
+    _connection: Optional[sqlite3.Connection] = None  # noqa
+    # Number of stored vectors, counted once and then kept up to date by put()
+    _count: Optional[int] = None  # noqa
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def from_settings(cls) -> "EmbeddingCache":
+        return cls(max_entries=Settings.EMBEDDING_CACHE_SIZE)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Lazy-load the SQLite connection and create the table."""
+        if self._connection is None:
+            Settings.EMBEDDING_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            log(
+                f"Initializing embedding cache at {Settings.EMBEDDING_CACHE_PATH}",
+                LogLevel.INFO,
+            )
+            # Shared across threads (background embedding during sync), so every
+            # statement is serialized by self._lock.
+            connection = sqlite3.connect(
+                Settings.EMBEDDING_CACHE_PATH, check_same_thread=False
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key BLOB PRIMARY KEY, vector BLOB NOT NULL, last_used INTEGER "
+                "NOT NULL) WITHOUT ROWID"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_last_used "
+                "ON embeddings (last_used)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def get(self, model: str, documents: Sequence[str]) -> list[np.ndarray | None]:
+        """Cached vector of each document under `model`, or None if missing."""
+        if self.max_entries <= 0 or not documents:
+            return [None] * len(documents)
+
+        keys = [self._key(model, document) for document in documents]
+        found: dict[bytes, np.ndarray] = {}
+        with self._lock, self.connection:
+            for start in range(0, len(keys), SQLITE_BATCH_SIZE):
+                batch = keys[start : start + SQLITE_BATCH_SIZE]
+                rows = self.connection.execute(
+                    "SELECT key, vector FROM embeddings "
+                    f"WHERE key IN ({', '.join('?' for _ in batch)})",
+                    batch,
+                ).fetchall()
+                found.update(
+                    (key, np.frombuffer(vector, dtype=np.float32))
+                    for key, vector in rows
+                )
+            if found:
+                now = time.time_ns()
+                self.connection.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+        return [found.get(key) for key in keys]
+
+    def put(self, model: str, documents: Sequence[str], embeddings: np.ndarray) -> None:
+        if self.max_entries <= 0 or not documents:
+            return
+
+        now = time.time_ns()
+        rows = [
+            (self._key(model, document), np.asarray(vector, np.float32).tobytes(), now)
+            for document, vector in zip(documents, embeddings, strict=True)
+        ]
+        with self._lock, self.connection:
+            if self._count is None:
+                (self._count,) = self.connection.execute(
+                    "SELECT COUNT(*) FROM embeddings"
+                ).fetchone()
+            # Vectors of a key never change, so existing rows are only touched
+            inserted = self.connection.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_used) "
+                "VALUES (?, ?, ?)",
+                rows,
+            ).rowcount
+            self.connection.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                [(now, key) for key, _, _ in rows],
+            )
+            self._count += inserted
+            if self._count > self.max_entries:
+                self._count -= self.connection.execute(
+                    "DELETE FROM embeddings WHERE key IN (SELECT key FROM "
+                    "embeddings ORDER BY last_used LIMIT ?)",
+                    (self._count - self.max_entries,),
+                ).rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            row = self.connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return int(row[0])
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            self._count = None
+
+    def _key(self, model: str, document: str) -> bytes:  # pylint: disable=no-self-use
+        return hashlib.sha256(f"{model}\0{document}".encode()).digest()
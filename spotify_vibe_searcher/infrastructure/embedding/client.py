@@ -0,0 +1,64 @@
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+
+import numpy as np
+import stamina
+from ollama import Client
+from pydantic import BaseModel
+
+from spotify_vibe_searcher.utils import LogLevel, Settings, log
+
+from .config import is_retryable
+
+
+class EmbeddingClient(BaseModel):
+    """Batched, concurrent client for Ollama's embed endpoint.
+
+    Documents are split into batches of `EMBEDDING_BATCH_SIZE` and sent as
+    list inputs, up to `EMBEDDING_CONCURRENCY` batches at a time over one
+    pooled HTTP session. Each batch is retried on its own, so a transient
+    failure only repeats that batch.
+    """
+
+    @cached_property
+    def client(self) -> Client:
+        return Client(
+            host=Settings.EMBEDDING_BASE_URL, timeout=Settings.EMBEDDING_TIMEOUT
+        )
+
+    @cached_property
+    def executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            max_workers=Settings.EMBEDDING_CONCURRENCY,
+            thread_name_prefix="embedding",
+        )
+
+    def embed(self, documents: Sequence[str], model: str | None = None) -> np.ndarray:
+        """Embed documents, returning one float32 row per document in order.
+
+        Args:
+            documents: Texts to embed.
+            model: Embedding model, `EMBEDDING_MODEL` by default.
+        """
+        if not documents:
+            return np.empty((0, 0), dtype=np.float32)
+
+        model = model or Settings.EMBEDDING_MODEL
+        size = Settings.EMBEDDING_BATCH_SIZE
+        batches = [documents[i : i + size] for i in range(0, len(documents), size)]
+        if len(batches) == 1:
+            return self._embed_batch(batches[0], model)
+
+        log(
+            f"Embedding {len(documents)} documents in {len(batches)} batches",
+            LogLevel.DEBUG,
+        )
+        return np.vstack(
+            list(self.executor.map(self._embed_batch, batches, [model] * len(batches)))
+        )
+
+    @stamina.retry(on=is_retryable, attempts=3)
+    def _embed_batch(self, documents: Sequence[str], model: str) -> np.ndarray:
+        response = self.client.embed(model=model, input=documents)
+        return np.asarray(response["embeddings"], dtype=np.float32)
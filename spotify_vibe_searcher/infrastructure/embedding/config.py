@@ -0,0 +1,20 @@
+import httpx
+from ollama import ResponseError
+
+# ollama re-raises connection failures as ConnectionError; timeouts and other
+# transport errors surface as httpx exceptions
+TRANSPORT_ERRORS = (httpx.TransportError, ConnectionError, TimeoutError)
+
+# Keys per `IN (...)` lookup, well below SQLite's bound-parameter limit
+SQLITE_BATCH_SIZE = 500
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an embedding request may succeed if sent again.
+
+    Server errors (e.g. while Ollama loads the model) are retried alongside
+    transport failures; 4xx responses such as an unknown model are not.
+    """
+    if isinstance(error, ResponseError):
+        return error.status_code >= 500
+    return isinstance(error, TRANSPORT_ERRORS)
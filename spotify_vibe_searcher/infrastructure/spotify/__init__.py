@@ -1,4 +1,12 @@
+from .async_client import AsyncSpotifyClient
 from .auth_manager import SpotifyAuthManager
+from .cache import CachedResponse, SpotifyResponseCache
 from .client import SpotifyClient
 
-__all__ = ["SpotifyAuthManager", "SpotifyClient"]
+__all__ = [
+    "AsyncSpotifyClient",
+    "CachedResponse",
+    "SpotifyAuthManager",
+    "SpotifyClient",
+    "SpotifyResponseCache",
+]
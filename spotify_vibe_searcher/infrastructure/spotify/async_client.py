@@ -0,0 +1,248 @@
+"""Asynchronous Spotify API client on a pooled HTTP/2 connection."""
+
+import asyncio
+from collections.abc import Callable, Iterable
+from itertools import batched
+from types import TracebackType
+from typing import Any, Optional, Self, TypeVar
+from urllib.parse import urlencode
+
+import httpx
+import stamina
+from pydantic import BaseModel
+
+from spotify_vibe_searcher.domain import SavedTrack, TrackSummary
+from spotify_vibe_searcher.domain.track import SpotifyArtist
+from spotify_vibe_searcher.utils import Settings
+from spotify_vibe_searcher.utils.logger import LogLevel, log
+
+from .cache import CachedResponse, SpotifyResponseCache
+from .config import (
+    SPOTIFY_API_URL,
+    SPOTIFY_ARTIST_BATCH_SIZE,
+    SPOTIFY_PAGE_SIZE,
+    SPOTIFY_REQUEST_TIMEOUT,
+    async_retry_backoff,
+)
+
+T = TypeVar("T")
+PageParser = Callable[[CachedResponse], tuple[int, list[T]]]
+
+
+class AsyncSpotifyClient(BaseModel):
+    """Spotify client that fetches liked-song pages and artist batches concurrently.
+
+    Requests share one HTTP/2 connection pool, opened with `async with` and
+    bound to that event loop, and at most `SPOTIFY_CONCURRENCY` are in
+    flight at once. Transport errors, 5xx and 429 responses are retried,
+    the latter after their `Retry-After` delay.
+
+    With `SPOTIFY_CACHE` and a `user_id`, responses are stored per user in
+    the shared `SpotifyResponseCache` and revalidated with conditional
+    requests; pages of liked songs that come back 304 are not parsed again.
+    `SPOTIFY_OFFLINE` serves every request from that cache. Without a
+    `user_id` nothing is cached.
+
+    `get_all_track_summaries` reads a whole library as lightweight
+    `TrackSummary` tuples; `get_liked_songs_at` then parses only the
+    positions that need a full `SavedTrack`.
+
+        async with AsyncSpotifyClient(access_token=token) as client:
+            tracks = await client.get_all_liked_songs(max_tracks=500)
+    """
+
+    access_token: str
+    user_id: str | None = None
+
+    _http: Optional[httpx.AsyncClient] = None  # noqa
+    _semaphore: Optional[asyncio.Semaphore] = None  # noqa
+    _cache: Optional[SpotifyResponseCache] = None  # noqa
+
+    async def __aenter__(self) -> Self:
+        self._http = httpx.AsyncClient(
+            base_url=SPOTIFY_API_URL,
+            headers={"Authorization": f"Bearer {self.access_token}"},
+            http2=True,
+            limits=httpx.Limits(max_connections=Settings.SPOTIFY_CONCURRENCY),
+            timeout=SPOTIFY_REQUEST_TIMEOUT,
+        )
+        self._semaphore = asyncio.Semaphore(Settings.SPOTIFY_CONCURRENCY)
+        use_cache = Settings.SPOTIFY_CACHE or Settings.SPOTIFY_OFFLINE
+        if use_cache and self.user_id is None:
+            # Keys are scoped by user, so an anonymous client could read and
+            # overwrite the cached library of every other anonymous caller
+            log("No Spotify user ID; skipping the response cache.", LogLevel.WARNING)
+        elif use_cache:
+            self._cache = SpotifyResponseCache.shared()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+        self._http = None
+        self._semaphore = None
+        self._cache = None
+
+    async def get_liked_songs(
+        self, limit: int = SPOTIFY_PAGE_SIZE, offset: int = 0
+    ) -> dict[str, Any]:
+        response = await self._get("me/tracks", {"limit": limit, "offset": offset})
+        return response.payload
+
+    async def get_all_liked_songs(self, max_tracks: int = 500) -> list[SavedTrack]:
+        log(f"Fetching up to {max_tracks} liked songs...", LogLevel.INFO)
+        pages = await self._liked_song_pages(max_tracks, _parse_liked_songs)
+        result = [_detached(saved_track) for page in pages for saved_track in page][
+            :max_tracks
+        ]
+        log(f"Fetched {len(result)} liked songs.", LogLevel.INFO)
+        return result
+
+    async def get_all_track_summaries(
+        self, max_tracks: int = 500
+    ) -> list[TrackSummary]:
+        """Liked songs as `TrackSummary` tuples, skipping model validation."""
+        log(f"Fetching up to {max_tracks} liked song summaries...", LogLevel.INFO)
+        pages = await self._liked_song_pages(max_tracks, _parse_track_summaries)
+        result = [summary for page in pages for summary in page][:max_tracks]
+        log(f"Fetched {len(result)} liked song summaries.", LogLevel.INFO)
+        return result
+
+    async def get_liked_songs_at(self, positions: Iterable[int]) -> list[SavedTrack]:
+        """Fully parsed liked songs at the given library positions.
+
+        Only the pages holding those positions are requested and parsed, so
+        after `get_all_track_summaries` they are usually revalidated or
+        served from the cache.
+        """
+        wanted = sorted(set(positions))
+        offsets = sorted({
+            position - position % SPOTIFY_PAGE_SIZE for position in wanted
+        })
+        pages = dict(
+            zip(
+                offsets,
+                await asyncio.gather(
+                    *(
+                        self._liked_songs_page(offset, _parse_liked_songs)
+                        for offset in offsets
+                    )
+                ),
+                strict=True,
+            )
+        )
+
+        result = []
+        for position in wanted:
+            _, page = pages[position - position % SPOTIFY_PAGE_SIZE]
+            if position % SPOTIFY_PAGE_SIZE < len(page):
+                result.append(_detached(page[position % SPOTIFY_PAGE_SIZE]))
+        return result
+
+    async def get_artists(self, artist_ids: list[str]) -> list[SpotifyArtist]:
+        unique_ids = sorted(set(artist_ids))
+        log(f"Fetching {len(unique_ids)} unique artists...", LogLevel.INFO)
+
+        responses = await asyncio.gather(
+            *(
+                self._get("artists", {"ids": ",".join(batch)})
+                for batch in batched(unique_ids, SPOTIFY_ARTIST_BATCH_SIZE)
+            )
+        )
+        all_artists = [
+            SpotifyArtist.from_api_response(artist)
+            for response in responses
+            for artist in response.payload.get("artists", [])
+            if artist
+        ]
+
+        log(f"Retrieved {len(all_artists)} artists.", LogLevel.INFO)
+        return all_artists
+
+    async def _liked_song_pages(
+        self, max_tracks: int, parse: PageParser[T]
+    ) -> list[list[T]]:
+        """Every page of liked songs up to `max_tracks`, parsed with `parse`."""
+        # The first page reports the library size, so the rest go out at once
+        total, first_page = await self._liked_songs_page(0, parse)
+        return [first_page] + [
+            items
+            for _, items in await asyncio.gather(
+                *(
+                    self._liked_songs_page(offset, parse)
+                    for offset in range(
+                        SPOTIFY_PAGE_SIZE, min(max_tracks, total), SPOTIFY_PAGE_SIZE
+                    )
+                )
+            )
+        ]
+
+    async def _liked_songs_page(
+        self, offset: int, parse: PageParser[T]
+    ) -> tuple[int, list[T]]:
+        """Library size and the page of liked songs starting at `offset`."""
+        response = await self._get(
+            "me/tracks", {"limit": SPOTIFY_PAGE_SIZE, "offset": offset}
+        )
+        if self._cache is None:
+            return parse(response)
+        return self._cache.parsed(response, parse)
+
+    @stamina.retry(on=async_retry_backoff, attempts=3)
+    async def _get(self, path: str, params: dict[str, Any]) -> CachedResponse:
+        if self._http is None or self._semaphore is None:
+            raise RuntimeError("AsyncSpotifyClient must be used with 'async with'")
+
+        key = f"{self.user_id}:{path}?{urlencode(params)}"
+        cached = self._cache.get(key) if self._cache is not None else None
+        if Settings.SPOTIFY_OFFLINE:
+            if cached is None:
+                raise LookupError(f"{path}?{urlencode(params)} is not cached")
+            return cached
+
+        async with self._semaphore:
+            response = await self._http.get(
+                path,
+                params=params,
+                headers=cached.conditional_headers() if cached else None,
+            )
+        if response.status_code == httpx.codes.NOT_MODIFIED and cached is not None:
+            return cached
+        response.raise_for_status()
+
+        fresh = CachedResponse(
+            key=key,
+            body=response.content,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+        if self._cache is not None:
+            self._cache.put(fresh)
+        return fresh
+
+
+def _parse_liked_songs(response: CachedResponse) -> tuple[int, list[SavedTrack]]:
+    payload = response.payload
+    return payload.get("total", 0), [
+        SavedTrack.from_api_response(item) for item in payload.get("items", [])
+    ]
+
+
+def _parse_track_summaries(
+    response: CachedResponse,
+) -> tuple[int, list[TrackSummary]]:
+    payload = response.payload
+    return payload.get("total", 0), [
+        TrackSummary.from_api_response(item) for item in payload.get("items", [])
+    ]
+
+
+def _detached(saved_track: SavedTrack) -> SavedTrack:
+    """A copy down to the track: parsed pages may be shared with earlier
+    syncs, and syncing replaces each track's artists."""
+    return saved_track.model_copy(update={"track": saved_track.track.model_copy()})
@@ -0,0 +1,153 @@
+"""On-disk cache of Spotify API responses, revalidated with conditional requests."""
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from functools import cache
+from pathlib import Path
+from typing import Any, Optional, TypeVar
+
+from pydantic import BaseModel, PrivateAttr
+
+from spotify_vibe_searcher.utils import LogLevel, Settings, log
+
+T = TypeVar("T")
+
+
+class CachedResponse(BaseModel):
+    """Raw body of a GET response plus the validators Spotify sent with it."""
+
+    key: str
+    body: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def validator(self) -> str | None:
+        """Identifies this version of the body, if the server provided one."""
+        return self.etag or self.last_modified
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers asking the server to answer 304 if the body is unchanged."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    @property
+    def payload(self) -> dict[str, Any]:
+        """The decoded JSON body."""
+        return json.loads(self.body)  # type: ignore[no-any-return]
+
+
+class SpotifyResponseCache(BaseModel):
+    """SQLite store of Spotify GET responses keyed by user and URL.
+
+    Bodies are kept verbatim with their ETag / Last-Modified, so a later
+    sync sends conditional requests and a 304 costs no download. Objects
+    parsed from a body (e.g. a page of `SavedTrack`) are memoized per
+    validator, so unchanged pages are not parsed again either. With
+    `SPOTIFY_OFFLINE` the stored bodies are served without any request.
+
+    One instance per file (see `shared`) is used by every client.
+    """
+
+    path: Path
+
+    _connection: Optional[sqlite3.Connection] = None  # noqa
+    _parsed: dict[tuple[str, Callable[..., Any]], tuple[str, Any]] = PrivateAttr(
+        default_factory=dict
+    )
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @staticmethod
+    def shared() -> "SpotifyResponseCache":
+        """The cache for the configured data directory."""
+        return _shared_cache(Settings.SPOTIFY_CACHE_PATH)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Lazy-load the SQLite connection and create the table."""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            log(f"Initializing Spotify response cache at {self.path}", LogLevel.INFO)
+            # Shared by the syncs of every Streamlit session (each on its own
+            # thread), so every statement is serialized by self._lock.
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, "
+                "body BLOB NOT NULL, etag TEXT, last_modified TEXT, "
+                "stored_at INTEGER NOT NULL) WITHOUT ROWID"
+            )
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT body, etag, last_modified FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified = row
+        return CachedResponse(
+            key=key, body=body, etag=etag, last_modified=last_modified
+        )
+
+    def put(self, response: CachedResponse) -> None:
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, body, etag, last_modified, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (
+                    response.key,
+                    response.body,
+                    response.etag,
+                    response.last_modified,
+                    time.time_ns(),
+                ),
+            )
+
+    def parsed(
+        self, response: CachedResponse, parse: Callable[[CachedResponse], T]
+    ) -> T:
+        """`parse(response)`, reused while the response keeps its validator.
+
+        Callers must not mutate the returned object.
+        """
+        validator, key = response.validator, (response.key, parse)
+        with self._lock:
+            hit = self._parsed.get(key)
+        if validator is not None and hit is not None and hit[0] == validator:
+            return hit[1]  # type: ignore[no-any-return]
+
+        value = parse(response)
+        if validator is not None:
+            with self._lock:
+                self._parsed[key] = (validator, value)
+        return value
+
+    def count(self) -> int:
+        with self._lock:
+            row = self.connection.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return int(row[0])
+
+    def clear(self) -> None:
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM responses")
+            self._parsed.clear()
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+@cache
+def _shared_cache(path: Path) -> SpotifyResponseCache:
+    return SpotifyResponseCache(path=path)
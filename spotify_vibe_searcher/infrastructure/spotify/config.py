@@ -1,3 +1,33 @@
+import httpx
 from spotipy.exceptions import SpotifyException
 
 RETRY_ON = (SpotifyException, ConnectionError, TimeoutError)
+ASYNC_TRANSPORT_ERRORS = (httpx.TransportError, ConnectionError, TimeoutError)
+
+SPOTIFY_API_URL = "https://api.spotify.com/v1/"
+SPOTIFY_REQUEST_TIMEOUT = 5.0  # Seconds, spotipy's default
+SPOTIFY_PAGE_SIZE = 50  # Most liked songs per page
+SPOTIFY_ARTIST_BATCH_SIZE = 50  # Most artists per request
+
+# Longest Retry-After (seconds) worth waiting for; longer rate limits are raised
+SPOTIFY_MAX_RETRY_AFTER = 30.0
+
+
+def async_retry_backoff(error: Exception) -> bool | float:
+    """Whether an async Spotify request may succeed if sent again.
+
+    Transport failures and 5xx responses are retried with the default backoff,
+    and 429 responses after their `Retry-After` delay. Other 4xx responses
+    (an expired token, a missing resource) fail at once.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        response = error.response
+        if response.status_code == httpx.codes.TOO_MANY_REQUESTS:
+            retry_after = response.headers.get("retry-after", "")
+            if not retry_after.isdigit():
+                return True
+            if float(retry_after) > SPOTIFY_MAX_RETRY_AFTER:
+                return False
+            return float(retry_after)
+        return response.status_code >= httpx.codes.INTERNAL_SERVER_ERROR
+    return isinstance(error, ASYNC_TRANSPORT_ERRORS)
@@ -1,5 +1,38 @@
 """Vector database infrastructure exports."""
 
-from .repository import VectorDBRepository
+from .chroma_store import ChromaVectorStore, HnswParameters
+from .exact import ExactSearchEngine
+from .faiss_store import FaissVectorStore
+from .lexical import LexicalDocument, LexicalIndex, LexicalMatch
+from .matrix import EmbeddingMatrix
+from .repository import TrackSort, VectorDBRepository
+from .snapshot import Snapshot, SnapshotManifest
+from .store import (
+    Metadata,
+    RecordPage,
+    UpsertResult,
+    VectorMatch,
+    VectorRecord,
+    VectorStore,
+)
 
-__all__ = ["VectorDBRepository"]
+__all__ = [
+    "ChromaVectorStore",
+    "EmbeddingMatrix",
+    "ExactSearchEngine",
+    "FaissVectorStore",
+    "HnswParameters",
+    "LexicalDocument",
+    "LexicalIndex",
+    "LexicalMatch",
+    "Metadata",
+    "RecordPage",
+    "Snapshot",
+    "SnapshotManifest",
+    "TrackSort",
+    "UpsertResult",
+    "VectorDBRepository",
+    "VectorMatch",
+    "VectorRecord",
+    "VectorStore",
+]
@@ -0,0 +1,333 @@
+"""ChromaDB implementation of the vector store."""
+
+import contextlib
+from collections.abc import Callable
+from functools import cache
+from typing import Any, Optional, TypeVar
+
+import httpx
+import numpy as np
+from chromadb import Collection, HttpClient, PersistentClient
+from chromadb.api import ClientAPI
+from chromadb.config import Settings as ChromaSettings
+from chromadb.errors import NotFoundError
+from chromadb.utils.embedding_functions import OllamaEmbeddingFunction
+from pydantic import BaseModel
+
+from spotify_vibe_searcher.utils import LogLevel, Settings, log
+
+from .store import Embeddings, Metadata, VectorMatch, VectorRecord
+
+T = TypeVar("T")
+
+
+@cache
+def get_embedding_function(model_name: str) -> OllamaEmbeddingFunction:
+    """Process-wide embedding function for a model.
+
+    The function wraps an Ollama client whose HTTP session pools
+    connections, so reusing one instance avoids a new client (and TCP
+    connection) per embedding call.
+    """
+    return OllamaEmbeddingFunction(model_name=model_name)
+
+
+@cache
+def get_http_client(  # pylint: disable=too-many-arguments
+    host: str,
+    port: int,
+    ssl: bool,
+    *,
+    timeout: float,
+    max_connections: int,
+    keepalive_secs: float,
+) -> ClientAPI:
+    """Process-wide client for a Chroma server.
+
+    Every store (one per collection, or per user with MULTI_TENANT) shares
+    the client and so one pool of at most `max_connections` keep-alive
+    connections, instead of opening its own.
+    """
+    log(f"Connecting to Chroma server at {host}:{port}", LogLevel.INFO)
+    client = HttpClient(
+        host=host,
+        port=port,
+        ssl=ssl,
+        settings=ChromaSettings(
+            chroma_http_max_connections=max_connections,
+            chroma_http_max_keepalive_connections=max_connections,
+            chroma_http_keepalive_secs=keepalive_secs,
+        ),
+    )
+    # chromadb builds its session without a timeout and has no setting for one
+    client._server._session.timeout = httpx.Timeout(timeout)  # type: ignore[attr-defined]  # pylint: disable=protected-access
+    return client
+
+
+class HnswParameters(BaseModel):
+    """ChromaDB HNSW index parameters, fixed when a collection is created."""
+
+    m: int = 16
+    construction_ef: int = 100
+    search_ef: int = 100
+    sync_threshold: int = 1000
+
+    @classmethod
+    def from_settings(cls) -> "HnswParameters":
+        return cls(
+            m=Settings.CHROMADB_HNSW_M,
+            construction_ef=Settings.CHROMADB_HNSW_CONSTRUCTION_EF,
+            search_ef=Settings.CHROMADB_HNSW_SEARCH_EF,
+            sync_threshold=Settings.CHROMADB_HNSW_SYNC_THRESHOLD,
+        )
+
+    def to_metadata(self) -> Metadata:
+        return {
+            "hnsw:space": "cosine",  # Use cosine similarity
+            "hnsw:M": self.m,
+            "hnsw:construction_ef": self.construction_ef,
+            "hnsw:search_ef": self.search_ef,
+            "hnsw:sync_threshold": self.sync_threshold,
+        }
+
+
+class ChromaVectorStore(BaseModel):
+    """Vector store backed by a ChromaDB collection (HNSW index).
+
+    The collection lives in an embedded database under DATA_DIR, or on a
+    Chroma server when `CHROMADB_HOST` is set.
+    """
+
+    collection_name: str
+
+    _client: Optional[ClientAPI] = None  # noqa
+    _collection: Optional[Collection] = None  # noqa
+    _collection_model: Optional[str] = None  # noqa
+
+    @property
+    def client(self) -> ClientAPI:
+        """Lazy-load the ChromaDB client (HTTP or embedded)."""
+        if self._client is None and Settings.CHROMADB_HOST:
+            self._client = get_http_client(
+                Settings.CHROMADB_HOST,
+                Settings.CHROMADB_PORT,
+                Settings.CHROMADB_SSL,
+                timeout=Settings.CHROMADB_HTTP_TIMEOUT,
+                max_connections=Settings.CHROMADB_HTTP_MAX_CONNECTIONS,
+                keepalive_secs=Settings.CHROMADB_HTTP_KEEPALIVE_SECS,
+            )
+        if self._client is None:
+            Settings.CHROMADB_PATH.mkdir(parents=True, exist_ok=True)
+            log(
+                f"Initializing ChromaDB client at {Settings.CHROMADB_PATH}",
+                LogLevel.INFO,
+            )
+            self._client = PersistentClient(path=str(Settings.CHROMADB_PATH))
+        return self._client
+
+    @property
+    def collection(self) -> Collection:
+        """Collection handle, resolved once per embedding model."""
+        if (
+            self._collection is None
+            or self._collection_model != Settings.EMBEDDING_MODEL
+        ):
+            self._collection = self.get_or_create_collection()
+            self._collection_model = Settings.EMBEDDING_MODEL
+        return self._collection
+
+    def invalidate_collection(self) -> None:
+        """Drop the cached handle so the next access resolves it again."""
+        self._collection = None
+
+    def get_or_create_collection(self) -> Collection:
+        """Get or create the collection with cosine similarity.
+
+        HNSW parameters from the settings only apply when the collection is
+        created; an existing collection keeps the ones it was built with.
+        """
+        return self.client.get_or_create_collection(
+            name=self.collection_name,
+            embedding_function=get_embedding_function(Settings.EMBEDDING_MODEL),  # type: ignore[arg-type]
+            metadata=HnswParameters.from_settings().to_metadata(),
+        )
+
+    def add(
+        self,
+        ids: list[str],
+        embeddings: Embeddings,
+        documents: list[str],
+        metadatas: list[Metadata],
+    ) -> None:
+        self._run(
+            lambda collection: collection.add(
+                ids=ids,
+                embeddings=embeddings,  # type: ignore[arg-type]
+                documents=documents,
+                metadatas=metadatas,  # type: ignore[arg-type]
+            )
+        )
+
+    def upsert(
+        self,
+        ids: list[str],
+        embeddings: Embeddings,
+        documents: list[str],
+        metadatas: list[Metadata],
+    ) -> None:
+        self._run(
+            lambda collection: collection.upsert(
+                ids=ids,
+                embeddings=embeddings,  # type: ignore[arg-type]
+                documents=documents,
+                metadatas=metadatas,  # type: ignore[arg-type]
+            )
+        )
+
+    def update_metadata(self, ids: list[str], metadatas: list[Metadata]) -> None:
+        if ids:
+            self._run(
+                lambda collection: collection.update(
+                    ids=ids,
+                    metadatas=metadatas,  # type: ignore[arg-type]
+                )
+            )
+
+    def delete(self, ids: list[str]) -> None:
+        if ids:
+            self._run(lambda collection: collection.delete(ids=ids))
+
+    def get(  # pylint: disable=too-many-arguments
+        self,
+        ids: list[str] | None = None,
+        where: Metadata | None = None,
+        include_embeddings: bool = False,
+        *,
+        include_documents: bool = True,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[VectorRecord]:
+        include = ["metadatas"]
+        if include_documents:
+            include.append("documents")
+        if include_embeddings:
+            include.append("embeddings")
+
+        results = self._run(
+            lambda collection: collection.get(
+                ids=ids,
+                where=self._where(where),
+                limit=limit,
+                offset=offset or None,
+                include=include,  # type: ignore[arg-type]
+            )
+        )
+        documents = results.get("documents")
+        metadatas = results.get("metadatas")
+        embeddings = results.get("embeddings")
+        return [
+            VectorRecord(
+                id=track_id,
+                document=(documents[i] if documents else None) or "",
+                metadata=dict((metadatas[i] if metadatas else None) or {}),
+                embedding=None if embeddings is None else np.asarray(embeddings[i]),
+            )
+            for i, track_id in enumerate(results["ids"])
+        ]
+
+    def query(  # pylint: disable=too-many-arguments
+        self,
+        embeddings: Embeddings,
+        n_results: int = 10,
+        *,
+        ids: list[str] | None = None,
+        where: Metadata | None = None,
+        include_embeddings: bool = False,
+    ) -> list[list[VectorMatch]]:
+        include = ["documents", "metadatas", "distances"]
+        if include_embeddings:
+            include.append("embeddings")
+
+        results = self._run(
+            lambda collection: collection.query(
+                query_embeddings=embeddings,  # type: ignore[arg-type]
+                n_results=n_results,
+                ids=ids,
+                where=self._where(where),
+                include=include,  # type: ignore[arg-type]
+            )
+        )
+        return [self._to_matches(results, row) for row in range(len(results["ids"]))]
+
+    def count(self) -> int:
+        return int(self._run(lambda collection: collection.count()))
+
+    def get_collection_metadata(self) -> Metadata:
+        # Fetched anew rather than read from the cached handle, whose copy
+        # misses changes made by other processes
+        metadata = self._run(
+            lambda collection: (
+                self.client.get_collection(
+                    collection.name, embedding_function=None
+                ).metadata
+            )
+        )
+        # Index settings ("hnsw:*") are fixed at creation and not user metadata
+        return {
+            key: value
+            for key, value in (metadata or {}).items()
+            if not key.startswith("hnsw:") and value is not None
+        }
+
+    def update_collection_metadata(self, metadata: Metadata) -> None:
+        merged = {**self.get_collection_metadata(), **metadata}
+        self._run(lambda collection: collection.modify(metadata=merged))
+
+    def drop(self) -> None:
+        with contextlib.suppress(NotFoundError):
+            self.client.delete_collection(self.collection_name)
+        self.invalidate_collection()
+
+    def _run(self, operation: Callable[[Collection], T]) -> T:
+        """Run an operation on the cached collection handle.
+
+        If the collection was deleted (and possibly recreated) since the
+        handle was fetched, the handle is resolved again and the operation
+        retried once.
+        """
+        try:
+            return operation(self.collection)
+        except NotFoundError:
+            log(
+                f"Collection '{self.collection_name}' was recreated, reloading handle",
+                LogLevel.WARNING,
+            )
+            self.invalidate_collection()
+            return operation(self.collection)
+
+    def _where(  # pylint: disable=no-self-use
+        self, where: Metadata | None
+    ) -> dict[str, Any] | None:
+        """Translate equality filters into ChromaDB's `where` syntax."""
+        if not where:
+            return None
+        if len(where) == 1:
+            return dict(where)
+        return {"$and": [{key: value} for key, value in where.items()]}
+
+    def _to_matches(  # pylint: disable=no-self-use
+        self, results: Any, row: int
+    ) -> list[VectorMatch]:
+        embeddings = results.get("embeddings")
+        return [
+            VectorMatch(
+                id=track_id,
+                document=results["documents"][row][i] or "",
+                metadata=dict(results["metadatas"][row][i] or {}),
+                distance=float(results["distances"][row][i]),
+                embedding=(
+                    None if embeddings is None else np.asarray(embeddings[row][i])
+                ),
+            )
+            for i, track_id in enumerate(results["ids"][row])
+        ]
@@ -0,0 +1,74 @@
+import re
+
+# Columns of the lexical (FTS5) index, in table order, with their BM25 weights.
+# Exact names and titles should outrank a passing mention in a vibe or lyric.
+LEXICAL_COLUMNS = {
+    "track_name": 4.0,
+    "artist_names": 4.0,
+    "album_name": 2.0,
+    "genres": 1.5,
+    "vibe_description": 1.0,
+    "lyrics": 0.5,
+}
+
+# Columns where a full-phrase hit means the user typed something exact
+# (a title, an artist or an album) rather than describing a vibe.
+EXACT_MATCH_COLUMNS = ("track_name", "artist_names", "album_name")
+
+# Lexical columns filled from Spotify data, rewritten when metadata is refreshed.
+LEXICAL_METADATA_COLUMNS = ("track_name", "artist_names", "album_name", "genres")
+
+# A phrase this long found verbatim in the lyrics is treated as a lyric lookup.
+LYRIC_PHRASE_MIN_TOKENS = 4
+
+LEXICAL_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# FAISS warns when an IVF list gets fewer training points than this, so small
+# libraries get fewer lists than FAISS_IVF_NLIST.
+FAISS_IVF_POINTS_PER_LIST = 39
+
+# int8 codes use the symmetric range [-127, 127] so 0 stays exactly 0
+INT8_LEVELS = 127
+
+# Quantized rows are decoded to float32 this many at a time while scoring,
+# bounding the temporary copy to 3 MiB at 768 dimensions.
+QUANTIZED_SCORING_BLOCK_ROWS = 1024
+
+# Collection metadata key recording the size of the stored embeddings
+EMBEDDING_DIMENSION_KEY = "embedding_dimension"
+
+# Collection metadata key recording the model the embeddings were produced by
+EMBEDDING_MODEL_KEY = "embedding_model"
+
+# Collection metadata key holding a token renewed by every write, so caches in
+# any process can tell the collection changed
+WRITE_VERSION_KEY = "write_version"
+
+# Track metadata keys holding hashes of the stored vibe description and of the
+# rest of the metadata, so upserts can skip unchanged tracks
+DOCUMENT_HASH_KEY = "document_hash"
+METADATA_HASH_KEY = "metadata_hash"
+
+# Snapshot layout: a manifest, one JSON line per record (ID, document and
+# metadata) and a float32 .npy matrix with the embeddings in the same order
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_MANIFEST_FILE = "manifest.json"
+SNAPSHOT_RECORDS_FILE = "records.jsonl"
+SNAPSHOT_EMBEDDINGS_FILE = "embeddings.npy"
+
+# Records read from or written to the store per snapshot batch
+SNAPSHOT_BATCH_SIZE = 1000
+
+# The embedding matrix sidecar is compacted once this share of its rows
+# belongs to deleted tracks
+EMBEDDING_MATRIX_MAX_DEAD_FRACTION = 0.25
+
+# Spotify user IDs that can be used verbatim in a collection name; others are
+# hashed
+USER_ID_PATTERN = re.compile(r"[A-Za-z0-9]{1,64}")
+
+# Separates the base collection from a user ID ("tracks__u_alice") or its hash
+# ("tracks__h_<hash>"). Migrated names only append "_v<n>", and user IDs never
+# contain "_", so no library's name can be another one's versioned copy.
+USER_COLLECTION_SEPARATOR = "__u_"
+HASHED_USER_COLLECTION_SEPARATOR = "__h_"
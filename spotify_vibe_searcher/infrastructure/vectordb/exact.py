@@ -0,0 +1,284 @@
+"""In-memory exact nearest-neighbour search over a NumPy embedding matrix."""
+
+import threading
+from collections.abc import Mapping, Sequence
+from typing import Literal
+
+import numpy as np
+from pydantic import BaseModel, PrivateAttr
+
+from spotify_vibe_searcher.utils import LogLevel, log
+
+from .config import INT8_LEVELS, QUANTIZED_SCORING_BLOCK_ROWS
+from .store import Embeddings
+
+Quantization = Literal["none", "float16", "int8"]
+
+STORAGE_DTYPES: dict[str, type[np.generic]] = {
+    "none": np.float32,
+    "float16": np.float16,
+    "int8": np.int8,
+}
+
+
+class ExactSearchEngine(BaseModel):
+    """Brute-force cosine search over L2-normalized embeddings.
+
+    Rows live in one contiguous matrix that grows geometrically on add and is
+    kept dense on delete by moving the last row into the freed slot, so a
+    query is a single matrix-vector product plus `argpartition`.
+
+    With `quantization` set, rows are stored as float16 (2x smaller) or as
+    int8 with one float32 scale per row (~4x smaller) and decoded block by
+    block at query time. Scores are then approximate; callers re-rank an
+    over-fetched candidate list against float32 vectors with `rescore`.
+    """
+
+    quantization: Quantization = "none"
+
+    _matrix: np.ndarray = PrivateAttr(
+        default_factory=lambda: np.empty((0, 0), dtype=np.float32)
+    )
+    _scales: np.ndarray = PrivateAttr(
+        default_factory=lambda: np.empty(0, dtype=np.float32)
+    )
+    _ids: list[str] = PrivateAttr(default_factory=list)
+    _positions: dict[str, int] = PrivateAttr(default_factory=dict)
+    _lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
+
+    @property
+    def size(self) -> int:
+        return len(self._ids)
+
+    @property
+    def dimension(self) -> int:
+        return int(self._matrix.shape[1])
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the stored rows (codes plus int8 scales)."""
+        scale_bytes = self.size * 4 if self.quantization == "int8" else 0
+        return self.size * self.dimension * self._matrix.itemsize + scale_bytes
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Normalized embeddings of all rows, in `ids` order (read-only)."""
+        view = self._decode(slice(0, self.size))
+        view.flags.writeable = False
+        return view
+
+    @property
+    def ids(self) -> list[str]:
+        return list(self._ids)
+
+    def load(self, ids: Sequence[str], embeddings: Embeddings) -> None:
+        """Replace the engine contents with a full snapshot of the collection."""
+        with self._lock:
+            self._matrix = np.empty((0, 0), dtype=STORAGE_DTYPES[self.quantization])
+            self._scales = np.empty(0, dtype=np.float32)
+            self._ids = []
+            self._positions = {}
+            self.add(ids, embeddings)
+        log(
+            f"Loaded {self.size} embeddings into exact search engine "
+            f"({self.quantization}, {self.nbytes / 2**20:.1f} MiB)",
+            LogLevel.INFO,
+        )
+
+    def add(self, ids: Sequence[str], embeddings: Embeddings) -> None:
+        """Insert or overwrite rows."""
+        if not ids:
+            return
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        codes, scales = self._encode(vectors)
+        with self._lock:
+            self._reserve(self.size + len(ids), vectors.shape[1])
+
+            for track_id, code, scale in zip(ids, codes, scales, strict=True):
+                position = self._positions.get(track_id)
+                if position is None:
+                    position = self.size
+                    self._ids.append(track_id)
+                    self._positions[track_id] = position
+                self._matrix[position] = code
+                self._scales[position] = scale
+
+    def delete(self, ids: Sequence[str]) -> None:
+        with self._lock:
+            for track_id in ids:
+                position = self._positions.pop(track_id, None)
+                if position is None:
+                    continue
+                last = self.size - 1
+                if position != last:
+                    moved_id = self._ids[last]
+                    self._matrix[position] = self._matrix[last]
+                    self._scales[position] = self._scales[last]
+                    self._ids[position] = moved_id
+                    self._positions[moved_id] = position
+                self._ids.pop()
+
+    def get(self, ids: Sequence[str]) -> np.ndarray:
+        """Normalized embeddings for the given IDs (unknown IDs are skipped)."""
+        with self._lock:
+            rows = np.asarray(
+                [self._positions[i] for i in ids if i in self._positions], np.intp
+            )
+            return self._decode(rows)
+
+    def search(
+        self,
+        query_embeddings: Embeddings,
+        n_results: int = 10,
+        track_ids: Sequence[str] | None = None,
+    ) -> tuple[list[list[str]], list[list[float]]]:
+        """Top-k by cosine distance for each query (exact unless quantized).
+
+        Args:
+            query_embeddings: One or more query vectors.
+            n_results: Maximum number of results per query.
+            track_ids: Optional subset of IDs to restrict the search to.
+
+        Returns:
+            Per-query lists of IDs and cosine distances, nearest first.
+        """
+        queries = self._normalize(np.asarray(query_embeddings, dtype=np.float32))
+        with self._lock:
+            if track_ids is None:
+                rows = np.arange(self.size)
+            else:
+                rows = np.fromiter(
+                    (self._positions[i] for i in track_ids if i in self._positions),
+                    dtype=np.intp,
+                )
+
+            k = min(n_results, len(rows))
+            if k == 0:
+                return [[] for _ in queries], [[] for _ in queries]
+
+            similarities = self._similarities(
+                queries, slice(0, self.size) if track_ids is None else rows
+            )
+            top, top_similarities = _top_k(similarities, k)
+
+            # Only the k winners are mapped back to IDs
+            ids = [[self._ids[row] for row in rows[query_top]] for query_top in top]
+
+        return ids, _to_distances(top_similarities)
+
+    def _similarities(
+        self, queries: np.ndarray, rows: slice | np.ndarray
+    ) -> np.ndarray:
+        if self.quantization == "none":
+            return queries @ self._matrix[rows].T  # type: ignore[no-any-return]
+
+        # Decode a block at a time so only one float32 block is ever resident
+        n_rows = len(range(self.size)[rows]) if isinstance(rows, slice) else len(rows)
+        similarities = np.empty((len(queries), n_rows), dtype=np.float32)
+        for start in range(0, n_rows, QUANTIZED_SCORING_BLOCK_ROWS):
+            end = min(start + QUANTIZED_SCORING_BLOCK_ROWS, n_rows)
+            block = (
+                slice(rows.start + start, rows.start + end)
+                if isinstance(rows, slice)
+                else rows[start:end]
+            )
+            # int8 scales are per row, so they apply after the product
+            similarities[:, start:end] = (
+                queries @ self._matrix[block].astype(np.float32).T
+            ) * self._scales[block]
+        return similarities
+
+    def _encode(self, vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        if self.quantization == "int8":
+            # Symmetric per-row scale: the largest component maps to +/-127
+            scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / INT8_LEVELS
+            codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+            return codes, scales.astype(np.float32)
+        dtype = STORAGE_DTYPES[self.quantization]
+        return vectors.astype(dtype), np.ones(len(vectors), dtype=np.float32)
+
+    def _decode(self, rows: slice | np.ndarray) -> np.ndarray:
+        decoded = self._matrix[rows].astype(np.float32)
+        if self.quantization == "int8":
+            decoded *= self._scales[rows][:, None]
+        return decoded
+
+    def _reserve(self, capacity: int, dimension: int) -> None:
+        if self._matrix.shape[1] not in {0, dimension}:
+            raise ValueError(
+                f"Embedding dimension {dimension} does not match engine dimension "
+                f"{self._matrix.shape[1]}"
+            )
+        if capacity <= self._matrix.shape[0]:
+            return
+        rows = max(capacity, 2 * self._matrix.shape[0])
+        grown = np.empty((rows, dimension), STORAGE_DTYPES[self.quantization])
+        grown_scales = np.ones(rows, dtype=np.float32)
+        if self.size:
+            grown[: self.size] = self._matrix[: self.size]
+            grown_scales[: self.size] = self._scales[: self.size]
+        self._matrix = grown
+        self._scales = grown_scales
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:  # pylint: disable=no-self-use
+        return _normalize(vectors)
+
+
+def rescore(
+    query_embeddings: Embeddings,
+    candidates: Sequence[Sequence[str]],
+    embeddings: Mapping[str, np.ndarray],
+    n_results: int,
+) -> tuple[list[list[str]], list[list[float]]]:
+    """Re-rank each query's candidate IDs by exact float32 cosine distance.
+
+    Args:
+        query_embeddings: One query vector per candidate list.
+        candidates: Approximate top candidates per query (e.g. from a
+            quantized search over `n_results * QUANTIZATION_RESCORE_FACTOR`).
+        embeddings: Full-precision embedding of each candidate ID; candidates
+            without one are dropped.
+        n_results: Maximum number of results per query.
+
+    Returns:
+        Per-query lists of IDs and exact cosine distances, nearest first.
+    """
+    queries = _normalize(np.asarray(query_embeddings, dtype=np.float32))
+    all_ids, all_distances = [], []
+    for query, candidate_ids in zip(queries, candidates, strict=True):
+        known = [track_id for track_id in candidate_ids if track_id in embeddings]
+        k = min(n_results, len(known))
+        if k == 0:
+            all_ids.append([])
+            all_distances.append([])
+            continue
+
+        vectors = _normalize(
+            np.stack([np.asarray(embeddings[i], np.float32) for i in known])
+        )
+        top, top_similarities = _top_k(query[None, :] @ vectors.T, k)
+        all_ids.append([known[i] for i in top[0]])
+        all_distances.extend(_to_distances(top_similarities))
+    return all_ids, all_distances
+
+
+def _top_k(similarities: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Column indices and values of the k largest similarities per row, sorted."""
+    top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    top_similarities = np.take_along_axis(similarities, top, axis=1)
+    order = np.argsort(-top_similarities, axis=1)
+    return (
+        np.take_along_axis(top, order, axis=1),
+        np.take_along_axis(top_similarities, order, axis=1),
+    )
+
+
+def _to_distances(similarities: np.ndarray) -> list[list[float]]:
+    # Clamp float error so identical vectors never report a negative distance
+    return np.clip(1.0 - similarities, 0.0, 2.0).tolist()  # type: ignore[no-any-return]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.atleast_2d(vectors)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)  # type: ignore[no-any-return]
@@ -0,0 +1,539 @@
+"""FAISS implementation of the vector store, persisted to local files."""
+
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Literal, Optional
+
+import numpy as np
+from pydantic import BaseModel, PrivateAttr
+
+from spotify_vibe_searcher.utils import LogLevel, Settings, log
+
+from ..embedding.config import SQLITE_BATCH_SIZE
+from .config import FAISS_IVF_POINTS_PER_LIST
+from .store import Embeddings, Metadata, VectorMatch, VectorRecord
+
+
+def _import_faiss() -> Any:
+    """Import FAISS, which is an optional dependency."""
+    try:
+        import faiss  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise RuntimeError(
+            'FAISS backend requires faiss-cpu: pip install "spotify-vibe-searcher[faiss]"'
+        ) from error
+    return faiss
+
+
+class FaissVectorStore(BaseModel):
+    """Vector store backed by a local FAISS index and a SQLite record table.
+
+    SQLite holds the authoritative records (document, metadata and raw
+    embedding); the FAISS index over normalized embeddings is derived from
+    it. Writes only update the index in memory: it is saved when built and
+    on `close`, and a saved copy that lags behind is caught up on load by
+    adding the records inserted since (labels only grow). It is rebuilt
+    when missing or when records were deleted since it was saved.
+
+    Index types:
+        flat: exact inner-product search, best up to tens of thousands of tracks.
+        ivf: inverted lists probed by `FAISS_IVF_NPROBE`, for large libraries;
+            retrained once the library outgrows the lists it was trained with.
+        hnsw: graph search tuned by `FAISS_HNSW_M`/`FAISS_HNSW_EF_SEARCH`;
+            deletes trigger a rebuild, so it suits append-mostly libraries.
+    """
+
+    collection_name: str
+    index_type: Literal["flat", "ivf", "hnsw"] = "flat"
+
+    _connection: Optional[sqlite3.Connection] = None  # noqa
+    _index: Optional[Any] = None  # noqa
+    _unsaved: bool = False
+    _lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
+
+    @property
+    def records_path(self) -> Path:
+        return Settings.FAISS_PATH / f"{self.collection_name}.db"
+
+    @property
+    def index_path(self) -> Path:
+        return Settings.FAISS_PATH / f"{self.collection_name}.{self.index_type}.index"
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Lazy-load the SQLite record store."""
+        if self._connection is None:
+            Settings.FAISS_PATH.mkdir(parents=True, exist_ok=True)
+            log(f"Initializing FAISS store at {Settings.FAISS_PATH}", LogLevel.INFO)
+            connection = sqlite3.connect(self.records_path, check_same_thread=False)
+            # AUTOINCREMENT keeps labels of deleted records from being reused
+            # while a saved index may still refer to them.
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "label INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "id TEXT NOT NULL UNIQUE, "
+                "document TEXT NOT NULL, "
+                "metadata TEXT NOT NULL, "
+                "embedding BLOB NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS state "
+                "(key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS collection_metadata "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._connection = connection
+        return self._connection
+
+    @property
+    def index(self) -> Any | None:
+        """FAISS index over all records, or None while the store is empty."""
+        with self._lock:
+            if self._index is None:
+                self._index = self._load_index() or self._build_index()
+            return self._index
+
+    def add(
+        self,
+        ids: list[str],
+        embeddings: Embeddings,
+        documents: list[str],
+        metadatas: list[Metadata],
+    ) -> None:
+        self._write(ids, embeddings, documents, metadatas, replace=False)
+
+    def upsert(
+        self,
+        ids: list[str],
+        embeddings: Embeddings,
+        documents: list[str],
+        metadatas: list[Metadata],
+    ) -> None:
+        self._write(ids, embeddings, documents, metadatas, replace=True)
+
+    def update_metadata(self, ids: list[str], metadatas: list[Metadata]) -> None:
+        # Vectors are untouched, so the index stays current
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "UPDATE records SET metadata = ? WHERE id = ?",
+                [
+                    (json.dumps(metadata), track_id)
+                    for track_id, metadata in zip(ids, metadatas, strict=True)
+                ],
+            )
+
+    def delete(self, ids: list[str]) -> None:
+        with self._lock:
+            labels = list(self._labels(ids).values())
+            if not labels:
+                return
+            with self.connection:
+                self.connection.executemany(
+                    "DELETE FROM records WHERE label = ?",
+                    [(label,) for label in labels],
+                )
+                self._count_deletion()
+            self._remove_from_index(labels)
+
+    def get(  # pylint: disable=too-many-arguments
+        self,
+        ids: list[str] | None = None,
+        where: Metadata | None = None,
+        include_embeddings: bool = False,
+        *,
+        include_documents: bool = True,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[VectorRecord]:
+        stop = None if limit is None else offset + limit
+        with self._lock:
+            labels = self._filter_labels(ids, where)
+            records = self._records(
+                slice(offset, stop) if labels is None else labels[offset:stop],
+                include_embeddings,
+                include_documents,
+            )
+        return list(records.values())
+
+    def query(  # pylint: disable=too-many-arguments, too-many-locals
+        self,
+        embeddings: Embeddings,
+        n_results: int = 10,
+        *,
+        ids: list[str] | None = None,
+        where: Metadata | None = None,
+        include_embeddings: bool = False,
+    ) -> list[list[VectorMatch]]:
+        queries = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        empty: list[list[VectorMatch]] = [[] for _ in queries]
+
+        with self._lock:
+            index = self.index
+            if index is None:
+                return empty
+
+            selector, n_candidates = None, index.ntotal
+            allowed = self._filter_labels(ids, where)
+            if allowed is not None:
+                if not allowed:
+                    return empty
+                selector = _import_faiss().IDSelectorBatch(  # pylint: disable=no-value-for-parameter
+                    np.asarray(allowed, dtype=np.int64)
+                )
+                n_candidates = len(allowed)
+
+            k = min(n_results, n_candidates)
+            similarities, labels = index.search(
+                queries, k, params=self._search_parameters(selector)
+            )
+            records = self._records(
+                {int(label) for label in labels.ravel() if label >= 0},
+                include_embeddings,
+            )
+
+        # Clamp float error so identical vectors never report a negative distance
+        distances = np.clip(1.0 - similarities, 0.0, 2.0)
+        return [
+            [
+                VectorMatch(
+                    id=records[label].id,
+                    document=records[label].document,
+                    metadata=records[label].metadata,
+                    embedding=records[label].embedding,
+                    distance=float(distance),
+                )
+                for label, distance in zip(row_labels, row_distances, strict=True)
+                if label in records
+            ]
+            for row_labels, row_distances in zip(
+                labels.tolist(), distances.tolist(), strict=True
+            )
+        ]
+
+    def count(self) -> int:
+        with self._lock:
+            row = self.connection.execute("SELECT COUNT(*) FROM records").fetchone()
+        return int(row[0])
+
+    def get_collection_metadata(self) -> Metadata:
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT key, value FROM collection_metadata"
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def update_collection_metadata(self, metadata: Metadata) -> None:
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT INTO collection_metadata (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                [(key, json.dumps(value)) for key, value in metadata.items()],
+            )
+
+    def rebuild_index(self) -> None:
+        """Rebuild the index from the stored records (e.g. to retrain IVF lists)."""
+        with self._lock:
+            self._index = self._build_index()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._index is not None and self._unsaved:
+                self._save_index(self._index)
+            self._index = None
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def drop(self) -> None:
+        with self._lock:
+            self.close()
+            # Saved indexes of every type share the record store's stem
+            for path in Settings.FAISS_PATH.glob(f"{self.collection_name}.*"):
+                path.unlink()
+
+    def _write(  # pylint: disable=too-many-arguments, too-many-locals
+        self,
+        ids: list[str],
+        embeddings: Embeddings,
+        documents: list[str],
+        metadatas: list[Metadata],
+        *,
+        replace: bool,
+    ) -> None:
+        if not ids:
+            return
+        vectors = np.asarray(embeddings, dtype=np.float32)
+
+        with self._lock:
+            existing = self._labels(ids)
+            rows = {
+                track_id: (document, json.dumps(metadata), vector)
+                for track_id, document, metadata, vector in zip(
+                    ids, documents, metadatas, vectors, strict=True
+                )
+                if replace or track_id not in existing
+            }
+            if not rows:
+                return
+            replaced = [existing[track_id] for track_id in rows if track_id in existing]
+
+            labels = []
+            with self.connection:
+                self.connection.executemany(
+                    "DELETE FROM records WHERE label = ?",
+                    [(label,) for label in replaced],
+                )
+                for track_id, (document, metadata, vector) in rows.items():
+                    cursor = self.connection.execute(
+                        "INSERT INTO records (id, document, metadata, embedding) "
+                        "VALUES (?, ?, ?, ?)",
+                        (track_id, document, metadata, vector.tobytes()),
+                    )
+                    labels.append(cursor.lastrowid)
+                if replaced:
+                    self._count_deletion()
+
+            if replaced:
+                self._remove_from_index(replaced)
+            new_vectors = np.stack([vector for _, _, vector in rows.values()])
+            self._add_to_index(labels, new_vectors)
+
+    def _add_to_index(self, labels: list[Any], vectors: np.ndarray) -> None:
+        # An unbuilt index picks the new records up when it is built
+        if self._index is None:
+            return
+        self._index.add_with_ids(
+            self._normalize(vectors), np.asarray(labels, dtype=np.int64)
+        )
+        self._unsaved = True
+        if self._needs_retraining(self._index):
+            self._index = self._build_index()
+
+    def _remove_from_index(self, labels: list[int]) -> None:
+        if self._index is None:
+            return
+        if self.index_type == "hnsw":
+            # HNSW graphs can't drop nodes; rebuild lazily on the next query
+            self._index = None
+            return
+        self._index.remove_ids(np.asarray(labels, dtype=np.int64))
+        self._unsaved = True
+
+    def _build_index(self) -> Any | None:
+        faiss = _import_faiss()
+        rows = self.connection.execute(
+            "SELECT label, embedding FROM records ORDER BY label"
+        ).fetchall()
+        if not rows:
+            return None
+
+        labels = np.fromiter((label for label, _ in rows), dtype=np.int64)
+        vectors = self._normalize(
+            np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob in rows])
+        )
+        log(
+            f"Building FAISS {self.index_type} index over {len(rows)} vectors...",
+            LogLevel.INFO,
+        )
+        index = faiss.index_factory(
+            vectors.shape[1], self._index_spec(len(rows)), faiss.METRIC_INNER_PRODUCT
+        )
+        if not index.is_trained:
+            index.train(vectors)
+        index.add_with_ids(vectors, labels)
+
+        self._save_index(index)
+        return index
+
+    def _load_index(self) -> Any | None:
+        """Read the saved index, caught up with the records added since.
+
+        Returns None when it has to be rebuilt: it is missing, records were
+        deleted since it was saved, or it is an IVF index the library has
+        outgrown.
+        """
+        if not self.index_path.exists():
+            return None
+        # Indexes saved before labels were tracked have no catch-up point
+        saved_label = self._state("index_max_label", default=-1)
+        deleted = self._state("index_deletions") != self._state("deletions")
+        if saved_label < 0 or deleted:
+            return None
+
+        log(f"Loading FAISS index from {self.index_path}", LogLevel.INFO)
+        index = _import_faiss().read_index(str(self.index_path))
+        rows = self.connection.execute(
+            "SELECT label, embedding FROM records WHERE label > ? ORDER BY label",
+            (saved_label,),
+        ).fetchall()
+        if rows:
+            log(f"Adding {len(rows)} vectors saved since the index", LogLevel.INFO)
+            index.add_with_ids(
+                self._normalize(
+                    np.stack([
+                        np.frombuffer(blob, dtype=np.float32) for _, blob in rows
+                    ])
+                ),
+                np.fromiter((label for label, _ in rows), dtype=np.int64),
+            )
+            if self._needs_retraining(index):
+                return None
+            self._save_index(index)
+        return index
+
+    def _save_index(self, index: Any) -> None:
+        # Write-then-rename so a crash never leaves a truncated index behind
+        temporary_path = self.index_path.with_suffix(".tmp")
+        _import_faiss().write_index(index, str(temporary_path))
+        os.replace(temporary_path, self.index_path)
+        (max_label,) = self.connection.execute(
+            "SELECT COALESCE(MAX(label), 0) FROM records"
+        ).fetchone()
+        with self.connection:
+            self._set_state("index_max_label", max_label)
+            self._set_state("index_deletions", self._state("deletions"))
+        self._unsaved = False
+
+    def _n_lists(self, n_vectors: int) -> int:  # pylint: disable=no-self-use
+        return min(
+            Settings.FAISS_IVF_NLIST, max(1, n_vectors // FAISS_IVF_POINTS_PER_LIST)
+        )
+
+    def _needs_retraining(self, index: Any) -> bool:
+        """Whether an IVF index should now have at least twice as many lists.
+
+        Lists are only trained when the index is built, so a library that
+        started small would otherwise keep its first few lists forever.
+        Retraining on each doubling keeps the rebuild cost amortized.
+        """
+        if self.index_type != "ivf":
+            return False
+        trained: int = _import_faiss().extract_index_ivf(index).nlist
+        return self._n_lists(index.ntotal) >= 2 * trained
+
+    def _index_spec(self, n_vectors: int) -> str:
+        if self.index_type == "ivf":
+            return f"IVF{self._n_lists(n_vectors)},Flat"
+        if self.index_type == "hnsw":
+            return f"IDMap2,HNSW{Settings.FAISS_HNSW_M},Flat"
+        return "IDMap2,Flat"
+
+    def _search_parameters(self, selector: Any | None) -> Any:
+        faiss = _import_faiss()
+        params: Any
+        if self.index_type == "ivf":
+            params = faiss.SearchParametersIVF()
+            params.nprobe = Settings.FAISS_IVF_NPROBE
+        elif self.index_type == "hnsw":
+            params = faiss.SearchParametersHNSW()
+            params.efSearch = Settings.FAISS_HNSW_EF_SEARCH
+        else:
+            params = faiss.SearchParameters()
+        if selector is not None:
+            params.sel = selector
+        return params
+
+    def _filter_labels(
+        self, ids: list[str] | None, where: Metadata | None
+    ) -> list[int] | None:
+        """Labels matching the ID and metadata filters (None if unfiltered)."""
+        if ids is None and not where:
+            return None
+
+        labels: set[int] | None = None
+        if ids is not None:
+            labels = set(self._labels(ids).values())
+        if where:
+            conditions = " AND ".join("json_extract(metadata, ?) = ?" for _ in where)
+            params = [
+                param for key, value in where.items() for param in (f'$."{key}"', value)
+            ]
+            matching = {
+                label
+                for (label,) in self.connection.execute(
+                    f"SELECT label FROM records WHERE {conditions}", params
+                )
+            }
+            labels = matching if labels is None else labels & matching
+        return sorted(labels or ())
+
+    def _labels(self, ids: Iterable[str]) -> dict[str, int]:
+        """Map stored IDs to their FAISS labels (unknown IDs are skipped)."""
+        return dict(
+            self._select_in("SELECT id, label FROM records WHERE id IN", list(ids))
+        )
+
+    def _records(
+        self,
+        labels: Iterable[int] | slice,
+        include_embeddings: bool,
+        include_documents: bool = True,
+    ) -> dict[int, VectorRecord]:
+        """Records by label; a slice pages through all records in label order."""
+        columns = (
+            f"label, id, {'document' if include_documents else 'NULL'}, metadata, "
+            f"{'embedding' if include_embeddings else 'NULL'}"
+        )
+        if isinstance(labels, slice):
+            # LIMIT -1 means no limit in SQLite
+            limit = -1 if labels.stop is None else labels.stop - labels.start
+            rows = self.connection.execute(
+                f"SELECT {columns} FROM records ORDER BY label LIMIT ? OFFSET ?",
+                (limit, labels.start),
+            ).fetchall()
+        else:
+            rows = sorted(
+                self._select_in(
+                    f"SELECT {columns} FROM records WHERE label IN", list(labels)
+                )
+            )
+        return {
+            label: VectorRecord(
+                id=track_id,
+                document=document or "",
+                metadata=json.loads(metadata),
+                embedding=(
+                    None if blob is None else np.frombuffer(blob, dtype=np.float32)
+                ),
+            )
+            for label, track_id, document, metadata, blob in rows
+        }
+
+    def _select_in(self, query: str, values: list[Any]) -> list[Any]:
+        """Run `query (?, ?, ...)` in chunks that stay under SQLite's limits."""
+        rows = []
+        for start in range(0, len(values), SQLITE_BATCH_SIZE):
+            chunk = values[start : start + SQLITE_BATCH_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows.extend(
+                self.connection.execute(f"{query} ({placeholders})", chunk).fetchall()
+            )
+        return rows
+
+    def _state(self, key: str, default: int = 0) -> int:
+        row = self.connection.execute(
+            "SELECT value FROM state WHERE key = ?", (key,)
+        ).fetchone()
+        return int(row[0]) if row else default
+
+    def _set_state(self, key: str, value: int) -> None:
+        self.connection.execute(
+            "INSERT INTO state (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def _count_deletion(self) -> None:
+        """Mark saved indexes as stale: they may still hold deleted labels."""
+        self._set_state("deletions", self._state("deletions") + 1)
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:  # pylint: disable=no-self-use
+        vectors = np.atleast_2d(vectors).astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.ascontiguousarray(vectors / np.maximum(norms, 1e-12))
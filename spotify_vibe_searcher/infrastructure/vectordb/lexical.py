@@ -0,0 +1,244 @@
+"""SQLite FTS5 lexical index kept alongside the vector collection."""
+
+import itertools
+import sqlite3
+import threading
+from collections.abc import Sequence
+from typing import Optional
+
+from pydantic import BaseModel, PrivateAttr
+
+from spotify_vibe_searcher.utils import LogLevel, Settings, log
+
+from ..embedding.config import SQLITE_BATCH_SIZE
+from .config import (
+    EXACT_MATCH_COLUMNS,
+    LEXICAL_COLUMNS,
+    LEXICAL_METADATA_COLUMNS,
+    LEXICAL_TOKEN_PATTERN,
+    LYRIC_PHRASE_MIN_TOKENS,
+)
+
+
+class LexicalDocument(BaseModel):
+    """Searchable text of a single track."""
+
+    track_id: str
+    track_name: str = ""
+    artist_names: str = ""
+    album_name: str = ""
+    genres: str = ""
+    vibe_description: str = ""
+    lyrics: str = ""
+
+
+class LexicalMatch(BaseModel):
+    track_id: str
+    score: float  # BM25 relevance (higher is better)
+
+
+class LexicalIndex(BaseModel):
+    """BM25 full-text index over track metadata, vibe descriptions and lyrics.
+
+    FTS5 cannot index ``track_id``, so a regular table maps every track ID to
+    its FTS rowid and updates address rows by rowid instead of scanning.
+    """
+
+    table: str
+
+    _connection: Optional[sqlite3.Connection] = None  # noqa
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Lazy-load the SQLite connection and create the FTS5 table."""
+        if self._connection is None:
+            Settings.LEXICAL_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+            log(
+                f"Initializing lexical index at {Settings.LEXICAL_INDEX_PATH}",
+                LogLevel.INFO,
+            )
+            # Streamlit and asyncio.to_thread call us from several threads, so the
+            # connection is shared and every statement is serialized by self._lock.
+            connection = sqlite3.connect(
+                Settings.LEXICAL_INDEX_PATH, check_same_thread=False
+            )
+            self._create_tables(connection)
+            self._connection = connection
+        return self._connection
+
+    @property
+    def _fts_table(self) -> str:
+        return f'"{self.table}_fts"'
+
+    @property
+    def _rows_table(self) -> str:
+        return f'"{self.table}_rows"'
+
+    def upsert(self, documents: list[LexicalDocument]) -> None:
+        # The last version of a track wins, as it would with separate upserts
+        documents = list({doc.track_id: doc for doc in documents}.values())
+        if not documents:
+            return
+        columns = ["track_id", *LEXICAL_COLUMNS]
+        with self._lock, self.connection:
+            self.connection.executemany(
+                f"INSERT OR IGNORE INTO {self._rows_table} (track_id) VALUES (?)",
+                [(doc.track_id,) for doc in documents],
+            )
+            rows = self._rows([doc.track_id for doc in documents])
+            self.connection.executemany(
+                f"DELETE FROM {self._fts_table} WHERE rowid = ?",
+                [(rows[doc.track_id],) for doc in documents],
+            )
+            self.connection.executemany(
+                f"INSERT INTO {self._fts_table} (rowid, {', '.join(columns)}) "
+                f"VALUES (?, {', '.join('?' for _ in columns)})",
+                [
+                    (rows[doc.track_id], *(getattr(doc, c) for c in columns))
+                    for doc in documents
+                ],
+            )
+
+    def update_metadata(self, documents: list[LexicalDocument]) -> None:
+        """Rewrite the Spotify fields of indexed tracks, keeping vibes and lyrics.
+
+        Tracks not in the index are ignored.
+        """
+        assignments = ", ".join(f"{column} = ?" for column in LEXICAL_METADATA_COLUMNS)
+        with self._lock, self.connection:
+            rows = self._rows([doc.track_id for doc in documents])
+            self.connection.executemany(
+                f"UPDATE {self._fts_table} SET {assignments} WHERE rowid = ?",
+                [
+                    (*(getattr(doc, c) for c in LEXICAL_METADATA_COLUMNS), row)
+                    for doc in documents
+                    if (row := rows.get(doc.track_id)) is not None
+                ],
+            )
+
+    def delete(self, track_ids: list[str]) -> None:
+        with self._lock, self.connection:
+            rows = [(row,) for row in self._rows(track_ids).values()]
+            self.connection.executemany(
+                f"DELETE FROM {self._fts_table} WHERE rowid = ?", rows
+            )
+            self.connection.executemany(
+                f"DELETE FROM {self._rows_table} WHERE row = ?", rows
+            )
+
+    def clear(self) -> None:
+        """Empty the index by recreating its tables, whatever its size."""
+        with self._lock, self.connection:
+            self.connection.execute(f"DROP TABLE IF EXISTS {self._fts_table}")
+            self.connection.execute(f"DROP TABLE IF EXISTS {self._rows_table}")
+            self._create_tables(self.connection)
+
+    def count(self) -> int:
+        with self._lock:
+            row = self.connection.execute(
+                f"SELECT COUNT(*) FROM {self._fts_table}"
+            ).fetchone()
+        return int(row[0])
+
+    def search(self, query: str, n_results: int = 10) -> list[LexicalMatch]:
+        """Rank tracks by BM25 over any of the query terms."""
+        tokens = self._tokenize(query)
+        if not tokens:
+            return []
+
+        weights = ", ".join(str(weight) for weight in LEXICAL_COLUMNS.values())
+        # Quoting each token keeps FTS5 operators and punctuation in user input
+        # from being parsed as query syntax.
+        match_expression = " OR ".join(f'"{token}"' for token in tokens)
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT track_id, bm25({self._fts_table}, 0, {weights}) AS rank "
+                f"FROM {self._fts_table} WHERE {self._fts_table} MATCH ? "
+                "ORDER BY rank LIMIT ?",
+                (match_expression, n_results),
+            ).fetchall()
+        # FTS5 reports BM25 as a negative number where lower is better
+        return [LexicalMatch(track_id=track_id, score=-rank) for track_id, rank in rows]
+
+    def has_exact_match(self, query: str) -> bool:
+        """Check whether the query is a title, artist, album or lyric line.
+
+        A single word only counts when it is a whole title, artist or album:
+        "love" is a vibe, even if some title contains it.
+        """
+        tokens = self._tokenize(query)
+        if not tokens:
+            return False
+
+        phrase = f'"{" ".join(tokens)}"'
+        fields = f"{{{' '.join(EXACT_MATCH_COLUMNS)}}}"
+        if len(tokens) == 1:
+            return self._matches_whole_field(tokens, f"{fields} : ^{phrase}")
+
+        expression = f"{fields} : {phrase}"
+        if len(tokens) >= LYRIC_PHRASE_MIN_TOKENS:
+            expression = f"{expression} OR lyrics : {phrase}"
+        with self._lock:
+            row = self.connection.execute(
+                f"SELECT 1 FROM {self._fts_table} WHERE {self._fts_table} MATCH ? "
+                "LIMIT 1",
+                (expression,),
+            ).fetchone()
+        return row is not None
+
+    def _matches_whole_field(self, tokens: list[str], expression: str) -> bool:
+        """Check the fields starting with the tokens for one made of them only."""
+        with self._lock:
+            candidates = self.connection.execute(
+                f"SELECT {', '.join(EXACT_MATCH_COLUMNS)} FROM {self._fts_table} "
+                f"WHERE {self._fts_table} MATCH ?",
+                (expression,),
+            )
+            return any(
+                self._tokenize(field) == tokens
+                for fields in candidates
+                for field in fields
+            )
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _create_tables(self, connection: sqlite3.Connection) -> None:
+        has_rows_table = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (f"{self.table}_rows",)
+        ).fetchone()
+        with connection:
+            connection.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self._fts_table} USING fts5("
+                f"track_id UNINDEXED, {', '.join(LEXICAL_COLUMNS)}, "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._rows_table} ("
+                "row INTEGER PRIMARY KEY, track_id TEXT NOT NULL UNIQUE)"
+            )
+            if has_rows_table is None:
+                # Indexes written before the rowid mapping existed
+                connection.execute(
+                    f"INSERT OR IGNORE INTO {self._rows_table} (row, track_id) "
+                    f"SELECT rowid, track_id FROM {self._fts_table}"
+                )
+
+    def _rows(self, track_ids: Sequence[str]) -> dict[str, int]:
+        """FTS rowids of the given tracks (unknown tracks are skipped)."""
+        rows: dict[str, int] = {}
+        for batch in itertools.batched(track_ids, SQLITE_BATCH_SIZE):
+            rows.update(
+                self.connection.execute(
+                    f"SELECT track_id, row FROM {self._rows_table} WHERE track_id "
+                    f"IN ({', '.join('?' for _ in batch)})",
+                    batch,
+                ).fetchall()
+            )
+        return rows
+
+    def _tokenize(self, query: str) -> list[str]:  # pylint: disable=no-self-use
+        return LEXICAL_TOKEN_PATTERN.findall(query.lower())
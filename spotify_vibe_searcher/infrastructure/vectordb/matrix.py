@@ -0,0 +1,230 @@
+"""Memory-mapped float32 copy of a collection's embeddings."""
+
+import itertools
+import sqlite3
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from pydantic import BaseModel, PrivateAttr
+
+from spotify_vibe_searcher.utils import LogLevel, Settings, log
+
+from ..embedding.config import SQLITE_BATCH_SIZE
+from .config import EMBEDDING_MATRIX_MAX_DEAD_FRACTION
+from .store import Embeddings
+
+
+class EmbeddingMatrix(BaseModel):
+    """Embeddings of a collection as a raw float32 file other processes can map.
+
+    Rows live in `<collection>.<generation>.f32`, row-major, and a SQLite
+    index maps each track ID to its row. Adding appends rows (or overwrites
+    a track's row in place) and deleting only drops the ID, so the file
+    never shrinks under a reader's memory map. Once deleted rows exceed
+    `EMBEDDING_MATRIX_MAX_DEAD_FRACTION` the live rows are copied into the
+    next generation's file and the old one is unlinked; readers that still
+    map it keep their (now stale) view until they read again.
+
+    Writes are serialized within one process; other processes only read.
+    """
+
+    collection_name: str
+
+    _connection: Optional[sqlite3.Connection] = None  # noqa
+    _lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
+
+    @property
+    def index_path(self) -> Path:
+        return Settings.EMBEDDING_MATRIX_PATH / f"{self.collection_name}.db"
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Lazy-load the SQLite row index."""
+        if self._connection is None:
+            Settings.EMBEDDING_MATRIX_PATH.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.index_path, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rows "
+                "(id TEXT PRIMARY KEY, row INTEGER NOT NULL UNIQUE)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS state "
+                "(key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            self._connection = connection
+        return self._connection
+
+    @property
+    def dimension(self) -> int:
+        return self._state("dimension")
+
+    def count(self) -> int:
+        """Number of live (not deleted) rows."""
+        with self._lock:
+            row = self.connection.execute("SELECT COUNT(*) FROM rows").fetchone()
+        return int(row[0])
+
+    def read(self) -> tuple[list[str], np.ndarray]:
+        """Track IDs and their embeddings, row for row.
+
+        When no rows are dead the matrix is a read-only memory map of the
+        file itself, shared zero-copy with every other reader; otherwise
+        the live rows are gathered into a new array.
+        """
+        try:
+            return self._read()
+        except FileNotFoundError:
+            # Another process compacted the matrix between the index and file reads
+            return self._read()
+
+    def _read(self) -> tuple[list[str], np.ndarray]:
+        with self._lock:
+            # One read transaction, so the rows match the generation's file
+            self.connection.execute("BEGIN")
+            try:
+                generation = self._state("generation")
+                allocated = self._state("rows")
+                dimension = self._state("dimension")
+                rows = self.connection.execute(
+                    "SELECT id, row FROM rows ORDER BY row"
+                ).fetchall()
+            finally:
+                self.connection.commit()
+        if not rows:
+            return [], np.empty((0, dimension), dtype=np.float32)
+
+        matrix = np.memmap(
+            self._data_path(generation),
+            dtype=np.float32,
+            mode="r",
+            shape=(allocated, dimension),
+        )
+        ids = [track_id for track_id, _ in rows]
+        if len(rows) == allocated:
+            return ids, matrix
+        return ids, np.asarray(matrix[[row for _, row in rows]])
+
+    def add(self, ids: Sequence[str], embeddings: Embeddings) -> None:
+        """Insert rows for new IDs and overwrite the rows of known ones."""
+        if not ids:
+            return
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        with self._lock:
+            dimension = self.dimension or vectors.shape[1]
+            if vectors.shape[1] != dimension:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match "
+                    f"matrix dimension {dimension}"
+                )
+            existing = self._rows(ids)
+            allocated = self._state("rows")
+            new_rows: dict[str, int] = {}
+            for track_id in ids:
+                if track_id not in existing and track_id not in new_rows:
+                    new_rows[track_id] = allocated + len(new_rows)
+            positions = {**existing, **new_rows}
+
+            # Rows are on disk before the index points at them
+            path = self._data_path(self._state("generation"))
+            with path.open("r+b" if path.exists() else "w+b") as data:
+                for track_id, vector in zip(ids, vectors, strict=True):
+                    data.seek(positions[track_id] * dimension * 4)
+                    data.write(vector.tobytes())
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO rows (id, row) VALUES (?, ?)", new_rows.items()
+                )
+                self._set_state("rows", allocated + len(new_rows))
+                self._set_state("dimension", dimension)
+
+    def delete(self, ids: Sequence[str]) -> None:
+        with self._lock:
+            with self.connection:
+                self.connection.executemany(
+                    "DELETE FROM rows WHERE id = ?", [(track_id,) for track_id in ids]
+                )
+            allocated = self._state("rows")
+            dead = allocated - self.count()
+            if dead > EMBEDDING_MATRIX_MAX_DEAD_FRACTION * allocated:
+                self.compact()
+
+    def load(self, ids: Sequence[str], embeddings: Embeddings) -> None:
+        """Replace the matrix contents with a full copy of the collection."""
+        with self._lock:
+            self.drop()
+            self.add(ids, embeddings)
+        log(
+            f"Wrote {len(ids)} embeddings to the matrix of '{self.collection_name}'",
+            LogLevel.INFO,
+        )
+
+    def compact(self) -> None:
+        """Rewrite the live rows densely into the next generation's file."""
+        with self._lock:
+            ids, vectors = self.read()
+            previous = self._state("generation")
+            generation = previous + 1
+            np.ascontiguousarray(vectors, dtype=np.float32).tofile(
+                self._data_path(generation)
+            )
+            with self.connection:
+                self.connection.execute("DELETE FROM rows")
+                self.connection.executemany(
+                    "INSERT INTO rows (id, row) VALUES (?, ?)",
+                    [(track_id, row) for row, track_id in enumerate(ids)],
+                )
+                self._set_state("rows", len(ids))
+                self._set_state("generation", generation)
+            self._data_path(previous).unlink(missing_ok=True)
+        log(
+            f"Compacted the embedding matrix of '{self.collection_name}' "
+            f"to {len(ids)} rows",
+            LogLevel.DEBUG,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def drop(self) -> None:
+        """Delete the matrix file(s) and the row index."""
+        with self._lock:
+            self.close()
+            for path in Settings.EMBEDDING_MATRIX_PATH.glob(
+                f"{self.collection_name}.*"
+            ):
+                path.unlink()
+
+    def _data_path(self, generation: int) -> Path:
+        return Settings.EMBEDDING_MATRIX_PATH / (
+            f"{self.collection_name}.{generation}.f32"
+        )
+
+    def _rows(self, ids: Sequence[str]) -> dict[str, int]:
+        """Rows of the given IDs (unknown IDs are skipped)."""
+        rows: dict[str, int] = {}
+        for batch in itertools.batched(ids, SQLITE_BATCH_SIZE):
+            rows.update(
+                self.connection.execute(
+                    f"SELECT id, row FROM rows WHERE id IN "
+                    f"({', '.join('?' for _ in batch)})",
+                    batch,
+                ).fetchall()
+            )
+        return rows
+
+    def _state(self, key: str) -> int:
+        row = self.connection.execute(
+            "SELECT value FROM state WHERE key = ?", (key,)
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def _set_state(self, key: str, value: int) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value)
+        )
@@ -1,114 +1,372 @@
-"""ChromaDB vector database repository."""
+# pylint: disable=too-many-lines
+"""Vector database repository."""
 
-from typing import Optional
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections.abc import Generator, Sequence
+from functools import cache, lru_cache
+from pathlib import Path
+from typing import Literal, Optional
 
-from chromadb import Collection, PersistentClient
-from chromadb.utils.embedding_functions import OllamaEmbeddingFunction
-from pydantic import BaseModel
+import numpy as np
+from pydantic import BaseModel, PrivateAttr
 
-from spotify_vibe_searcher.domain import EnrichedTrack
+from spotify_vibe_searcher.domain import EnrichedTrack, MigrationProgress, TrackSummary
 from spotify_vibe_searcher.utils import LogLevel, Settings, log
 
+from ..embedding import EmbeddingCache, EmbeddingClient
+from .chroma_store import ChromaVectorStore
+from .config import (
+    DOCUMENT_HASH_KEY,
+    EMBEDDING_DIMENSION_KEY,
+    EMBEDDING_MODEL_KEY,
+    HASHED_USER_COLLECTION_SEPARATOR,
+    METADATA_HASH_KEY,
+    SNAPSHOT_BATCH_SIZE,
+    USER_COLLECTION_SEPARATOR,
+    USER_ID_PATTERN,
+    WRITE_VERSION_KEY,
+)
+from .exact import ExactSearchEngine, rescore
+from .faiss_store import FaissVectorStore
+from .lexical import LexicalDocument, LexicalIndex, LexicalMatch
+from .matrix import EmbeddingMatrix
+from .snapshot import Snapshot, SnapshotManifest
+from .store import (
+    Embeddings,
+    Metadata,
+    RecordPage,
+    UpsertResult,
+    VectorMatch,
+    VectorRecord,
+    VectorStore,
+)
 
-class VectorDBRepository(BaseModel):
-    """Repository for ChromaDB vector database operations."""
+# Metadata fields the library can be browsed by
+TrackSort = Literal["popularity", "added_at"]
 
-    _client: Optional[PersistentClient] = None  # noqa
+# Serializes read-modify-write of the active collection pointers across users
+_ACTIVE_COLLECTIONS_LOCK = threading.Lock()
+
+
+class VectorDBRepository(  # pylint: disable=too-many-public-methods, too-many-instance-attributes
+    BaseModel
+):
+    """Repository for vector database operations on indexed tracks.
+
+    With `user_id` set the repository works on that user's own collection
+    (and lexical index), so searches only scan one library and clearing it
+    leaves other users untouched.
+    """
+
+    user_id: str | None = None
+
+    _store: Optional[VectorStore] = None  # noqa
+    _embedding_client: Optional[EmbeddingClient] = None  # noqa
+    _embedding_cache: Optional[EmbeddingCache] = None  # noqa
+    _lexical_index: Optional[LexicalIndex] = None  # noqa
+    _exact_engine: Optional[ExactSearchEngine] = None  # noqa
+    _embedding_matrix: Optional[EmbeddingMatrix] = None  # noqa
+    _embedding_dimension: Optional[int] = None  # noqa
+    _embedding_model: Optional[str] = None  # noqa
+    # Write version token, with the monotonic time it was read at
+    _version: Optional[tuple[float, str | None]] = None  # noqa
+    # Serializes writes with the final catch-up of an embedding migration
+    _write_lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
+    # Track IDs in sort order per (field, descending), with the collection
+    # version they were read at
+    _sorted_ids: dict[tuple[str, bool], tuple[str | None, list[str]]] = PrivateAttr(
+        default_factory=dict
+    )
+
+    @staticmethod
+    def for_user(user_id: str | None = None) -> "VectorDBRepository":
+        """The process-wide repository of a Spotify user's library.
+
+        Every user shares the `CHROMADB_COLLECTION` repository unless
+        `MULTI_TENANT` is enabled.
+        """
+        return _shared_repository((Settings.MULTI_TENANT and user_id) or None)
+
+    @property
+    def base_collection(self) -> str:
+        """Name of this library's collection before any embedding migration."""
+        base = Settings.CHROMADB_COLLECTION
+        if self.user_id is None:
+            return base
+        if USER_ID_PATTERN.fullmatch(self.user_id):
+            return f"{base}{USER_COLLECTION_SEPARATOR}{self.user_id}"
+        # Collection and table names only allow a few characters
+        user_hash = _content_hash(self.user_id)[:16]
+        return f"{base}{HASHED_USER_COLLECTION_SEPARATOR}{user_hash}"
+
+    @property
+    def store(self) -> VectorStore:
+        """Lazy-load the active collection of the backend set by `VECTOR_BACKEND`.
+
+        The active-collection pointer is re-checked on every access (a stat
+        while the file is unchanged), so once another process or replica
+        finishes a migration this one moves to the new collection before
+        the old one is queried again.
+        """
+        active = self.active_collection
+        if self._store is None or self._store.collection_name != active:
+            if self._store is not None:
+                log(f"Following the switch to collection '{active}'", LogLevel.INFO)
+            store = self._make_store(active)
+            self._use_store(store)
+            return store
+        return self._store
 
     @property
-    def client(self) -> PersistentClient:
-        """Lazy-load persistent ChromaDB client."""
-        if self._client is None:
-            Settings.CHROMADB_PATH.mkdir(parents=True, exist_ok=True)
-            log(
-                f"Initializing ChromaDB client at {Settings.CHROMADB_PATH}",
-                LogLevel.INFO,
+    def active_collection(self) -> str:
+        """Name of the collection searches and writes go to.
+
+        `base_collection` until `migrate_embeddings` switches to a versioned
+        copy (`tracks_v2`, `tracks_v3`, ...).
+        """
+        base = self.base_collection
+        return _read_active_collections().get(base, base)
+
+    @property
+    def embedding_client(self) -> EmbeddingClient:
+        if self._embedding_client is None:
+            self._embedding_client = EmbeddingClient()
+        return self._embedding_client
+
+    @property
+    def embedding_cache(self) -> EmbeddingCache:
+        if self._embedding_cache is None:
+            self._embedding_cache = EmbeddingCache.from_settings()
+        return self._embedding_cache
+
+    @property
+    def lexical_index(self) -> LexicalIndex:
+        """Lazy-load the full-text index, backfilling it from the collection."""
+        if self._lexical_index is None:
+            self._lexical_index = LexicalIndex(table=self.base_collection)
+            if self._lexical_index.count() == 0 and self.count_tracks() > 0:
+                self._backfill_lexical_index(self._lexical_index)
+        return self._lexical_index
+
+    @property
+    def embedding_matrix(self) -> EmbeddingMatrix:
+        """Lazy-load the memory-mapped embedding sidecar of the active collection.
+
+        It is rebuilt from the store when its size disagrees with the
+        collection's, and kept current by every write from then on.
+        """
+        if self._embedding_matrix is None:
+            matrix = EmbeddingMatrix(collection_name=self.active_collection)
+            if matrix.count() != self.count_tracks():
+                ids, embeddings = self._stored_embeddings()
+                matrix.load(ids, embeddings)
+            self._embedding_matrix = matrix
+        return self._embedding_matrix
+
+    @property
+    def exact_engine(self) -> ExactSearchEngine:
+        """Lazy-load all stored embeddings into the in-memory exact engine."""
+        if self._exact_engine is None:
+            ids, embeddings = (
+                self.embedding_matrix.read()
+                if Settings.EMBEDDING_MATRIX
+                else self._stored_embeddings()
             )
-            self._client = PersistentClient(path=str(Settings.CHROMADB_PATH))
-        return self._client
+            engine = ExactSearchEngine(quantization=Settings.VECTOR_QUANTIZATION)
+            engine.load(ids, embeddings)
+            self._exact_engine = engine
+        return self._exact_engine
 
     @property
-    def collection(self) -> Collection:
-        return self.get_or_create_collection()
+    def collection_version(self) -> str | None:
+        """Token renewed by every write, for invalidating caches.
+
+        It lives in the collection metadata, so writes by other processes
+        (the snapshot CLI, a migration, another replica) are seen too, within
+        `COLLECTION_VERSION_TTL` seconds. This process's own writes are seen
+        at once.
+        """
+        now = time.monotonic()
+        if self._version is None or (
+            now - self._version[0] >= Settings.COLLECTION_VERSION_TTL
+        ):
+            version = self.store.get_collection_metadata().get(WRITE_VERSION_KEY)
+            self._version = (now, None if version is None else str(version))
+        return self._version[1]
+
+    @property
+    def embedding_model(self) -> str:
+        """Model the active collection was embedded with.
+
+        Queries and new tracks are embedded with it too, so search keeps
+        working after `EMBEDDING_MODEL` changes until `migrate_embeddings`
+        has re-embedded the collection. `EMBEDDING_MODEL` for collections
+        that recorded no model.
+        """
+        if self._embedding_model is None:
+            model = self.store.get_collection_metadata().get(EMBEDDING_MODEL_KEY)
+            if model is None:
+                return Settings.EMBEDDING_MODEL
+            self._embedding_model = str(model)
+        return self._embedding_model
 
-    def get_or_create_collection(self) -> Collection:
-        """Get or create a collection by name with cosine similarity."""
-        return self.client.get_or_create_collection(
-            name=Settings.CHROMADB_COLLECTION,
-            embedding_function=OllamaEmbeddingFunction(
-                model_name=Settings.EMBEDDING_MODEL
-            ),
-            metadata={"hnsw:space": "cosine"},  # Use cosine similarity
+    @property
+    def needs_migration(self) -> bool:
+        """Whether stored tracks predate the configured `EMBEDDING_MODEL`."""
+        return (
+            self.embedding_model != Settings.EMBEDDING_MODEL and self.count_tracks() > 0
         )
 
-    def add_track(self, enriched_track: EnrichedTrack) -> None:
-        """Add a single enriched track to the collection."""
-        if not enriched_track.vibe_description:
-            return
+    @property
+    def embedding_dimension(self) -> int | None:
+        """Size of the stored embeddings, as recorded in the collection metadata.
 
-        track = enriched_track.track.track
+        None until the first tracks are indexed (or for collections indexed
+        before the dimension was recorded).
+        """
+        if self._embedding_dimension is None:
+            dimension = self.store.get_collection_metadata().get(
+                EMBEDDING_DIMENSION_KEY
+            )
+            if dimension is not None:
+                self._embedding_dimension = int(dimension)
+        return self._embedding_dimension
 
-        metadata = {
-            "track_id": enriched_track.track_id,
-            "track_name": track.name,
-            "artist_names": track.artist_names,
-            "album_name": track.album.name,
-            "has_lyrics": enriched_track.has_lyrics,
-            "genres": track.all_genre_names,
-            "popularity": track.popularity,
-            "spotify_url": track.spotify_url,
-        }
+    def add_track(self, enriched_track: EnrichedTrack) -> UpsertResult:
+        """Add or update a single enriched track (see `add_tracks`)."""
+        if not enriched_track.vibe_description:
+            return UpsertResult()
 
+        track = enriched_track.track.track
         log(
             f"Storing track '{track.name}' with genres: '{track.all_genre_names}'",
             LogLevel.DEBUG,
         )
+        return self._index_tracks([enriched_track])
+
+    def add_tracks(
+        self,
+        enriched_tracks: list[EnrichedTrack],
+        embeddings: Embeddings | None = None,
+    ) -> UpsertResult:
+        """Upsert multiple enriched tracks in a single batch.
+
+        Incoming tracks are compared with the stored content hashes in one
+        lookup. Only new tracks and tracks whose vibe description changed
+        are embedded and written; tracks whose metadata alone changed have
+        it updated in place, and unchanged tracks are skipped.
 
-        self.collection.add(
-            ids=[enriched_track.track_id],
-            documents=[enriched_track.vibe_description],
-            metadatas=[metadata],
+        Args:
+            enriched_tracks: Tracks to index; those without a vibe description
+                are skipped.
+            embeddings: Optional precomputed vectors from `embed_documents`,
+                one per track in `enriched_tracks`. When omitted the vibe
+                descriptions that need it are embedded here.
+
+        Returns:
+            How many tracks were added, updated, refreshed or left unchanged.
+        """
+        valid = [i for i, track in enumerate(enriched_tracks) if track.vibe_description]
+        if not valid:
+            return UpsertResult()
+
+        log(f"Adding {len(valid)} tracks to VectorDB...", LogLevel.INFO)
+        result = self._index_tracks(
+            [enriched_tracks[i] for i in valid],
+            None if embeddings is None else np.asarray(embeddings)[valid],
+        )
+        log(
+            f"Stored tracks in VectorDB ({result.added} added, {result.updated} "
+            f"updated, {result.refreshed} refreshed, {result.unchanged} unchanged).",
+            LogLevel.INFO,
         )
+        return result
 
-    def add_tracks(self, enriched_tracks: list[EnrichedTrack]) -> None:
-        """Add multiple enriched tracks to the collection in a single batch."""
-        valid_tracks = [t for t in enriched_tracks if t.vibe_description]
-        if not valid_tracks:
-            return
+    def refresh_metadata(self, tracks: Sequence[TrackSummary]) -> UpsertResult:
+        """Update the stored metadata of tracks already in the library.
 
-        log(f"Adding {len(valid_tracks)} tracks to VectorDB...", LogLevel.INFO)
-
-        ids = []
-        documents = []
-        metadatas = []
-
-        for enriched_track in valid_tracks:
-            track = enriched_track.track.track
-            ids.append(enriched_track.track_id)
-            documents.append(enriched_track.vibe_description)
-            metadatas.append({
-                "track_id": enriched_track.track_id,
-                "track_name": track.name,
-                "artist_names": track.artist_names,
-                "album_name": track.album.name,
-                "has_lyrics": enriched_track.has_lyrics,
-                "genres": track.all_genre_names,
-                "popularity": track.popularity,
-                "spotify_url": track.spotify_url,
-            })
+        Fresh Spotify data (popularity, genres, names) is hashed and compared
+        with what is stored; only changed tracks are written, and nothing is
+        re-embedded. Tracks not in the library are ignored.
+        """
+        fresh = {track.track_id: track for track in tracks}
+        if not fresh:
+            return UpsertResult()
 
-        self.collection.add(ids=ids, documents=documents, metadatas=metadatas)
-        log("Successfully added tracks to VectorDB.", LogLevel.INFO)
+        ids, metadatas = [], []
+        stored = self.store.get(ids=list(fresh), include_documents=False)
+        for record in stored:
+            metadata = self._track_metadata(
+                fresh[record.id], has_lyrics=bool(record.metadata.get("has_lyrics"))
+            )
+            if DOCUMENT_HASH_KEY in record.metadata:
+                metadata[DOCUMENT_HASH_KEY] = record.metadata[DOCUMENT_HASH_KEY]
+            if metadata[METADATA_HASH_KEY] != record.metadata.get(METADATA_HASH_KEY):
+                ids.append(record.id)
+                metadatas.append(metadata)
+
+        if ids:
+            log(f"Refreshing metadata of {len(ids)} tracks...", LogLevel.INFO)
+            with self._write_lock:
+                self.store.update_metadata(ids, metadatas)
+                self.lexical_index.update_metadata([
+                    self._to_lexical_metadata(track_id, metadata)
+                    for track_id, metadata in zip(ids, metadatas, strict=True)
+                ])
+                self._renew_version()
+        return UpsertResult(refreshed=len(ids), unchanged=len(stored) - len(ids))
 
     def delete_tracks(self, track_ids: list[str]) -> None:
         log(f"Deleting {len(track_ids)} tracks from VectorDB...", LogLevel.INFO)
-        self.collection.delete(ids=track_ids)
+        with self._write_lock:
+            matrix = self._maintained_matrix()
+            self.store.delete(track_ids)
+            self.lexical_index.delete(track_ids)
+            if self._exact_engine is not None:
+                self._exact_engine.delete(track_ids)
+            if matrix is not None:
+                matrix.delete(track_ids)
+            self._renew_version()
+
+    def reset(self) -> None:
+        """Remove every track by dropping the collection instead of its rows.
+
+        Takes the same few milliseconds for any library size. The lexical
+        index, the exact engine and the cached sort orders go with it, and
+        the collection is recreated empty with a new version token, which
+        invalidates shared result caches. It records the configured
+        `EMBEDDING_MODEL` with its first tracks. The embedding cache is kept,
+        so a re-sync does not re-embed unchanged descriptions.
+        """
+        log(f"Resetting collection '{self.active_collection}'...", LogLevel.INFO)
+        with self._write_lock:
+            self.store.drop()
+            self.lexical_index.clear()
+            self._drop_embedding_matrix(self.active_collection)
+            self._exact_engine = None
+            self._embedding_dimension = None
+            self._embedding_model = None
+            self._sorted_ids.clear()
+            self._renew_version()
 
     def track_exists(self, track_id: str) -> bool:
-        result = self.collection.get(ids=[track_id])
-        return len(result["ids"]) > 0
+        return len(self.store.get(ids=[track_id])) > 0
+
+    def existing_track_ids(self, track_ids: Sequence[str]) -> set[str]:
+        """The given IDs that are in the library, found with one lookup."""
+        if not track_ids:
+            return set()
+        return {
+            record.id
+            for record in self.store.get(ids=list(track_ids), include_documents=False)
+        }
 
-    def search_by_vibe(self, query: str, n_results: int = 10) -> dict[str, list]:
+    def search_by_vibe(self, query: str, n_results: int = 10) -> list[VectorMatch]:
         """Search for tracks by vibe description using semantic similarity.
 
         Args:
@@ -116,23 +374,724 @@ class VectorDBRepository(BaseModel):
             n_results: Maximum number of results to return.
 
         Returns:
-            Dictionary containing:
-                - ids: List of track IDs
-                - documents: List of vibe descriptions
-                - metadatas: List of track metadata
-                - distances: List of similarity distances (lower is better)
+            Matching tracks (ID, vibe description, metadata and cosine
+            distance), nearest first.
         """
         log(f"Searching for vibe: '{query}'", LogLevel.INFO)
-        results = self.collection.query(
-            query_texts=[query],
-            n_results=n_results,
+        return self.search_by_embedding(self.embed_query(query), n_results)
+
+    def embed_query(self, query: str) -> list[float]:
+        """Embed a query with the same model used for the stored tracks."""
+        return self.embed_queries([query])[0]
+
+    def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """Embed several queries with the model used for the stored tracks.
+
+        Queries bypass the embedding cache, which holds track documents only;
+        `SearchService` keeps repeated queries in memory instead.
+        """
+        if not queries:
+            return []
+        embeddings = self.embedding_client.embed(queries, self.embedding_model)
+        return self._truncate(embeddings).tolist()  # type: ignore[no-any-return]
+
+    def embed_documents(
+        self, documents: list[str], model: str | None = None
+    ) -> np.ndarray:
+        """Embed texts in concurrent batches, truncated to the stored size.
+
+        Texts already embedded with the model are read from the embedding
+        cache; only the rest are sent to the model. The result can be handed
+        to `add_tracks` later, so embedding can run ahead of (or alongside)
+        the writes.
+
+        Args:
+            documents: Texts to embed.
+            model: Embedding model, by default the active collection's.
+        """
+        model = model or self.embedding_model
+        vectors = self.embedding_cache.get(model, documents)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = self.embedding_client.embed(
+                [documents[i] for i in missing], model
+            )
+            self.embedding_cache.put(model, [documents[i] for i in missing], embedded)
+            for i, vector in zip(missing, embedded, strict=True):
+                vectors[i] = vector
+        if not vectors:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._truncate(np.stack(vectors))  # type: ignore[arg-type]
+
+    def search_by_embedding(
+        self,
+        embedding: list[float],
+        n_results: int = 10,
+        track_ids: list[str] | None = None,
+        include_embeddings: bool = False,
+    ) -> list[VectorMatch]:
+        """Search for the tracks nearest to a precomputed query embedding.
+
+        Args:
+            embedding: Query vector produced by `embed_query`.
+            n_results: Maximum number of results to return.
+            track_ids: Optional subset of track IDs to restrict the search to.
+            include_embeddings: Also return the stored embedding of each match.
+
+        Returns:
+            Same matches as `search_by_vibe`, with embeddings when requested.
+        """
+        return self.search_by_embeddings(
+            [embedding], n_results, track_ids, include_embeddings
+        )[0]
+
+    def search_by_embeddings(
+        self,
+        embeddings: list[list[float]],
+        n_results: int = 10,
+        track_ids: list[str] | None = None,
+        include_embeddings: bool = False,
+    ) -> list[list[VectorMatch]]:
+        """Run several nearest-neighbour queries in a single store lookup.
+
+        Returns:
+            One list of matches per query embedding, in order.
+
+        Raises:
+            ValueError: If a query's size differs from the stored embeddings.
+        """
+        self._check_query_dimension(embeddings)
+        if Settings.VECTOR_SEARCH_ENGINE == "exact":
+            results = self._search_exact(
+                embeddings, n_results, track_ids, include_embeddings
+            )
+        else:
+            results = self.store.query(
+                embeddings,
+                n_results,
+                ids=track_ids,
+                include_embeddings=include_embeddings,
+            )
+        log(
+            f"Found {sum(len(matches) for matches in results)} matching tracks "
+            f"for {len(embeddings)} queries",
+            LogLevel.INFO,
         )
-        log(f"Found {len(results['ids'][0])} matching tracks", LogLevel.INFO)
-        return results  # type: ignore[no-any-return]
+        return results
 
-    def get_all_tracks(self) -> dict[str, list]:
+    def search_lexical(self, query: str, n_results: int = 10) -> list[LexicalMatch]:
+        """Rank tracks by exact term matches (BM25) instead of semantics."""
+        return self.lexical_index.search(query, n_results)
+
+    def has_exact_match(self, query: str) -> bool:
+        return self.lexical_index.has_exact_match(query)
+
+    def get_tracks(
+        self, track_ids: list[str], include_embeddings: bool = False
+    ) -> list[VectorRecord]:
+        """Stored records for the given IDs (unknown IDs are skipped)."""
+        if not track_ids:
+            return []
+        return self.store.get(ids=track_ids, include_embeddings=include_embeddings)
+
+    def get_all_tracks(self) -> list[VectorRecord]:
         log("Retrieving all tracks from VectorDB...", LogLevel.INFO)
-        return self.collection.get()  # type: ignore[no-any-return]
+        return self.store.get()
+
+    def browse_tracks(  # pylint: disable=too-many-arguments
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        *,
+        sort_by: TrackSort | None = None,
+        descending: bool = True,
+        include_documents: bool = True,
+    ) -> RecordPage:
+        """One page of stored tracks, for listing the library.
+
+        Args:
+            limit: Maximum number of tracks in the page.
+            offset: Number of tracks to skip.
+            sort_by: Metadata field to order by; storage order if None.
+                Tracks without the field come last.
+            descending: Order from highest to lowest `sort_by` value.
+            include_documents: Also load the vibe descriptions.
+
+        Returns:
+            The page's records and the total number of tracks.
+        """
+        total = self.store.count()
+        if sort_by is None:
+            records = self.store.get(
+                include_documents=include_documents, limit=limit, offset=offset
+            )
+            return RecordPage(records=records, total=total, offset=offset)
+
+        page_ids = self._sorted_track_ids(sort_by, descending)[offset : offset + limit]
+        by_id = {
+            record.id: record
+            for record in self.store.get(
+                ids=page_ids, include_documents=include_documents
+            )
+        }
+        return RecordPage(
+            records=[by_id[track_id] for track_id in page_ids if track_id in by_id],
+            total=total,
+            offset=offset,
+        )
 
     def count_tracks(self) -> int:
-        return int(self.collection.count())
+        return self.store.count()
+
+    def migrate_embeddings(
+        self, batch_size: int | None = None
+    ) -> Generator[MigrationProgress, None, None]:
+        """Re-embed the library with `EMBEDDING_MODEL` without downtime.
+
+        The stored vibe descriptions and metadata are paged, batch by batch,
+        into the next versioned collection while searches and writes keep
+        using the active one. Tracks added, changed or deleted in the
+        meantime are reconciled under the write lock, then the new collection
+        is made active and the old one dropped. No lyrics or LLM calls are
+        needed.
+
+        Args:
+            batch_size: Tracks re-embedded per step, `EMBEDDING_BATCH_SIZE`
+                by default.
+
+        Yields:
+            Progress after each batch.
+        """
+        batch_size = batch_size or Settings.EMBEDDING_BATCH_SIZE
+        model = Settings.EMBEDDING_MODEL
+        source, source_name = self.store, self.active_collection
+        target_name = self._next_collection_name()
+        target = self._make_store(target_name)
+        target.drop()  # Leftovers of an interrupted migration
+
+        total = source.count()
+        log(
+            f"Re-embedding {total} tracks with {model} into '{target_name}'...",
+            LogLevel.INFO,
+        )
+        for start in range(0, total, batch_size):
+            self._copy_records(
+                source.get(limit=batch_size, offset=start), target, model
+            )
+            yield MigrationProgress(current=min(start + batch_size, total), total=total)
+
+        with self._write_lock:
+            self._reconcile_copy(source, target, model, batch_size)
+            self._activate_collection(target_name, target)
+        source.drop()
+        self._drop_embedding_matrix(source_name)
+        log(f"Switched to collection '{target_name}'.", LogLevel.INFO)
+
+    def export_snapshot(
+        self, path: Path, batch_size: int = SNAPSHOT_BATCH_SIZE
+    ) -> Generator[MigrationProgress, None, None]:
+        """Write every stored track, with its embedding, to a snapshot directory.
+
+        Records are paged out of the store `batch_size` at a time. Writes
+        wait until the export is done, so the snapshot is consistent.
+
+        Yields:
+            Progress after each batch.
+        """
+        with self._write_lock:
+            total = self.store.count()
+            manifest = SnapshotManifest(
+                collection=self.active_collection,
+                count=total,
+                embedding_dimension=self.embedding_dimension,
+                embedding_model=self.embedding_model,
+            )
+            log(f"Exporting {total} tracks to {path}...", LogLevel.INFO)
+            batches = (
+                self.store.get(include_embeddings=True, limit=batch_size, offset=start)
+                for start in range(0, total, batch_size)
+            )
+            for written in Snapshot(path=path).write(manifest, batches):
+                yield MigrationProgress(current=written, total=total)
+        log(f"Exported {total} tracks to {path}.", LogLevel.INFO)
+
+    def import_snapshot(
+        self, path: Path, batch_size: int = SNAPSHOT_BATCH_SIZE
+    ) -> Generator[MigrationProgress, None, None]:
+        """Bulk-load a snapshot written by `export_snapshot`.
+
+        The stored embeddings are written as they are, so nothing is sent to
+        Genius, the LLM or the embedding model. Tracks already in the
+        collection are overwritten by the snapshot's version.
+
+        Yields:
+            Progress after each batch.
+
+        Raises:
+            ValueError: If the snapshot is incomplete, or its embeddings do
+                not match the model or size of a non-empty collection.
+        """
+        snapshot = Snapshot(path=path)
+        manifest = snapshot.read_manifest()
+        log(f"Importing {manifest.count} tracks from {path}...", LogLevel.INFO)
+        with self._write_lock:
+            self._adopt_embedding_space(manifest)
+            imported = 0
+            for records in snapshot.read(batch_size):
+                self._write_embedded(
+                    [record.id for record in records],
+                    np.stack([record.embedding for record in records]),  # type: ignore[misc]
+                    [record.document for record in records],
+                    [record.metadata for record in records],
+                )
+                self.lexical_index.upsert([
+                    self._to_lexical_record(record) for record in records
+                ])
+                self._renew_version()
+                imported += len(records)
+                yield MigrationProgress(current=imported, total=manifest.count)
+        log(f"Imported {imported} tracks from {path}.", LogLevel.INFO)
+
+    def _index_tracks(  # pylint: disable=too-many-locals
+        self, enriched_tracks: list[EnrichedTrack], embeddings: np.ndarray | None = None
+    ) -> UpsertResult:
+        """Write new and changed tracks to every index, skipping the rest."""
+        ids = [enriched_track.track_id for enriched_track in enriched_tracks]
+        metadatas = [self._to_metadata(track) for track in enriched_tracks]
+        stored = {
+            record.id: record.metadata
+            for record in self.store.get(ids=ids, include_documents=False)
+        }
+        changed, refreshed = [], []
+        for i, (track_id, metadata) in enumerate(zip(ids, metadatas, strict=True)):
+            previous = stored.get(track_id, {})
+            if previous.get(DOCUMENT_HASH_KEY) != metadata[DOCUMENT_HASH_KEY]:
+                changed.append(i)
+            elif previous.get(METADATA_HASH_KEY) != metadata[METADATA_HASH_KEY]:
+                refreshed.append(i)
+
+        result = UpsertResult(
+            added=sum(ids[i] not in stored for i in changed),
+            updated=sum(ids[i] in stored for i in changed),
+            refreshed=len(refreshed),
+            unchanged=len(ids) - len(changed) - len(refreshed),
+        )
+        if not result.written:
+            return result
+
+        changed_ids = [ids[i] for i in changed]
+        documents = [enriched_tracks[i].vibe_description or "" for i in changed]
+        if not changed:
+            vectors = None
+        elif embeddings is None:
+            vectors = self.embed_documents(documents)
+        else:
+            vectors = self._truncate(np.asarray(embeddings)[changed])
+
+        with self._write_lock:
+            if vectors is not None:
+                self._record_dimension(vectors.shape[1])
+                self._write_embedded(
+                    changed_ids, vectors, documents, [metadatas[i] for i in changed]
+                )
+            if refreshed:
+                self.store.update_metadata(
+                    [ids[i] for i in refreshed], [metadatas[i] for i in refreshed]
+                )
+            self.lexical_index.upsert([
+                self._to_lexical_document(enriched_tracks[i])
+                for i in changed + refreshed
+            ])
+            self._renew_version()
+        return result
+
+    def _write_embedded(
+        self,
+        ids: list[str],
+        embeddings: np.ndarray,
+        documents: list[str],
+        metadatas: list[Metadata],
+    ) -> None:
+        """Upsert records into the store and every copy of the embeddings."""
+        matrix = self._maintained_matrix()  # Backfilled before the store write
+        self.store.upsert(
+            ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas
+        )
+        if self._exact_engine is not None:
+            self._exact_engine.add(ids, embeddings)
+        if matrix is not None:
+            matrix.add(ids, embeddings)
+
+    def _sorted_track_ids(self, sort_by: TrackSort, descending: bool) -> list[str]:
+        """All track IDs ordered by a metadata field, cached per collection version.
+
+        Only IDs and metadata are read, so paging a sorted library still
+        loads documents for one page at a time.
+        """
+        key = (sort_by, descending)
+        cached = self._sorted_ids.get(key)
+        version = self.collection_version
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        keyed = [
+            (record.metadata.get(sort_by), record.id)
+            for record in self.store.get(include_documents=False)
+        ]
+        present = sorted(
+            ((value, track_id) for value, track_id in keyed if value is not None),
+            reverse=descending,
+        )
+        ids = [track_id for _, track_id in present] + [
+            track_id for value, track_id in keyed if value is None
+        ]
+        self._sorted_ids[key] = (version, ids)
+        return ids
+
+    def _renew_version(self) -> None:
+        """Record a write in the collection metadata (see `collection_version`)."""
+        version = uuid.uuid4().hex
+        self.store.update_collection_metadata({WRITE_VERSION_KEY: version})
+        self._version = (time.monotonic(), version)
+
+    def _maintained_matrix(self) -> EmbeddingMatrix | None:
+        """The embedding matrix, if writes have to keep it current."""
+        if Settings.EMBEDDING_MATRIX or self._embedding_matrix is not None:
+            return self.embedding_matrix
+        return None
+
+    def _drop_embedding_matrix(self, collection_name: str) -> None:
+        if self._embedding_matrix is not None and (
+            self._embedding_matrix.collection_name == collection_name
+        ):
+            self._embedding_matrix = None
+        EmbeddingMatrix(collection_name=collection_name).drop()
+
+    def _stored_embeddings(self) -> tuple[list[str], list[np.ndarray]]:
+        ids, embeddings = [], []
+        for record in self.store.get(include_embeddings=True, include_documents=False):
+            if record.embedding is not None:
+                ids.append(record.id)
+                embeddings.append(record.embedding)
+        return ids, embeddings
+
+    def _make_store(self, collection_name: str) -> VectorStore:  # pylint: disable=no-self-use
+        if Settings.VECTOR_BACKEND == "faiss":
+            return FaissVectorStore(
+                collection_name=collection_name,
+                index_type=Settings.FAISS_INDEX_TYPE,
+            )
+        return ChromaVectorStore(collection_name=collection_name)
+
+    def _next_collection_name(self) -> str:
+        base, active = self.base_collection, self.active_collection
+        version = 1 if active == base else int(active.removeprefix(f"{base}_v"))
+        return f"{base}_v{version + 1}"
+
+    def _copy_records(
+        self, records: list[VectorRecord], target: VectorStore, model: str
+    ) -> None:
+        """Re-embed stored records with `model` and write them to `target`."""
+        if not records:
+            return
+        documents = [record.document for record in records]
+        embeddings = self.embed_documents(documents, model)
+        target.update_collection_metadata({
+            EMBEDDING_DIMENSION_KEY: int(embeddings.shape[1]),
+            EMBEDDING_MODEL_KEY: model,
+        })
+        target.upsert(
+            ids=[record.id for record in records],
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=[record.metadata for record in records],
+        )
+
+    def _reconcile_copy(
+        self, source: VectorStore, target: VectorStore, model: str, batch_size: int
+    ) -> None:
+        """Bring `target` in line with writes made to `source` during a copy.
+
+        Records are compared by their metadata, which carries the content
+        hashes: missing or re-described tracks are re-embedded, tracks whose
+        metadata alone changed are updated in place, and tracks no longer in
+        `source` are deleted.
+        """
+        current = {
+            record.id: record.metadata for record in source.get(include_documents=False)
+        }
+        copied = {
+            record.id: record.metadata for record in target.get(include_documents=False)
+        }
+        stale = [
+            track_id
+            for track_id, metadata in current.items()
+            if copied.get(track_id) != metadata
+        ]
+        refreshed = [
+            track_id
+            for track_id in stale
+            if track_id in copied
+            and DOCUMENT_HASH_KEY in current[track_id]
+            and current[track_id][DOCUMENT_HASH_KEY]
+            == copied[track_id].get(DOCUMENT_HASH_KEY)
+        ]
+        if refreshed:
+            target.update_metadata(
+                refreshed, [current[track_id] for track_id in refreshed]
+            )
+        reembedded = sorted(set(stale) - set(refreshed))
+        for start in range(0, len(reembedded), batch_size):
+            self._copy_records(
+                source.get(ids=reembedded[start : start + batch_size]), target, model
+            )
+        target.delete([track_id for track_id in copied if track_id not in current])
+
+    def _activate_collection(self, collection_name: str, store: VectorStore) -> None:
+        """Point the repository (and future processes) at another collection."""
+        with _ACTIVE_COLLECTIONS_LOCK:
+            active = _read_active_collections()
+            active[self.base_collection] = collection_name
+            path = Settings.ACTIVE_COLLECTION_PATH
+            path.parent.mkdir(parents=True, exist_ok=True)
+            pending = path.with_suffix(".tmp")
+            pending.write_text(json.dumps(active))
+            os.replace(pending, path)  # Atomic, so readers never see a partial file
+
+        self._use_store(store)
+        self._renew_version()
+
+    def _use_store(self, store: VectorStore) -> None:
+        """Work on another collection, dropping what was derived from the last."""
+        self._store = store
+        self._exact_engine = None
+        self._embedding_matrix = None
+        self._embedding_dimension = None
+        self._embedding_model = None
+        self._version = None
+
+    def _search_exact(
+        self,
+        embeddings: list[list[float]],
+        n_results: int,
+        track_ids: list[str] | None,
+        include_embeddings: bool,
+    ) -> list[list[VectorMatch]]:
+        """Answer a query from the in-memory engine instead of the store.
+
+        A quantized engine over-fetches candidates, which are re-scored with
+        the float32 embeddings read back from the store.
+        """
+        quantized = Settings.VECTOR_QUANTIZATION != "none"
+        n_candidates = (
+            n_results * Settings.QUANTIZATION_RESCORE_FACTOR if quantized else n_results
+        )
+        ids, distances = self.exact_engine.search(embeddings, n_candidates, track_ids)
+
+        # Only the candidates' documents and metadata are read from the store
+        unique_ids = list(dict.fromkeys(i for row in ids for i in row))
+        records = {
+            record.id: record
+            for record in (
+                self.store.get(
+                    ids=unique_ids, include_embeddings=quantized or include_embeddings
+                )
+                if unique_ids
+                else []
+            )
+        }
+        if quantized:
+            ids, distances = rescore(
+                embeddings,
+                ids,
+                {
+                    track_id: record.embedding
+                    for track_id, record in records.items()
+                    if record.embedding is not None
+                },
+                n_results,
+            )
+
+        return [
+            [
+                VectorMatch(
+                    id=track_id,
+                    document=records[track_id].document,
+                    metadata=records[track_id].metadata,
+                    distance=distance,
+                    embedding=(
+                        records[track_id].embedding if include_embeddings else None
+                    ),
+                )
+                for track_id, distance in zip(row_ids, row_distances, strict=True)
+                if track_id in records
+            ]
+            for row_ids, row_distances in zip(ids, distances, strict=True)
+        ]
+
+    def _truncate(  # pylint: disable=no-self-use
+        self, embeddings: Embeddings
+    ) -> np.ndarray:
+        """Keep the first `EMBEDDING_DIMENSION` components, re-normalized.
+
+        Matryoshka-trained models front-load information, so a prefix of the
+        vector is itself a usable (smaller) embedding once rescaled to unit
+        length.
+        """
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        dimension = Settings.EMBEDDING_DIMENSION
+        if dimension is None or dimension == vectors.shape[1]:
+            return vectors
+        if dimension > vectors.shape[1]:
+            raise ValueError(
+                f"EMBEDDING_DIMENSION={dimension} exceeds the {vectors.shape[1]} "
+                f"dimensions produced by {Settings.EMBEDDING_MODEL}"
+            )
+        truncated = vectors[:, :dimension]
+        norms = np.linalg.norm(truncated, axis=1, keepdims=True)
+        return truncated / np.maximum(norms, 1e-12)  # type: ignore[no-any-return]
+
+    def _record_dimension(self, dimension: int) -> None:
+        """Record the embedding size and model on first write; refuse others."""
+        if self.embedding_dimension is None:
+            self.store.update_collection_metadata({
+                EMBEDDING_DIMENSION_KEY: dimension,
+                EMBEDDING_MODEL_KEY: self.embedding_model,
+            })
+            self._embedding_dimension = dimension
+        elif dimension != self.embedding_dimension:
+            raise ValueError(
+                f"Cannot add {dimension}-d embeddings to a collection of "
+                f"{self.embedding_dimension}-d embeddings; re-index the library "
+                "or set EMBEDDING_DIMENSION to match"
+            )
+
+    def _adopt_embedding_space(self, manifest: SnapshotManifest) -> None:
+        """Take the snapshot's model and size, or check them against ours."""
+        if manifest.embedding_dimension is None:
+            return
+        if self.count_tracks() == 0:
+            # An empty collection takes whatever the snapshot was embedded with
+            self.store.update_collection_metadata({
+                EMBEDDING_DIMENSION_KEY: manifest.embedding_dimension,
+                EMBEDDING_MODEL_KEY: manifest.embedding_model,
+            })
+            self._embedding_dimension = manifest.embedding_dimension
+            self._embedding_model = manifest.embedding_model
+            return
+        if manifest.embedding_model != self.embedding_model:
+            raise ValueError(
+                f"Snapshot was embedded with {manifest.embedding_model} but the "
+                f"collection uses {self.embedding_model}; reset the library first"
+            )
+        self._record_dimension(manifest.embedding_dimension)
+
+    def _check_query_dimension(self, embeddings: list[list[float]]) -> None:
+        for embedding in embeddings:
+            if self.embedding_dimension not in {None, len(embedding)}:
+                raise ValueError(
+                    f"Query embedding has {len(embedding)} dimensions but the "
+                    f"collection stores {self.embedding_dimension}-d embeddings; "
+                    "re-index the library or set EMBEDDING_DIMENSION to match"
+                )
+
+    def _backfill_lexical_index(self, lexical_index: LexicalIndex) -> None:
+        """Index tracks stored before the lexical index existed (without lyrics)."""
+        records = self.store.get()
+        log(
+            f"Backfilling lexical index with {len(records)} tracks...",
+            LogLevel.INFO,
+        )
+        lexical_index.upsert([self._to_lexical_record(record) for record in records])
+
+    def _to_lexical_record(self, record: VectorRecord) -> LexicalDocument:
+        """Lexical entry rebuilt from a stored record (lyrics are not stored)."""
+        document = self._to_lexical_metadata(record.id, record.metadata)
+        document.vibe_description = record.document
+        return document
+
+    def _to_lexical_metadata(  # pylint: disable=no-self-use
+        self, track_id: str, metadata: Metadata
+    ) -> LexicalDocument:
+        """Lexical entry with only the Spotify fields of stored metadata."""
+        return LexicalDocument(
+            track_id=track_id,
+            track_name=str(metadata.get("track_name", "")),
+            artist_names=str(metadata.get("artist_names", "")),
+            album_name=str(metadata.get("album_name", "")),
+            genres=str(metadata.get("genres", "")),
+        )
+
+    def _to_metadata(self, enriched_track: EnrichedTrack) -> Metadata:
+        metadata = self._track_metadata(
+            TrackSummary.from_saved_track(enriched_track.track),
+            has_lyrics=enriched_track.has_lyrics,
+        )
+        metadata[DOCUMENT_HASH_KEY] = _content_hash(
+            enriched_track.vibe_description or ""
+        )
+        return metadata
+
+    def _track_metadata(  # pylint: disable=no-self-use
+        self, track: TrackSummary, has_lyrics: bool
+    ) -> Metadata:
+        """Spotify fields stored with a track, plus a hash of them."""
+        metadata: Metadata = {
+            "track_id": track.track_id,
+            "track_name": track.name,
+            "artist_names": track.artist_names,
+            "album_name": track.album_name,
+            "has_lyrics": has_lyrics,
+            # Canonical order, or the hash would change with the genre order
+            "genres": ", ".join(sorted(g for g in track.genres.split(", ") if g)),
+            "popularity": track.popularity,
+            "spotify_url": track.spotify_url,
+            "added_at": int(track.added_at.timestamp()),
+        }
+        metadata[METADATA_HASH_KEY] = _content_hash(
+            json.dumps(metadata, sort_keys=True)
+        )
+        return metadata
+
+    def _to_lexical_document(  # pylint: disable=no-self-use
+        self, enriched_track: EnrichedTrack
+    ) -> LexicalDocument:
+        track = enriched_track.track.track
+        return LexicalDocument(
+            track_id=enriched_track.track_id,
+            track_name=track.name,
+            artist_names=track.artist_names,
+            album_name=track.album.name,
+            genres=track.all_genre_names,
+            vibe_description=enriched_track.vibe_description or "",
+            lyrics=enriched_track.lyrics,
+        )
+
+
+@cache
+def _shared_repository(user_id: str | None) -> VectorDBRepository:
+    return VectorDBRepository(user_id=user_id)
+
+
+def _read_active_collections() -> dict[str, str]:
+    """Active collection of every library, by base collection name."""
+    path = Settings.ACTIVE_COLLECTION_PATH
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return {}
+    return dict(_parse_active_collections(path, stat.st_mtime_ns, stat.st_ino))
+
+
+@lru_cache(maxsize=8)
+def _parse_active_collections(
+    path: Path, _mtime_ns: int, _inode: int
+) -> dict[str, str]:
+    """Pointers file contents, parsed again only when the file is replaced."""
+    return {
+        str(base): str(active) for base, active in json.loads(path.read_text()).items()
+    }
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
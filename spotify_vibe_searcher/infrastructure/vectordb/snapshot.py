@@ -0,0 +1,145 @@
+"""Portable collection snapshots: JSONL records plus a NumPy embedding matrix."""
+
+import itertools
+import json
+from collections.abc import Generator, Iterable
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel
+
+from .config import (
+    SNAPSHOT_EMBEDDINGS_FILE,
+    SNAPSHOT_FORMAT_VERSION,
+    SNAPSHOT_MANIFEST_FILE,
+    SNAPSHOT_RECORDS_FILE,
+)
+from .store import VectorRecord
+
+
+class SnapshotManifest(BaseModel):
+    """What a snapshot holds, written once every record is on disk."""
+
+    format_version: int = SNAPSHOT_FORMAT_VERSION
+    collection: str
+    count: int
+    embedding_dimension: int | None = None
+    embedding_model: str
+
+
+class Snapshot(BaseModel):
+    """A collection snapshot directory.
+
+    Records are streamed in batches on both sides: documents and metadata
+    are appended to a JSONL file and embeddings written into a memory-mapped
+    `.npy` matrix, so neither export nor import holds the whole collection
+    in memory. The manifest is written last; a directory without one is an
+    interrupted export and cannot be read.
+    """
+
+    path: Path
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.path / SNAPSHOT_MANIFEST_FILE
+
+    @property
+    def records_path(self) -> Path:
+        return self.path / SNAPSHOT_RECORDS_FILE
+
+    @property
+    def embeddings_path(self) -> Path:
+        return self.path / SNAPSHOT_EMBEDDINGS_FILE
+
+    def write(
+        self, manifest: SnapshotManifest, batches: Iterable[list[VectorRecord]]
+    ) -> Generator[int, None, None]:
+        """Write `manifest.count` records with their embeddings.
+
+        Yields:
+            The number of records written so far, after each batch.
+
+        Raises:
+            ValueError: If a record has no embedding, or the batches hold a
+                different number of records than the manifest.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.manifest_path.unlink(missing_ok=True)
+        embeddings: np.memmap | None = None
+        written = 0
+        with self.records_path.open("w", encoding="utf-8") as records_file:
+            for records in batches:
+                if not records:
+                    continue
+                vectors = np.stack([_embedding(record) for record in records])
+                if embeddings is None:
+                    embeddings = np.lib.format.open_memmap(
+                        self.embeddings_path,
+                        mode="w+",
+                        dtype=np.float32,
+                        shape=(manifest.count, vectors.shape[1]),
+                    )
+                if written + len(records) > manifest.count:
+                    raise ValueError(
+                        f"Snapshot expected {manifest.count} records, got more"
+                    )
+                embeddings[written : written + len(records)] = vectors
+                records_file.writelines(
+                    json.dumps({
+                        "id": record.id,
+                        "document": record.document,
+                        "metadata": record.metadata,
+                    })
+                    + "\n"
+                    for record in records
+                )
+                written += len(records)
+                yield written
+
+        if written != manifest.count:
+            raise ValueError(
+                f"Snapshot expected {manifest.count} records, got {written}"
+            )
+        if embeddings is None:
+            np.save(self.embeddings_path, np.empty((0, 0), dtype=np.float32))
+        else:
+            embeddings.flush()
+            del embeddings
+        self.manifest_path.write_text(manifest.model_dump_json(indent=2))
+
+    def read_manifest(self) -> SnapshotManifest:
+        """The snapshot's manifest.
+
+        Raises:
+            ValueError: If the directory holds no complete snapshot, or one
+                written in another format version.
+        """
+        if not self.manifest_path.exists():
+            raise ValueError(f"No complete snapshot at {self.path}")
+        manifest = SnapshotManifest.model_validate_json(self.manifest_path.read_text())
+        if manifest.format_version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                f"Snapshot format {manifest.format_version} is not supported "
+                f"(expected {SNAPSHOT_FORMAT_VERSION})"
+            )
+        return manifest
+
+    def read(self, batch_size: int) -> Generator[list[VectorRecord], None, None]:
+        """Records with their embeddings, `batch_size` at a time."""
+        self.read_manifest()
+        embeddings = np.load(self.embeddings_path, mmap_mode="r")
+        start = 0
+        with self.records_path.open(encoding="utf-8") as records_file:
+            for lines in itertools.batched(records_file, batch_size):
+                vectors = np.asarray(embeddings[start : start + len(lines)])
+                yield [
+                    VectorRecord(**json.loads(line), embedding=vector)
+                    for line, vector in zip(lines, vectors, strict=True)
+                ]
+                start += len(lines)
+
+
+def _embedding(record: VectorRecord) -> np.ndarray:
+    if record.embedding is None:
+        raise ValueError(f"Record {record.id} has no embedding to snapshot")
+    return record.embedding
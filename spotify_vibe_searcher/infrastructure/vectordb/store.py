@@ -0,0 +1,124 @@
+"""Backend-neutral vector store interface and result records."""
+
+from collections.abc import Sequence
+from typing import Any, Protocol
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+# Scalar metadata values every backend can store and filter on
+MetadataValue = str | int | float | bool
+Metadata = dict[str, MetadataValue]
+
+# One embedding per row, as nested lists or NumPy arrays
+Embeddings = Sequence[Sequence[float]] | Sequence[np.ndarray] | np.ndarray
+
+
+class VectorRecord(BaseModel):
+    """A stored item: its ID, document, metadata and (optionally) embedding."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    id: str
+    document: str = ""
+    metadata: dict[str, Any]
+    embedding: np.ndarray | None = None
+
+
+class RecordPage(BaseModel):
+    """One page of stored records plus the size of the whole collection."""
+
+    records: list[VectorRecord]
+    total: int
+    offset: int
+
+
+class UpsertResult(BaseModel):
+    """How many tracks an upsert wrote, and how."""
+
+    added: int = 0  # New tracks, embedded and written
+    updated: int = 0  # Changed vibe description, re-embedded and rewritten
+    refreshed: int = 0  # Changed metadata only, updated in place
+    unchanged: int = 0  # Skipped
+
+    @property
+    def written(self) -> int:
+        return self.added + self.updated + self.refreshed
+
+
+class VectorMatch(VectorRecord):
+    """A record returned by a nearest-neighbour query."""
+
+    distance: float  # Cosine distance from the query (lower is better)
+
+
+class VectorStore(Protocol):
+    """Operations the repository needs from a vector database backend.
+
+    Embeddings are always computed by the caller; backends only store and
+    search them by cosine distance. `where` filters are equality matches on
+    metadata fields, combined with AND.
+    """
+
+    collection_name: str
+
+    def add(
+        self,
+        ids: list[str],
+        embeddings: Embeddings,
+        documents: list[str],
+        metadatas: list[Metadata],
+    ) -> None:
+        """Insert records, leaving existing IDs untouched."""
+
+    def upsert(
+        self,
+        ids: list[str],
+        embeddings: Embeddings,
+        documents: list[str],
+        metadatas: list[Metadata],
+    ) -> None:
+        """Insert records, overwriting existing IDs."""
+
+    def update_metadata(self, ids: list[str], metadatas: list[Metadata]) -> None:
+        """Replace the metadata of existing records, keeping their embeddings."""
+
+    def delete(self, ids: list[str]) -> None: ...
+
+    def get(  # pylint: disable=too-many-arguments
+        self,
+        ids: list[str] | None = None,
+        where: Metadata | None = None,
+        include_embeddings: bool = False,
+        *,
+        include_documents: bool = True,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[VectorRecord]:
+        """Fetch records by ID and/or metadata filter (all records if neither).
+
+        `limit` and `offset` page through the matches in storage order.
+        Without `include_documents` records come back with empty documents.
+        """
+
+    def query(  # pylint: disable=too-many-arguments
+        self,
+        embeddings: Embeddings,
+        n_results: int = 10,
+        *,
+        ids: list[str] | None = None,
+        where: Metadata | None = None,
+        include_embeddings: bool = False,
+    ) -> list[list[VectorMatch]]:
+        """Nearest records for each query embedding, nearest first."""
+
+    def count(self) -> int: ...
+
+    def get_collection_metadata(self) -> Metadata:
+        """Settings recorded on the collection itself (e.g. embedding size)."""
+
+    def update_collection_metadata(self, metadata: Metadata) -> None:
+        """Merge keys into the collection metadata."""
+
+    def drop(self) -> None:
+        """Delete the collection and everything stored in it."""
@@ -3,6 +3,7 @@
 from dependency_injector import containers, providers
 
 from spotify_vibe_searcher.infrastructure import (
+    AsyncSpotifyClient,
     GeniusClient,
     LLMClient,
     SpotifyAuthManager,
@@ -21,9 +22,19 @@ class InfrastructureContainer(containers.DeclarativeContainer):
         SpotifyClient,
         access_token=config.spotify.access_token,
     )
+    async_spotify_client = providers.Factory(
+        AsyncSpotifyClient,
+        access_token=config.spotify.access_token,
+        user_id=config.spotify.user_id,
+    )
 
     # Singletons
     spotify_auth_manager = providers.Singleton(SpotifyAuthManager)
     genius_client = providers.Singleton(GeniusClient)
     llm_client = providers.Singleton(LLMClient)
-    vectordb_repository = providers.Singleton(VectorDBRepository)
+
+    # One per Spotify user (or one shared library unless MULTI_TENANT is set)
+    vectordb_repository = providers.Callable(
+        VectorDBRepository.for_user,
+        user_id=config.spotify.user_id,
+    )
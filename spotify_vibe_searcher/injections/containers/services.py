@@ -3,6 +3,7 @@
 from dependency_injector import containers, providers
 
 from spotify_vibe_searcher.services import (
+    EmbeddingMigrationService,
     LibrarySyncService,
     SearchService,
     TrackAnalysisService,
@@ -17,16 +18,25 @@ class ServicesContainer(containers.DeclarativeContainer):
         llm_client=infrastructure.llm_client,
     )
 
-    search_service = providers.Factory(
-        SearchService,
+    # Callers serving several users pass each one's repository at call time
+    # (`search_service(vectordb_repository=...)`); config is process-wide.
+    # Searches over one library share its result cache
+    search_service = providers.Callable(
+        SearchService.for_repository,
         vectordb_repository=infrastructure.vectordb_repository,
         llm_client=infrastructure.llm_client,
     )
 
     library_sync_service = providers.Factory(
         LibrarySyncService,
-        spotify_client=infrastructure.spotify_client,
+        spotify_client=infrastructure.async_spotify_client,
         genius_client=infrastructure.genius_client,
         track_analysis_service=track_analysis_service,
         vectordb_repository=infrastructure.vectordb_repository,
     )
+
+    # One background migration per library, visible to every session
+    embedding_migration_service = providers.Callable(
+        EmbeddingMigrationService.for_repository,
+        vectordb_repository=infrastructure.vectordb_repository,
+    )
@@ -1,5 +1,13 @@
+from .embedding_migration import EmbeddingMigrationService
 from .library_sync import LibrarySyncService
+from .result_cache import SemanticResultCache
 from .search import SearchService
 from .track_analysis import TrackAnalysisService
 
-__all__ = ["LibrarySyncService", "SearchService", "TrackAnalysisService"]
+__all__ = [
+    "EmbeddingMigrationService",
+    "LibrarySyncService",
+    "SearchService",
+    "SemanticResultCache",
+    "TrackAnalysisService",
+]
@@ -0,0 +1,79 @@
+"""Background re-embedding of the library after an embedding model change."""
+
+import threading
+from typing import Optional
+
+from pydantic import BaseModel
+
+from spotify_vibe_searcher.domain import MigrationProgress
+from spotify_vibe_searcher.infrastructure import VectorDBRepository
+from spotify_vibe_searcher.utils import LogLevel, log
+
+
+class EmbeddingMigrationService(BaseModel):
+    """Runs `VectorDBRepository.migrate_embeddings` on a background thread.
+
+    One instance per library (see `for_repository`) is shared by every
+    session, so at most one migration of it runs at a time and every
+    session sees its progress.
+    """
+
+    vectordb_repository: VectorDBRepository
+
+    _thread: Optional[threading.Thread] = None  # noqa
+    _progress: Optional[MigrationProgress] = None  # noqa
+    _error: Optional[str] = None  # noqa
+
+    @staticmethod
+    def for_repository(
+        vectordb_repository: VectorDBRepository,
+    ) -> "EmbeddingMigrationService":
+        """The process-wide migration service of a repository's library."""
+        key = vectordb_repository.base_collection
+        with _SERVICES_LOCK:
+            if key not in _SERVICES:
+                _SERVICES[key] = EmbeddingMigrationService(
+                    vectordb_repository=vectordb_repository
+                )
+            return _SERVICES[key]
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def progress(self) -> MigrationProgress | None:
+        """Latest progress of the current (or last) migration."""
+        return self._progress
+
+    @property
+    def error(self) -> str | None:
+        """Why the last migration failed, if it did."""
+        return self._error
+
+    def start(self) -> bool:
+        """Start a migration unless one is already running."""
+        if self.running:
+            return False
+        self._progress, self._error = None, None
+        self._thread = threading.Thread(
+            target=self._run, name="embedding-migration", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def wait(self, timeout: float | None = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        try:
+            for progress in self.vectordb_repository.migrate_embeddings():
+                self._progress = progress
+        except Exception as e:  # noqa: BLE001
+            log(f"Embedding migration failed: {e}", LogLevel.ERROR)
+            self._error = str(e)
+
+
+_SERVICES: dict[str, EmbeddingMigrationService] = {}
+_SERVICES_LOCK = threading.Lock()
@@ -1,23 +1,34 @@
 """Library sync service for fetching and enriching Spotify tracks."""
 
 import asyncio
-from collections.abc import Generator
+from collections.abc import Generator, Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
 
+import numpy as np
 from pydantic import BaseModel
 
-from spotify_vibe_searcher.domain import EnrichedTrack, SavedTrack, SyncProgress
+from spotify_vibe_searcher.domain import (
+    EnrichedTrack,
+    SavedTrack,
+    SpotifyArtist,
+    SyncProgress,
+    TrackSummary,
+)
 from spotify_vibe_searcher.infrastructure import (
+    AsyncSpotifyClient,
     GeniusClient,
-    SpotifyClient,
     VectorDBRepository,
 )
+from spotify_vibe_searcher.utils import Settings
 from spotify_vibe_searcher.utils.logger import LogLevel, log
 
 from .track_analysis import TrackAnalysisService
 
+PendingBatch = tuple[list[EnrichedTrack], Future[np.ndarray]]
+
 
 class LibrarySyncService(BaseModel):
-    spotify_client: SpotifyClient
+    spotify_client: AsyncSpotifyClient
     genius_client: GeniusClient
     track_analysis_service: TrackAnalysisService
     vectordb_repository: VectorDBRepository
@@ -27,19 +38,49 @@ class LibrarySyncService(BaseModel):
     ) -> Generator[SyncProgress | EnrichedTrack, None, None]:
         log(f"Starting library sync (limit={limit})...", LogLevel.INFO)
 
-        saved_tracks = self.spotify_client.get_all_liked_songs(max_tracks=limit)
-        self._enrich_artist_genres(saved_tracks)
-        total = len(saved_tracks)
+        summaries, saved_tracks = asyncio.run(self._fetch_library(limit))
+        total = len(summaries)
         log(f"Found {total} tracks to process.", LogLevel.INFO)
-
-        for index, saved_track in enumerate(saved_tracks, start=1):
-            yield SyncProgress(
-                current=index,
-                total=total,
-                song_title=saved_track.track.name,
-                artist_name=saved_track.track.artist_names,
-            )
-            yield from self._process_track(saved_track)
+        # Tracks already indexed are not re-analyzed, but their Spotify
+        # metadata (popularity, genres) is brought up to date
+        self.vectordb_repository.refresh_metadata(summaries)
+
+        # Vibe descriptions are embedded in the background, one request per
+        # EMBEDDING_BATCH_SIZE tracks, while the next tracks are being
+        # analyzed; the writes stay on this thread
+        pending: list[PendingBatch] = []
+        described: list[EnrichedTrack] = []  # Not yet sent to be embedded
+        with ThreadPoolExecutor(
+            max_workers=Settings.EMBEDDING_CONCURRENCY,
+            thread_name_prefix="sync-embedding",
+        ) as embedder:
+            try:
+                for index, summary in enumerate(summaries, start=1):
+                    yield SyncProgress(
+                        current=index,
+                        total=total,
+                        song_title=summary.name,
+                        artist_name=summary.artist_names,
+                    )
+                    saved_track = saved_tracks.get(summary.track_id)
+                    if saved_track is None:
+                        log(
+                            f"Skipping '{summary.name}' - already indexed.",
+                            LogLevel.DEBUG,
+                        )
+                        continue
+                    for enriched in self._process_track(saved_track):
+                        if enriched.vibe_description:
+                            described.append(enriched)
+                        yield enriched
+                    if len(described) >= Settings.EMBEDDING_BATCH_SIZE:
+                        pending.append(self._embed_batch(embedder, described))
+                        described = []
+                    pending = self._store_embedded(pending, wait=False)
+            finally:
+                if described:
+                    pending.append(self._embed_batch(embedder, described))
+                self._store_embedded(pending, wait=True)
 
         log("Library sync completed.", LogLevel.INFO)
 
@@ -52,13 +93,42 @@ class LibrarySyncService(BaseModel):
             return
 
         try:
-            enriched = self._enrich_track(saved_track)
-            if enriched.vibe_description:
-                self.vectordb_repository.add_track(enriched)
-            yield enriched
+            yield self._enrich_track(saved_track)
         except Exception as e:  # pragma: no cover  # noqa: BLE001
             log(f"Failed to enrich '{track.name}': {e}", LogLevel.WARNING)
 
+    def _embed_batch(
+        self, embedder: ThreadPoolExecutor, tracks: list[EnrichedTrack]
+    ) -> PendingBatch:
+        """Start embedding the vibe descriptions of tracks in one request."""
+        return tracks, embedder.submit(
+            self.vectordb_repository.embed_documents,
+            [track.vibe_description or "" for track in tracks],
+        )
+
+    def _store_embedded(
+        self, pending: list[PendingBatch], wait: bool
+    ) -> list[PendingBatch]:
+        """Index the batches whose embeddings are ready, returning the rest.
+
+        With `wait`, block until every embedding is done.
+        """
+        ready: list[PendingBatch] = []
+        waiting: list[PendingBatch] = []
+        for item in pending:
+            (ready if wait or item[1].done() else waiting).append(item)
+
+        tracks, embeddings = [], []
+        for batch, future in ready:
+            try:
+                embeddings.append(future.result())
+                tracks.extend(batch)
+            except Exception as e:  # pragma: no cover  # noqa: BLE001
+                log(f"Failed to embed {len(batch)} tracks: {e}", LogLevel.WARNING)
+        if tracks:
+            self.vectordb_repository.add_tracks(tracks, np.vstack(embeddings))
+        return waiting
+
     def _enrich_track(self, saved_track: SavedTrack) -> EnrichedTrack:
         """Enrich a track with lyrics and vibe description."""
         lyrics = self.genius_client.search_song(
@@ -81,23 +151,92 @@ class LibrarySyncService(BaseModel):
             vibe_description=vibe_description,
         )
 
-    def _enrich_artist_genres(self, saved_tracks: list[SavedTrack]) -> None:
-        """Enrich artist data with genres by fetching full artist details"""
-        artist_ids = [
+    async def _fetch_library(
+        self, limit: int
+    ) -> tuple[list[TrackSummary], dict[str, SavedTrack]]:
+        """Liked songs with full artist details, over one pooled connection.
+
+        Returns a summary of every liked song, in library order, and the
+        fully parsed tracks by ID. With `SPOTIFY_LEAN_PARSING` only tracks
+        not yet indexed are fully parsed, unless the library changes between
+        the two reads; otherwise every track is.
+        """
+        async with self.spotify_client:
+            if Settings.SPOTIFY_LEAN_PARSING:
+                return await self._fetch_library_lean(limit)
+            return await self._fetch_library_full(limit)
+
+    async def _fetch_library_full(
+        self, limit: int
+    ) -> tuple[list[TrackSummary], dict[str, SavedTrack]]:
+        saved_tracks = await self.spotify_client.get_all_liked_songs(max_tracks=limit)
+        artist_map = await self._fetch_artists(
             artist.id_
             for saved_track in saved_tracks
             for artist in saved_track.track.artists
-        ]
-        artists_with_genres = self.spotify_client.get_artists(artist_ids)
-        artist_map = {artist.id_: artist for artist in artists_with_genres}
-
-        for saved_track in saved_tracks:
-            saved_track.track.artists = [
-                artist_map.get(artist.id_, artist)
-                for artist in saved_track.track.artists
-            ]
+        )
+        _apply_artists(saved_tracks, artist_map)
+        return (
+            [TrackSummary.from_saved_track(track) for track in saved_tracks],
+            {saved_track.track_id: saved_track for saved_track in saved_tracks},
+        )
 
+    async def _fetch_library_lean(
+        self, limit: int
+    ) -> tuple[list[TrackSummary], dict[str, SavedTrack]]:
+        summaries = await self.spotify_client.get_all_track_summaries(max_tracks=limit)
+        artist_map = await self._fetch_artists(
+            artist_id for summary in summaries for artist_id in summary.artist_ids
+        )
+        summaries = [summary.with_genres(artist_map) for summary in summaries]
+
+        indexed = self.vectordb_repository.existing_track_ids([
+            summary.track_id for summary in summaries
+        ])
+        new_tracks = [
+            (position, summary.track_id)
+            for position, summary in enumerate(summaries)
+            if summary.track_id not in indexed
+        ]
+        saved_tracks = await self.spotify_client.get_liked_songs_at(
+            position for position, _ in new_tracks
+        )
+        if [track.track_id for track in saved_tracks] != [
+            track_id for _, track_id in new_tracks
+        ]:
+            # Songs were liked or removed since the summaries were read, so
+            # the positions point at other tracks
+            log(
+                "Liked songs changed during the sync; rescanning them in full.",
+                LogLevel.WARNING,
+            )
+            return await self._fetch_library_full(limit)
+        _apply_artists(saved_tracks, artist_map)
+        log(
+            f"Parsed {len(saved_tracks)} of {len(summaries)} liked songs in full.",
+            LogLevel.INFO,
+        )
+        return summaries, {
+            saved_track.track_id: saved_track for saved_track in saved_tracks
+        }
+
+    async def _fetch_artists(
+        self, artist_ids: Iterable[str]
+    ) -> dict[str, SpotifyArtist]:
+        """Full artist details (with genres) by ID."""
+        artists_with_genres = await self.spotify_client.get_artists(list(artist_ids))
         log(
             f"Enriched {len(artists_with_genres)} artists with genre data.",
             LogLevel.INFO,
         )
+        return {artist.id_: artist for artist in artists_with_genres}
+
+
+def _apply_artists(
+    saved_tracks: list[SavedTrack], artists: Mapping[str, SpotifyArtist]
+) -> None:
+    """Replace each track's artists with their full details, where known."""
+    for saved_track in saved_tracks:
+        saved_track.track.artists = [
+            artists.get(artist.id_, artist) for artist in saved_track.track.artists
+        ]
@@ -0,0 +1,127 @@
+"""Rank fusion and re-ranking helpers for search results."""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+# Damping constant from the original RRF paper; keeps a single first place
+# from dominating rankings that disagree.
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]], k: int = RRF_K
+) -> list[str]:
+    """Fuse several ranked ID lists into one using Reciprocal Rank Fusion.
+
+    Each ID scores `1 / (k + rank)` in every ranking it appears in, so items
+    ranked well by several retrievers rise to the top without having to
+    calibrate BM25 scores against cosine distances.
+    """
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=lambda item_id: scores[item_id], reverse=True)
+
+
+def maximal_marginal_relevance(  # pylint: disable=too-many-arguments, too-many-locals
+    relevance: np.ndarray,
+    embeddings: np.ndarray,
+    n_results: int,
+    *,
+    lambda_mult: float = 0.7,
+    groups: Sequence[Sequence[str]] | None = None,
+    max_per_group: int = 0,
+) -> list[int]:
+    """Pick a relevant but diverse subset of candidates with MMR.
+
+    Args:
+        relevance: Similarity of each candidate to the query, shape `(n,)`.
+        embeddings: Candidate embeddings, shape `(n, d)`.
+        n_results: Maximum number of candidates to select.
+        lambda_mult: 1.0 ranks by relevance only, 0.0 by diversity only.
+        groups: Optional group keys per candidate (e.g. its artists); a
+            candidate counts against every group it belongs to.
+        max_per_group: Maximum picks per group; 0 disables the cap.
+
+    Returns:
+        Indices of the selected candidates, in selection order.
+    """
+    n_candidates = len(relevance)
+    if n_candidates == 0 or n_results <= 0:
+        return []
+
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    normalized = embeddings / np.maximum(norms, 1e-12)
+    # All pairwise similarities in one matrix product; the greedy loop below
+    # only does O(n) vector updates per pick.
+    similarities = normalized @ normalized.T
+
+    # Which groups each candidate belongs to, one column per group
+    keys = sorted({key for candidate in groups or [] for key in candidate})
+    columns = {key: column for column, key in enumerate(keys)}
+    membership = np.zeros((n_candidates, len(keys)), dtype=bool)
+    for row, candidate in enumerate(groups or []):
+        membership[row, [columns[key] for key in candidate]] = True
+    group_counts = np.zeros(len(keys), dtype=np.intp)
+
+    available = np.ones(n_candidates, dtype=bool)
+    redundancy = np.zeros(n_candidates, dtype=similarities.dtype)
+    selected: list[int] = []
+
+    while len(selected) < n_results and available.any():
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        best = int(np.argmax(np.where(available, scores, -np.inf)))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarities[best], out=redundancy)
+
+        if max_per_group > 0:
+            picked = membership[best]
+            group_counts[picked] += 1
+            full = picked & (group_counts >= max_per_group)
+            if full.any():
+                available[membership[:, full].any(axis=1)] = False
+
+    return selected
+
+
+def rocchio(  # pylint: disable=too-many-arguments
+    query: np.ndarray,
+    relevant: np.ndarray,
+    non_relevant: np.ndarray,
+    *,
+    alpha: float = 1.0,
+    beta: float = 0.75,
+    gamma: float = 0.15,
+) -> np.ndarray:
+    """Move a query vector towards liked results and away from disliked ones.
+
+    Computes `alpha * q + beta * mean(relevant) - gamma * mean(non_relevant)`
+    over unit-normalized vectors, so every rated track weighs the same
+    regardless of its stored norm.
+
+    Args:
+        query: Query embedding, shape `(d,)`.
+        relevant: Embeddings of liked results, shape `(n, d)` (may be empty).
+        non_relevant: Embeddings of disliked results, shape `(m, d)`.
+        alpha: Weight of the original query.
+        beta: Weight of the liked centroid.
+        gamma: Weight of the disliked centroid.
+
+    Returns:
+        The adjusted query, unit-normalized.
+    """
+
+    def centroid(vectors: np.ndarray) -> np.ndarray:
+        if len(vectors) == 0:
+            return np.zeros_like(query)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return (vectors / np.maximum(norms, 1e-12)).mean(axis=0)  # type: ignore[no-any-return]
+
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+    adjusted = (
+        alpha * query + beta * centroid(relevant) - gamma * centroid(non_relevant)
+    )
+    return adjusted / max(float(np.linalg.norm(adjusted)), 1e-12)
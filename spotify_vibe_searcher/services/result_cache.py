@@ -0,0 +1,162 @@
+"""Semantic cache of vector search results."""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from functools import cache
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+from spotify_vibe_searcher.infrastructure.vectordb import VectorMatch
+from spotify_vibe_searcher.utils import LogLevel, Settings, log
+
+# A user query as typed, whether it was refined by the LLM, and the
+# embedding model
+QueryKey = tuple[str, bool, str]
+
+
+class CachedSearch(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    embedding: np.ndarray  # Unit-normalized query vector
+    n_results: int
+    include_embeddings: bool
+    matches: list[VectorMatch]
+
+
+class SemanticResultCache(BaseModel):
+    """LRU cache of nearest-neighbour results keyed by query embedding.
+
+    A lookup hits when a cached query lies within `tolerance` cosine distance
+    of the new one and fetched at least as many results, so rephrasings that
+    embed almost identically share one search. Entries belong to a collection
+    version; when the repository reports a new version (after any add or
+    delete, from this or another process) the whole cache is dropped.
+
+    The embedding of each raw user query (after LLM refinement) is kept as
+    well, across collection versions: refinement is sampled, so without it
+    a repeated query would embed differently, miss, and pay the LLM again.
+
+    One instance per library (see `for_collection`) is shared by every
+    search service over it, and so by every Streamlit session.
+    """
+
+    max_entries: int = 256
+    tolerance: float = 0.005
+
+    _entries: list[CachedSearch] = PrivateAttr(default_factory=list)
+    _version: str | None = PrivateAttr(default=None)
+    _query_embeddings: OrderedDict[QueryKey, list[float]] = PrivateAttr(
+        default_factory=OrderedDict
+    )
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def from_settings(cls) -> "SemanticResultCache":
+        return cls(
+            max_entries=Settings.RESULT_CACHE_SIZE,
+            tolerance=Settings.RESULT_CACHE_TOLERANCE,
+        )
+
+    @staticmethod
+    def for_collection(collection: str) -> "SemanticResultCache":
+        """The cache shared by every search over one library's collection."""
+        return _shared_cache(collection)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        embedding: Sequence[float],
+        n_results: int,
+        version: str | None,
+        include_embeddings: bool = False,
+    ) -> list[VectorMatch] | None:
+        """Cached matches for a query close enough to `embedding`, or None."""
+        query = _normalize(embedding)
+        with self._lock:
+            self._check_version(version)
+            usable = [
+                i
+                for i, entry in enumerate(self._entries)
+                if entry.n_results >= n_results
+                and (entry.include_embeddings or not include_embeddings)
+                and entry.embedding.shape == query.shape
+            ]
+            if not usable:
+                return None
+
+            distances = (
+                1.0 - np.stack([self._entries[i].embedding for i in usable]) @ query
+            )
+            nearest = int(np.argmin(distances))
+            if distances[nearest] > self.tolerance:
+                return None
+
+            # Most recently used entries live at the end
+            entry = self._entries.pop(usable[nearest])
+            self._entries.append(entry)
+        log(f"Result cache hit (distance {distances[nearest]:.4f})", LogLevel.DEBUG)
+        return entry.matches[:n_results]
+
+    def put(  # pylint: disable=too-many-arguments
+        self,
+        embedding: Sequence[float],
+        n_results: int,
+        version: str | None,
+        matches: list[VectorMatch],
+        *,
+        include_embeddings: bool = False,
+    ) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._check_version(version)
+            self._entries.append(
+                CachedSearch(
+                    embedding=_normalize(embedding),
+                    n_results=n_results,
+                    include_embeddings=include_embeddings,
+                    matches=matches,
+                )
+            )
+            del self._entries[: -self.max_entries]
+
+    def get_query_embedding(self, key: QueryKey) -> list[float] | None:
+        """Embedding a user query was searched with before, or None."""
+        with self._lock:
+            embedding = self._query_embeddings.get(key)
+            if embedding is not None:
+                self._query_embeddings.move_to_end(key)
+        return embedding
+
+    def put_query_embedding(self, key: QueryKey, embedding: list[float]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._query_embeddings[key] = embedding
+            self._query_embeddings.move_to_end(key)
+            while len(self._query_embeddings) > self.max_entries:
+                self._query_embeddings.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._query_embeddings.clear()
+
+    def _check_version(self, version: str | None) -> None:
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+
+@cache
+def _shared_cache(collection: str) -> SemanticResultCache:  # pylint: disable=unused-argument
+    return SemanticResultCache.from_settings()
+
+
+def _normalize(embedding: Sequence[float]) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
@@ -1,35 +1,83 @@
 import asyncio
 
+import numpy as np
 from pydantic import BaseModel
 
-from spotify_vibe_searcher.domain import SearchResult, SearchResults
+from spotify_vibe_searcher.domain import (
+    SearchMode,
+    SearchResult,
+    SearchResults,
+    SeedStrategy,
+)
 from spotify_vibe_searcher.infrastructure import LLMClient, VectorDBRepository
-from spotify_vibe_searcher.utils import LogLevel, log
+from spotify_vibe_searcher.infrastructure.vectordb import VectorMatch
+from spotify_vibe_searcher.utils import LogLevel, Settings, log
+
+from .ranking import maximal_marginal_relevance, reciprocal_rank_fusion, rocchio
+from .result_cache import QueryKey, SemanticResultCache
+
+# Each retriever contributes this many candidates per requested result to fusion
+HYBRID_CANDIDATE_FACTOR = 3
 
 
 class SearchService(BaseModel):
     vectordb_repository: VectorDBRepository
     llm_client: LLMClient
+    result_cache: SemanticResultCache
+
+    @staticmethod
+    def for_repository(
+        vectordb_repository: VectorDBRepository, llm_client: LLMClient
+    ) -> "SearchService":
+        """A search service sharing the result cache of the repository's library."""
+        return SearchService(
+            vectordb_repository=vectordb_repository,
+            llm_client=llm_client,
+            result_cache=SemanticResultCache.for_collection(
+                vectordb_repository.base_collection
+            ),
+        )
 
-    async def search_by_vibe(self, query: str, n_results: int = 10) -> SearchResults:
+    async def search_by_vibe(
+        self,
+        query: str,
+        n_results: int = 10,
+        mode: SearchMode = SearchMode.VECTOR,
+        diversify: bool = False,
+    ) -> SearchResults:
         """Search for tracks by vibe description using semantic similarity.
 
         Args:
             query: Natural language query describing the desired vibe.
             n_results: Maximum number of results to return.
+            mode: Whether to fuse exact term matches into the semantic ranking.
+            diversify: Re-rank an over-fetched candidate pool with MMR so
+                near-duplicates and single-artist runs don't crowd the results.
 
         Returns:
             SearchResults containing matching tracks with metadata.
         """
         log(f"Searching for vibe: '{query}' (max {n_results} results)", LogLevel.INFO)
 
-        refined_query = await self._refine_query(query)
-        log(f"Refined query: '{refined_query}'", LogLevel.INFO)
-
-        raw_results = await asyncio.to_thread(
-            self.vectordb_repository.search_by_vibe, refined_query, n_results
+        n_candidates = (
+            n_results * Settings.MMR_CANDIDATE_FACTOR if diversify else n_results
         )
-        search_results = self._transform_results(query, raw_results)
+
+        if mode is SearchMode.HYBRID:
+            embedding, matches = await self._hybrid_search(
+                query, n_candidates, diversify
+            )
+        else:
+            embedding = await self._embed_vibe(query)
+            matches = await self._search_by_embedding(
+                embedding,
+                n_candidates,
+                include_embeddings=diversify,
+            )
+
+        if diversify:
+            matches = self._diversify(matches, n_results)
+        search_results = self._transform_results(query, matches, embedding)
 
         log(
             f"Found {search_results.total_results} matching tracks",
@@ -38,6 +86,390 @@ class SearchService(BaseModel):
 
         return search_results
 
+    async def search_many(
+        self,
+        queries: list[str],
+        n_results: int = 10,
+        diversify: bool = False,
+    ) -> list[SearchResults]:
+        """Run several vibe searches as three batched steps.
+
+        Queries not searched before are refined concurrently (bounded by
+        LLM_CONCURRENCY_LIMIT), embedded in a single request and matched with
+        a single multi-query collection lookup.
+
+        Args:
+            queries: Natural language queries describing the desired vibes.
+            n_results: Maximum number of results per query.
+            diversify: Re-rank each query's candidates with MMR.
+
+        Returns:
+            One SearchResults per query, in the same order as `queries`.
+        """
+        if not queries:
+            return []
+        log(f"Searching for {len(queries)} vibes (max {n_results} each)", LogLevel.INFO)
+
+        embeddings = await self._embed_vibes(queries)
+        n_candidates = (
+            n_results * Settings.MMR_CANDIDATE_FACTOR if diversify else n_results
+        )
+        all_matches = await self._search_by_embeddings(
+            embeddings,
+            n_candidates,
+            include_embeddings=diversify,
+        )
+
+        all_results = []
+        for query, embedding, candidates in zip(
+            queries, embeddings, all_matches, strict=True
+        ):
+            matches = (
+                self._diversify(candidates, n_results) if diversify else candidates
+            )
+            all_results.append(self._transform_results(query, matches, embedding))
+        return all_results
+
+    async def search_similar(
+        self,
+        track_ids: list[str],
+        n_results: int = 10,
+        strategy: SeedStrategy = SeedStrategy.CENTROID,
+        diversify: bool = False,
+    ) -> SearchResults:
+        """Find tracks like one or more indexed seed tracks ("more like this").
+
+        Queries with the seeds' stored embeddings, so no LLM or embedding
+        call is made. The seeds themselves are never returned.
+
+        Args:
+            track_ids: IDs of indexed tracks to use as seeds.
+            n_results: Maximum number of results to return.
+            strategy: Query once at the seeds' centroid, or once per seed and
+                fuse the rankings (better when the seeds differ in vibe).
+            diversify: Re-rank an over-fetched candidate pool with MMR.
+
+        Returns:
+            SearchResults whose query names the seed tracks.
+        """
+        seeds = [
+            seed
+            for seed in await asyncio.to_thread(
+                self.vectordb_repository.get_tracks, track_ids, include_embeddings=True
+            )
+            if seed.embedding is not None
+        ]
+        query = "More like: " + ", ".join(
+            str(seed.metadata.get("track_name") or seed.id) for seed in seeds
+        )
+        if not seeds:
+            log(f"No indexed seed tracks among {track_ids}", LogLevel.WARNING)
+            return self._transform_results(query, [])
+        log(f"Searching for tracks like {len(seeds)} seeds", LogLevel.INFO)
+
+        n_candidates = (
+            n_results * Settings.MMR_CANDIDATE_FACTOR if diversify else n_results
+        )
+        seed_ids = {seed.id for seed in seeds}
+        seed_embeddings = np.asarray([seed.embedding for seed in seeds], np.float32)
+        seed_embeddings /= np.maximum(
+            np.linalg.norm(seed_embeddings, axis=1, keepdims=True), 1e-12
+        )
+
+        # Seeds are their own nearest neighbours, so fetch enough to drop them
+        if strategy is SeedStrategy.CENTROID:
+            all_matches = [
+                await self._search_by_embedding(
+                    seed_embeddings.mean(axis=0).tolist(),
+                    n_candidates + len(seeds),
+                    include_embeddings=diversify,
+                )
+            ]
+        else:
+            all_matches = await self._search_by_embeddings(
+                seed_embeddings.tolist(),
+                n_candidates + len(seeds),
+                include_embeddings=diversify,
+            )
+
+        # Per-seed rankings are fused; a track keeps its distance to the
+        # closest seed.
+        by_id: dict[str, VectorMatch] = {}
+        for match in (match for matches in all_matches for match in matches):
+            if match.id not in by_id or match.distance < by_id[match.id].distance:
+                by_id[match.id] = match
+        fused_ids = reciprocal_rank_fusion([
+            [match.id for match in matches if match.id not in seed_ids]
+            for matches in all_matches
+        ])
+        matches = [by_id[track_id] for track_id in fused_ids[:n_candidates]]
+
+        if diversify:
+            matches = self._diversify(matches, n_results)
+        return self._transform_results(
+            query, matches, seed_embeddings.mean(axis=0).tolist()
+        )
+
+    async def refine_with_feedback(  # pylint: disable=too-many-arguments
+        self,
+        results: SearchResults,
+        liked: list[str] | None = None,
+        disliked: list[str] | None = None,
+        *,
+        n_results: int = 10,
+        diversify: bool = False,
+    ) -> SearchResults:
+        """Re-run a search with its query vector adjusted by thumbs up/down.
+
+        The previous query embedding is moved towards the stored embeddings
+        of liked tracks and away from disliked ones (Rocchio), then used for
+        a plain vector query, so iterating costs no LLM or embedding call.
+        Disliked tracks are left out of the new results.
+
+        Args:
+            results: Results of a previous search (or of a previous round of
+                feedback), which carry the query embedding they came from.
+            liked: Track IDs the user marked as relevant.
+            disliked: Track IDs the user marked as not relevant.
+            n_results: Maximum number of results to return.
+            diversify: Re-rank an over-fetched candidate pool with MMR.
+
+        Returns:
+            New SearchResults for the same query text.
+
+        Raises:
+            ValueError: If `results` has no query embedding.
+        """
+        if results.query_embedding is None:
+            raise ValueError(f"No query embedding to refine for '{results.query}'")
+        liked, disliked = liked or [], disliked or []
+        log(
+            f"Refining '{results.query}' with {len(liked)} liked and "
+            f"{len(disliked)} disliked tracks",
+            LogLevel.INFO,
+        )
+
+        rated = await asyncio.to_thread(
+            self.vectordb_repository.get_tracks,
+            liked + disliked,
+            include_embeddings=True,
+        )
+        embeddings = {
+            record.id: record.embedding
+            for record in rated
+            if record.embedding is not None
+        }
+        query = np.asarray(results.query_embedding, dtype=np.float32)
+
+        def stack(track_ids: list[str]) -> np.ndarray:
+            vectors = [embeddings[i] for i in track_ids if i in embeddings]
+            return np.asarray(vectors, np.float32).reshape(-1, len(query))
+
+        embedding = rocchio(
+            query,
+            stack(liked),
+            stack(disliked),
+            alpha=Settings.ROCCHIO_ALPHA,
+            beta=Settings.ROCCHIO_BETA,
+            gamma=Settings.ROCCHIO_GAMMA,
+        ).tolist()
+
+        n_candidates = (
+            n_results * Settings.MMR_CANDIDATE_FACTOR if diversify else n_results
+        )
+        candidates = await self._search_by_embedding(
+            embedding,
+            n_candidates + len(disliked),
+            include_embeddings=diversify,
+        )
+        excluded = set(disliked)
+        matches = [match for match in candidates if match.id not in excluded][
+            :n_candidates
+        ]
+
+        if diversify:
+            matches = self._diversify(matches, n_results)
+        return self._transform_results(results.query, matches, embedding)
+
+    async def _search_by_embedding(
+        self, embedding: list[float], n_results: int, include_embeddings: bool = False
+    ) -> list[VectorMatch]:
+        """Nearest tracks to a query vector, from the shared cache if possible."""
+        version = self.vectordb_repository.collection_version
+        matches = self.result_cache.get(
+            embedding, n_results, version, include_embeddings
+        )
+        if matches is None:
+            matches = await asyncio.to_thread(
+                self.vectordb_repository.search_by_embedding,
+                embedding,
+                n_results,
+                include_embeddings=include_embeddings,
+            )
+            self.result_cache.put(
+                embedding,
+                n_results,
+                version,
+                matches,
+                include_embeddings=include_embeddings,
+            )
+        return matches
+
+    async def _search_by_embeddings(
+        self,
+        embeddings: list[list[float]],
+        n_results: int,
+        include_embeddings: bool = False,
+    ) -> list[list[VectorMatch]]:
+        """Batch form of `_search_by_embedding`; only cache misses are queried."""
+        version = self.vectordb_repository.collection_version
+        all_matches = [
+            self.result_cache.get(embedding, n_results, version, include_embeddings)
+            for embedding in embeddings
+        ]
+        misses = [i for i, matches in enumerate(all_matches) if matches is None]
+        if misses:
+            found = await asyncio.to_thread(
+                self.vectordb_repository.search_by_embeddings,
+                [embeddings[i] for i in misses],
+                n_results,
+                include_embeddings=include_embeddings,
+            )
+            for i, matches in zip(misses, found, strict=True):
+                all_matches[i] = matches
+                self.result_cache.put(
+                    embeddings[i],
+                    n_results,
+                    version,
+                    matches,
+                    include_embeddings=include_embeddings,
+                )
+        return [matches or [] for matches in all_matches]
+
+    async def _hybrid_search(
+        self, query: str, n_results: int, include_embeddings: bool = False
+    ) -> tuple[list[float], list[VectorMatch]]:
+        """Fuse BM25 matches on the raw query with vector matches via RRF.
+
+        Returns:
+            The query embedding and the fused matches.
+        """
+        n_candidates = n_results * HYBRID_CANDIDATE_FACTOR
+        lexical_matches = await asyncio.to_thread(
+            self.vectordb_repository.search_lexical, query, n_candidates
+        )
+
+        # Titles, artists and lyric lines need no rewriting, and the LLM call
+        # is by far the slowest step of a search.
+        exact = await asyncio.to_thread(self.vectordb_repository.has_exact_match, query)
+        if exact:
+            log("Exact match found, skipping query refinement", LogLevel.INFO)
+        embedding = await self._embed_vibe(query, refine=not exact)
+        vector_matches = await self._search_by_embedding(
+            embedding,
+            n_candidates,
+            include_embeddings=include_embeddings,
+        )
+
+        fused_ids = reciprocal_rank_fusion([
+            [match.id for match in vector_matches],
+            [match.track_id for match in lexical_matches],
+        ])[:n_results]
+
+        # Lexical-only hits still get their real distance to the query vector
+        by_id = {match.id: match for match in vector_matches}
+        missing_ids = [track_id for track_id in fused_ids if track_id not in by_id]
+        if missing_ids:
+            missing_matches = await asyncio.to_thread(
+                self.vectordb_repository.search_by_embedding,
+                embedding,
+                len(missing_ids),
+                missing_ids,
+                include_embeddings=include_embeddings,
+            )
+            by_id.update({match.id: match for match in missing_matches})
+
+        return embedding, [
+            by_id[track_id] for track_id in fused_ids if track_id in by_id
+        ]
+
+    def _diversify(  # pylint: disable=no-self-use
+        self, matches: list[VectorMatch], n_results: int
+    ) -> list[VectorMatch]:
+        """Re-rank candidates with MMR, capping tracks per artist.
+
+        A collaboration counts against each of its artists.
+        """
+        if not matches:
+            return matches
+
+        selected = maximal_marginal_relevance(
+            relevance=1.0
+            - np.asarray([match.distance for match in matches], dtype=np.float32),
+            embeddings=np.asarray(
+                [match.embedding for match in matches], dtype=np.float32
+            ),
+            n_results=n_results,
+            lambda_mult=Settings.MMR_LAMBDA,
+            # Stored joined with ", " (see `SpotifyTrack.artist_names`)
+            groups=[
+                str(match.metadata.get("artist_names", "")).split(", ")
+                for match in matches
+            ],
+            max_per_group=Settings.MMR_MAX_PER_ARTIST,
+        )
+        return [matches[i] for i in selected]
+
+    async def _embed_vibe(self, query: str, refine: bool = True) -> list[float]:
+        """Embed a user query, rewritten by the LLM first when `refine` is set.
+
+        Cached on the raw query, so a repeated search skips the LLM call and
+        gets the same embedding back, which lets the result cache hit too.
+        """
+        key = self._query_key(query, refine)
+        embedding = self.result_cache.get_query_embedding(key)
+        if embedding is not None:
+            return embedding
+
+        vector_query = query
+        if refine:
+            vector_query = await self._refine_query(query)
+            log(f"Refined query: '{vector_query}'", LogLevel.INFO)
+        embedding = await asyncio.to_thread(
+            self.vectordb_repository.embed_query, vector_query
+        )
+        self.result_cache.put_query_embedding(key, embedding)
+        return embedding
+
+    async def _embed_vibes(self, queries: list[str]) -> list[list[float]]:
+        """Batch form of `_embed_vibe`.
+
+        Queries not cached are refined concurrently and embedded in one request.
+        """
+        semaphore = asyncio.Semaphore(Settings.LLM_CONCURRENCY_LIMIT)
+
+        async def refine(query: str) -> str:
+            async with semaphore:
+                return await self._refine_query(query)
+
+        keys = [self._query_key(query, refine=True) for query in queries]
+        cached = [self.result_cache.get_query_embedding(key) for key in keys]
+        misses = [i for i, embedding in enumerate(cached) if embedding is None]
+        if misses:
+            refined_queries = await asyncio.gather(
+                *(refine(queries[i]) for i in misses)
+            )
+            fresh = await asyncio.to_thread(
+                self.vectordb_repository.embed_queries, list(refined_queries)
+            )
+            for i, embedding in zip(misses, fresh, strict=True):
+                cached[i] = embedding
+                self.result_cache.put_query_embedding(keys[i], embedding)
+        return [embedding or [] for embedding in cached]
+
+    def _query_key(self, query: str, refine: bool) -> QueryKey:
+        return (query.strip(), refine, self.vectordb_repository.embedding_model)
+
     async def _refine_query(self, query: str) -> str:
         """Refine the user query to be more descriptive for semantic search."""
         prompt = (
@@ -50,28 +482,26 @@ class SearchService(BaseModel):
         return await self.llm_client.generate(prompt)
 
     def _transform_results(
-        self, query: str, raw_results: dict[str, list]
+        self,
+        query: str,
+        matches: list[VectorMatch],
+        query_embedding: list[float] | None = None,
     ) -> SearchResults:
-        # ChromaDB returns nested lists, we need the first element
-        ids = raw_results.get("ids", [[]])[0]
-        documents = raw_results.get("documents", [[]])[0]
-        metadatas = raw_results.get("metadatas", [[]])[0]
-        distances = raw_results.get("distances", [[]])[0]
-
         results = [
             self._create_search_result(
-                track_id=ids[i],
-                vibe_description=documents[i],
-                metadata=metadatas[i],
-                distance=distances[i],
+                track_id=match.id,
+                vibe_description=match.document,
+                metadata=match.metadata,
+                distance=match.distance,
             )
-            for i in range(len(ids))
+            for match in matches
         ]
 
         return SearchResults(
             query=query,
             results=results,
             total_results=len(results),
+            query_embedding=query_embedding,
         )
 
     def _create_search_result(  # pylint: disable=no-self-use
@@ -0,0 +1,46 @@
+"""Export the vector collection to a portable snapshot, or restore one.
+
+A snapshot holds every track's vibe description, metadata and embedding, so
+a new machine (or a wiped data directory) can be restored without running
+Genius, the LLM or the embedding model again.
+
+    uv run poe snapshot export backups/library
+    uv run poe snapshot import backups/library
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from spotify_vibe_searcher.infrastructure.vectordb.config import SNAPSHOT_BATCH_SIZE
+from spotify_vibe_searcher.injections import container
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("path", type=Path, help="Snapshot directory")
+    parser.add_argument("--batch-size", type=int, default=SNAPSHOT_BATCH_SIZE)
+    parser.add_argument(
+        "--user", help="Spotify user ID whose library to use (with MULTI_TENANT)"
+    )
+    args = parser.parse_args()
+
+    container.infrastructure.config.spotify.user_id.from_value(args.user)
+    repository = container.infrastructure.vectordb_repository()
+    run, done = (
+        (repository.export_snapshot, "Exported")
+        if args.command == "export"
+        else (repository.import_snapshot, "Imported")
+    )
+
+    start = time.perf_counter()
+    total = 0
+    for progress in run(args.path, args.batch_size):
+        total = progress.total
+        print(f"\r{progress.current}/{progress.total} tracks", end="", flush=True)
+    print(f"\n{done} {total} tracks in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
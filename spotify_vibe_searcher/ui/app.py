@@ -6,7 +6,7 @@ A beautiful Streamlit UI for Spotify authentication and music discovery.
 import streamlit as st
 
 from spotify_vibe_searcher.domain import SpotifyUser
-from spotify_vibe_searcher.infrastructure import SpotifyAuthManager
+from spotify_vibe_searcher.infrastructure import SpotifyAuthManager, VectorDBRepository
 from spotify_vibe_searcher.injections import container
 from spotify_vibe_searcher.utils import Settings
 
@@ -41,10 +41,9 @@ def authenticate_with_code(auth_manager: SpotifyAuthManager, code: str) -> None:
             st.session_state.access_token = token_info["access_token"]
 
             # Get user profile using DI container
-            container.infrastructure.config.spotify.access_token.from_value(
-                token_info["access_token"]
+            client = container.infrastructure.spotify_client(
+                access_token=token_info["access_token"]
             )
-            client = container.infrastructure.spotify_client()
             st.session_state.user = client.current_user
 
             # Clear the URL parameters
@@ -62,17 +61,20 @@ def check_cached_token(auth_manager: SpotifyAuthManager) -> None:
         st.session_state.access_token = cached_token["access_token"]
 
         # Get user profile using DI container
-        container.infrastructure.config.spotify.access_token.from_value(
-            cached_token["access_token"]
+        client = container.infrastructure.spotify_client(
+            access_token=cached_token["access_token"]
         )
-        client = container.infrastructure.spotify_client()
         st.session_state.user = client.current_user
 
 
 def render_authenticated_view(user: SpotifyUser) -> None:
     """Render the authenticated dashboard — full width."""
+    # Resolved from this session's user and passed down explicitly: the
+    # container config is shared by every session
+    repository = VectorDBRepository.for_user(user.id)
+
     # ── Search (always visible, on top) ────────────────────
-    render_search_section()
+    render_search_section(repository)
 
     st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
 
@@ -82,11 +84,13 @@ def render_authenticated_view(user: SpotifyUser) -> None:
 
     render_sync_library_section(
         access_token=st.session_state.access_token,
+        user_id=user.id,
+        repository=repository,
     )
 
     # ── Library / Knowledge Base ────────────────────────────
     st.markdown('<hr class="section-divider">', unsafe_allow_html=True)
-    render_library_section()
+    render_library_section(repository)
 
 
 def render_unauthenticated_view(auth_manager: SpotifyAuthManager) -> None:
@@ -1,11 +1,25 @@
 # pylint: disable=too-many-locals
+import math
+from typing import NamedTuple
+
 import pandas as pd
 import streamlit as st
 
+from spotify_vibe_searcher.infrastructure import VectorDBRepository
+from spotify_vibe_searcher.infrastructure.vectordb import TrackSort
 from spotify_vibe_searcher.injections import container
+from spotify_vibe_searcher.utils import Settings
+
+LIBRARY_PAGE_SIZES = [25, 50, 100, 250]
 
+LIBRARY_SORT_OPTIONS: dict[str, TrackSort | None] = {
+    "Recently added": "added_at",
+    "Most popular": "popularity",
+    "Index order": None,
+}
 
-def render_library_section() -> None:
+
+def render_library_section(repository: VectorDBRepository) -> None:
     """Render the library section showing indexed tracks with improved visuals."""
     st.markdown(
         """
@@ -22,7 +36,6 @@ def render_library_section() -> None:
         unsafe_allow_html=True,
     )
 
-    repository = container.infrastructure.vectordb_repository()
     count = repository.count_tracks()
 
     col1, col2, col3 = st.columns([1, 1, 1])
@@ -38,45 +51,41 @@ def render_library_section() -> None:
             "🗑️ Clear Database", key="clear_library", type="secondary"
         ):
             with st.spinner("Clearing database..."):
-                all_data = repository.get_all_tracks()
-                track_ids = all_data.get("ids", [])
-                if track_ids:
-                    repository.delete_tracks(track_ids)
-                    st.success(f"✅ Deleted {len(track_ids)} tracks from database!")
-                    st.rerun()
+                repository.reset()
+            st.success(f"✅ Deleted {count} tracks from database!")
+            st.rerun()
+
+    render_migration_notice(repository)
 
     if count > 0:
+        page = _render_page_controls(count)
         with st.spinner("Loading tracks..."):
-            data = repository.get_all_tracks()
-
-            if not data or not data["ids"]:
-                st.info("No tracks found.")
-                return
-
-            # Parse data into a format suitable for DataFrame
-            rows = []
-            ids = data["ids"]
-            metadatas = data.get("metadatas") or []
-            documents = data.get("documents") or []
+            track_page = repository.browse_tracks(
+                limit=page.size,
+                offset=(page.number - 1) * page.size,
+                sort_by=page.sort_by,
+            )
 
-        for i, _ in enumerate(ids):
-            meta = metadatas[i] if i < len(metadatas) else {}
-            doc = documents[i] if i < len(documents) else ""
+        if not track_page.records:
+            st.info("No tracks found.")
+            return
 
-            # Embed track name in URL fragment so LinkColumn can display it
-            track_name = meta.get("track_name", "Unknown")
-            spotify_url = meta.get("spotify_url", "")
-            track_link = f"{spotify_url}#{track_name}" if spotify_url else track_name
-
-            rows.append({
-                "Track": track_link,
-                "Artist": meta.get("artist_names", "Unknown"),
-                "Album": meta.get("album_name", "Unknown"),
-                "Vibe": doc,
-                "Popularity": meta.get("popularity", 0),
-            })
-
-        df = pd.DataFrame(rows)
+        records = track_page.records
+        metadata = [record.metadata for record in records]
+        # Embed track name in URL fragment so LinkColumn can display it
+        links = [
+            f"{meta['spotify_url']}#{meta.get('track_name', 'Unknown')}"
+            if meta.get("spotify_url")
+            else meta.get("track_name", "Unknown")
+            for meta in metadata
+        ]
+        df = pd.DataFrame({
+            "Track": links,
+            "Artist": [meta.get("artist_names", "Unknown") for meta in metadata],
+            "Album": [meta.get("album_name", "Unknown") for meta in metadata],
+            "Vibe": [record.document for record in records],
+            "Popularity": [meta.get("popularity", 0) for meta in metadata],
+        })
 
         st.dataframe(
             df,
@@ -98,6 +107,10 @@ def render_library_section() -> None:
             width="stretch",
             hide_index=True,
         )
+        st.caption(
+            f"Showing {track_page.offset + 1}–{track_page.offset + len(records)} "
+            f"of {track_page.total} tracks"
+        )
     else:
         st.markdown(
             """
@@ -111,3 +124,65 @@ def render_library_section() -> None:
             """,
             unsafe_allow_html=True,
         )
+
+
+class _PageControls(NamedTuple):
+    number: int
+    size: int
+    sort_by: TrackSort | None
+
+
+def _render_page_controls(count: int) -> _PageControls:
+    """Sort order, page size and page number selectors for the track table."""
+    sort_col, size_col, page_col = st.columns([2, 1, 1])
+    with sort_col:
+        sort_label = st.selectbox(
+            "Sort by", list(LIBRARY_SORT_OPTIONS), key="library_sort"
+        )
+    with size_col:
+        size = st.selectbox(
+            "Tracks per page", LIBRARY_PAGE_SIZES, key="library_page_size"
+        )
+    with page_col:
+        number = st.number_input(
+            "Page",
+            min_value=1,
+            max_value=max(math.ceil(count / size), 1),
+            value=1,
+            key="library_page",
+        )
+    return _PageControls(
+        number=int(number), size=size, sort_by=LIBRARY_SORT_OPTIONS[sort_label]
+    )
+
+
+def render_migration_notice(repository: VectorDBRepository) -> None:
+    """Offer to re-embed the library when EMBEDDING_MODEL has changed."""
+    migration = container.services.embedding_migration_service(
+        vectordb_repository=repository
+    )
+
+    if migration.running:
+        progress = migration.progress
+        done, total = (progress.current, progress.total) if progress else (0, 1)
+        st.progress(
+            done / max(total, 1),
+            text=f"Re-embedding library with {Settings.EMBEDDING_MODEL}: "
+            f"{done}/{total} tracks (search keeps using the current index)",
+        )
+        if st.button("🔄 Refresh progress", key="refresh_migration"):
+            st.rerun()
+        return
+
+    if migration.error:
+        st.error(f"Re-embedding failed: {migration.error}")
+
+    if repository.needs_migration:
+        st.warning(
+            f"Tracks are indexed with {repository.embedding_model}, but "
+            f"EMBEDDING_MODEL is {Settings.EMBEDDING_MODEL}. Searches use the "
+            "old model until the library is re-embedded."
+        )
+        if st.button("🧬 Re-embed Library", key="migrate_embeddings"):
+            migration.start()
+            st.rerun()
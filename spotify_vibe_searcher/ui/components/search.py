@@ -2,11 +2,12 @@ import asyncio
 
 import streamlit as st
 
-from spotify_vibe_searcher.domain import SearchResults
+from spotify_vibe_searcher.domain import SearchMode, SearchResults
+from spotify_vibe_searcher.infrastructure import VectorDBRepository
 from spotify_vibe_searcher.injections import container
 
 
-def render_search_section() -> None:
+def render_search_section(repository: VectorDBRepository) -> None:
     """Render the semantic search section — always visible."""
     st.markdown("#### 🔍 Vibe Search")
     st.caption("Describe a mood, feeling or scenario to find matching tracks.")
@@ -26,12 +27,33 @@ def render_search_section() -> None:
     with col_btn:
         search_button = st.button("🎯 Find My Vibe", type="primary")
 
+    col_hybrid, col_diverse = st.columns(2)
+    with col_hybrid:
+        hybrid = st.toggle(
+            "Match exact words too",
+            help="Also match titles, artists and lyric lines word for word.",
+            key="hybrid_search",
+        )
+    with col_diverse:
+        diversify = st.toggle(
+            "Diversify results",
+            help="Avoid near-duplicate tracks and long runs by the same artist.",
+            key="diversify_search",
+        )
+
     if search_button and query:
         with st.spinner("🔎 Searching for matching vibes..."):
-            search_service = container.services.search_service()
+            search_service = container.services.search_service(
+                vectordb_repository=repository
+            )
 
             results = asyncio.run(
-                search_service.search_by_vibe(query, n_results=n_results)
+                search_service.search_by_vibe(
+                    query,
+                    n_results=n_results,
+                    mode=SearchMode.HYBRID if hybrid else SearchMode.VECTOR,
+                    diversify=diversify,
+                )
             )
 
             _render_search_results(results)
@@ -1,14 +1,19 @@
 import streamlit as st
 
 from spotify_vibe_searcher.domain import EnrichedTrack, SyncProgress
+from spotify_vibe_searcher.infrastructure import VectorDBRepository
 from spotify_vibe_searcher.injections import container
 
 
-def render_sync_library_section(access_token: str) -> None:
+def render_sync_library_section(
+    access_token: str, user_id: str, repository: VectorDBRepository
+) -> None:
     """Render the sync library section with inline slider and button.
 
     Args:
         access_token: Spotify access token for authentication.
+        user_id: Spotify user whose liked songs are synced.
+        repository: Library the tracks are indexed into.
     """
     col_slider, col_btn = st.columns([3, 1])
     with col_slider:
@@ -24,11 +29,14 @@ def render_sync_library_section(access_token: str) -> None:
         sync_clicked = st.button("📥 Sync Library")
 
     if sync_clicked:
-        # Configure container with access token
-        container.infrastructure.config.spotify.access_token.from_value(access_token)
-
-        # Get service from container
-        sync_service = container.services.library_sync_service()
+        # Pass this session's credentials and library explicitly: the
+        # container config is shared by every session
+        sync_service = container.services.library_sync_service(
+            spotify_client=container.infrastructure.async_spotify_client(
+                access_token=access_token, user_id=user_id
+            ),
+            vectordb_repository=repository,
+        )
 
         # Create progress containers
         progress_bar = st.progress(0)
@@ -3,6 +3,7 @@
 
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -34,6 +35,28 @@ class AppSettings(BaseSettings):
         default="user-library-read user-read-private user-read-email",
         description="Space-separated list of Spotify API scopes",
     )
+    SPOTIFY_CONCURRENCY: int = Field(
+        default=8,
+        ge=1,
+        description="Maximum number of Spotify API requests in flight during a "
+        "library sync (liked-song pages and artist batches)",
+    )
+    SPOTIFY_CACHE: bool = Field(
+        default=True,
+        description="Keep Spotify API responses on disk and revalidate them "
+        "with conditional requests (ETag / Last-Modified) on later syncs",
+    )
+    SPOTIFY_OFFLINE: bool = Field(
+        default=False,
+        description="Answer Spotify API requests from the response cache only, "
+        "without network access (e.g. to rebuild the index from a previous sync)",
+    )
+    SPOTIFY_LEAN_PARSING: bool = Field(
+        default=False,
+        description="Scan the library during sync as lightweight unvalidated "
+        "tuples and fully parse only tracks not yet indexed (faster and far "
+        "less memory for large libraries)",
+    )
 
     # Genius API Configuration
     GENIUS_API_KEY: str = Field(
@@ -51,11 +74,100 @@ class AppSettings(BaseSettings):
         default="tracks",
         description="ChromaDB collection name",
     )
+    MULTI_TENANT: bool = Field(
+        default=False,
+        description="Give every Spotify user their own collection (named "
+        "after CHROMADB_COLLECTION and the user ID) instead of one shared library",
+    )
+    CHROMADB_HOST: str | None = Field(
+        default=None,
+        description="Host of a Chroma server to use instead of the embedded "
+        "database under DATA_DIR, so several app replicas can share one index",
+    )
+    CHROMADB_PORT: int = Field(
+        default=8000,
+        gt=0,
+        description="Port of the Chroma server",
+    )
+    CHROMADB_SSL: bool = Field(
+        default=False,
+        description="Connect to the Chroma server over HTTPS",
+    )
+    CHROMADB_HTTP_TIMEOUT: float = Field(
+        default=30.0,
+        gt=0,
+        description="Seconds to wait on any Chroma server request",
+    )
+    CHROMADB_HTTP_MAX_CONNECTIONS: int = Field(
+        default=20,
+        ge=1,
+        description="Connections pooled to the Chroma server per process "
+        "(all collections share the pool)",
+    )
+    CHROMADB_HTTP_KEEPALIVE_SECS: float = Field(
+        default=40.0,
+        ge=0,
+        description="Seconds an idle pooled Chroma connection is kept open",
+    )
+    CHROMADB_HNSW_M: int = Field(
+        default=16,
+        ge=2,
+        description="Neighbours per node in ChromaDB's HNSW graph (more improves "
+        "recall at the cost of memory and build time)",
+    )
+    CHROMADB_HNSW_CONSTRUCTION_EF: int = Field(
+        default=100,
+        ge=1,
+        description="Candidate list size while building the ChromaDB HNSW graph",
+    )
+    CHROMADB_HNSW_SEARCH_EF: int = Field(
+        default=100,
+        ge=1,
+        description="Candidate list size per ChromaDB HNSW query (recall vs latency)",
+    )
+    CHROMADB_HNSW_SYNC_THRESHOLD: int = Field(
+        default=1000,
+        ge=2,
+        description="Vectors added before the ChromaDB HNSW graph is persisted to disk",
+    )
 
     EMBEDDING_MODEL: str = Field(
         default="nomic-embed-text:v1.5",
         description="Embedding model to use",
     )
+    EMBEDDING_DIMENSION: int | None = Field(
+        default=None,
+        gt=0,
+        description="Truncate embeddings to their first N dimensions and "
+        "re-normalize (Matryoshka models such as nomic-embed-text v1.5 support "
+        "512, 256 or 128); unset keeps the full vectors. Changing it requires "
+        "re-indexing",
+    )
+    EMBEDDING_BASE_URL: str = Field(
+        default="http://localhost:11434",
+        description="Ollama server used for embeddings",
+    )
+    EMBEDDING_BATCH_SIZE: int = Field(
+        default=64,
+        ge=1,
+        description="Documents sent per embedding request",
+    )
+    EMBEDDING_CONCURRENCY: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum number of embedding requests in flight",
+    )
+    EMBEDDING_TIMEOUT: float = Field(
+        default=60.0,
+        gt=0,
+        description="Timeout in seconds for one embedding request",
+    )
+    EMBEDDING_CACHE_SIZE: int = Field(
+        default=100_000,
+        ge=0,
+        description="Embeddings kept in the on-disk cache (model + text hash); "
+        "least recently used ones are evicted beyond this, 0 disables it",
+    )
     LLM_BASE_URL: str = Field(
         default="http://localhost:11434/v1",
         description="LLM API base URL",
@@ -74,7 +186,116 @@ class AppSettings(BaseSettings):
     )
     LLM_CONCURRENCY_LIMIT: int = Field(
         default=3,
-        description="Maximum number of concurrent LLM requests during library sync",
+        description="Maximum number of concurrent LLM requests (library sync, "
+        "batch search)",
+    )
+
+    # Vector Store Configuration
+    VECTOR_BACKEND: Literal["chroma", "faiss"] = Field(
+        default="chroma",
+        description="Vector store backend: ChromaDB, or a local FAISS index "
+        "(requires the 'faiss' extra)",
+    )
+    FAISS_INDEX_TYPE: Literal["flat", "ivf", "hnsw"] = Field(
+        default="flat",
+        description="FAISS index type: exact 'flat', 'ivf' inverted lists or "
+        "'hnsw' graph",
+    )
+    FAISS_IVF_NLIST: int = Field(
+        default=1024,
+        ge=1,
+        description="Maximum number of IVF lists (capped for small libraries)",
+    )
+    FAISS_IVF_NPROBE: int = Field(
+        default=16,
+        ge=1,
+        description="IVF lists scanned per query (higher = better recall, slower)",
+    )
+    FAISS_HNSW_M: int = Field(
+        default=32,
+        ge=2,
+        description="Neighbours per node in the FAISS HNSW graph",
+    )
+    FAISS_HNSW_EF_SEARCH: int = Field(
+        default=64,
+        ge=1,
+        description="FAISS HNSW search breadth (higher = better recall, slower)",
+    )
+
+    # Search Configuration
+    VECTOR_SEARCH_ENGINE: Literal["hnsw", "exact"] = Field(
+        default="hnsw",
+        description="Nearest-neighbour engine: ChromaDB's HNSW index, or exact "
+        "brute-force search over an in-memory NumPy matrix (best for libraries "
+        "of a few thousand tracks)",
+    )
+    VECTOR_QUANTIZATION: Literal["none", "float16", "int8"] = Field(
+        default="none",
+        description="Storage precision of the exact engine's in-memory matrix: "
+        "float16 halves memory, int8 quarters it; results are re-scored with "
+        "the stored float32 embeddings",
+    )
+    EMBEDDING_MATRIX: bool = Field(
+        default=False,
+        description="Keep a memory-mapped float32 copy of every embedding next "
+        "to the vector store, shared zero-copy by the exact engine and by "
+        "analytics in other processes",
+    )
+    QUANTIZATION_RESCORE_FACTOR: int = Field(
+        default=4,
+        ge=1,
+        description="Candidates fetched per requested result from a quantized "
+        "matrix before exact float32 re-scoring",
+    )
+    MMR_LAMBDA: float = Field(
+        default=0.7,
+        ge=0.0,
+        le=1.0,
+        description="Relevance/diversity trade-off for diversified search "
+        "(1.0 = relevance only)",
+    )
+    MMR_MAX_PER_ARTIST: int = Field(
+        default=2,
+        ge=0,
+        description="Maximum tracks per artist in diversified results (0 = no cap)",
+    )
+    MMR_CANDIDATE_FACTOR: int = Field(
+        default=5,
+        ge=1,
+        description="Candidates fetched per requested result before diversifying",
+    )
+    ROCCHIO_ALPHA: float = Field(
+        default=1.0,
+        ge=0.0,
+        description="Relevance feedback: weight of the original query vector",
+    )
+    ROCCHIO_BETA: float = Field(
+        default=0.75,
+        ge=0.0,
+        description="Relevance feedback: pull towards liked tracks",
+    )
+    ROCCHIO_GAMMA: float = Field(
+        default=0.15,
+        ge=0.0,
+        description="Relevance feedback: push away from disliked tracks",
+    )
+    RESULT_CACHE_SIZE: int = Field(
+        default=256,
+        ge=0,
+        description="Vector searches kept in the shared result cache (0 disables)",
+    )
+    RESULT_CACHE_TOLERANCE: float = Field(
+        default=0.005,
+        ge=0.0,
+        le=2.0,
+        description="Maximum cosine distance between two query embeddings for "
+        "them to share cached results (0 = identical queries only)",
+    )
+    COLLECTION_VERSION_TTL: float = Field(
+        default=1.0,
+        ge=0.0,
+        description="Seconds a collection's write version is reused before it is "
+        "read again, bounding how long other processes' writes go unseen by caches",
     )
 
     @property
@@ -82,6 +303,36 @@ class AppSettings(BaseSettings):
         """Path to ChromaDB persistent storage."""
         return self.DATA_DIR / "chromadb"
 
+    @property
+    def SPOTIFY_CACHE_PATH(self) -> Path:
+        """Path to the SQLite cache of Spotify API responses."""
+        return self.DATA_DIR / "spotify_cache.db"
+
+    @property
+    def FAISS_PATH(self) -> Path:
+        """Path to the FAISS index and record store."""
+        return self.DATA_DIR / "faiss"
+
+    @property
+    def ACTIVE_COLLECTION_PATH(self) -> Path:
+        """Path to the pointer naming the collection searches are served from."""
+        return self.DATA_DIR / "active_collection.json"
+
+    @property
+    def LEXICAL_INDEX_PATH(self) -> Path:
+        """Path to the SQLite full-text index kept next to ChromaDB."""
+        return self.DATA_DIR / "lexical.db"
+
+    @property
+    def EMBEDDING_CACHE_PATH(self) -> Path:
+        """Path to the SQLite cache of document embeddings."""
+        return self.DATA_DIR / "embeddings.db"
+
+    @property
+    def EMBEDDING_MATRIX_PATH(self) -> Path:
+        """Path to the memory-mapped embedding matrices, one per collection."""
+        return self.DATA_DIR / "embedding_matrix"
+
     @property
     def CACHE_PATH(self) -> Path:
         """Path to cache directory."""
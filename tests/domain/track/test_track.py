@@ -5,6 +5,7 @@ from spotify_vibe_searcher.domain.track import (
     SpotifyAlbum,
     SpotifyArtist,
     SpotifyTrack,
+    TrackSummary,
 )
 
 
@@ -76,6 +77,7 @@ def test_all_genre_names_from_multiple_artists(
     assert "pop" in genre_names
     assert "indie" in genre_names
     assert "alternative" in genre_names
+    assert genre_names == "alternative, indie, pop, rock"
 
 
 def test_all_genre_names_deduplicates(
@@ -91,3 +93,19 @@ def test_all_genre_names_empty(
     track_with_no_genres: SpotifyTrack,
 ) -> None:
     assert track_with_no_genres.all_genre_names == ""
+
+
+def test_track_summary_matches_saved_track(
+    track_with_multiple_artist_genres: SpotifyTrack,
+) -> None:
+    data = {
+        "added_at": "2023-01-01T00:00:00Z",
+        "track": track_with_multiple_artist_genres.model_dump(by_alias=True),
+    }
+    saved_track = SavedTrack.from_api_response(data)
+    artists = {artist.id_: artist for artist in saved_track.track.artists}
+
+    summary = TrackSummary.from_api_response(data)
+
+    assert summary.genres == ""
+    assert summary.with_genres(artists) == TrackSummary.from_saved_track(saved_track)
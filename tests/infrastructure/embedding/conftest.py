@@ -0,0 +1,43 @@
+# pylint: disable=protected-access
+import pathlib
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from spotify_vibe_searcher.infrastructure import EmbeddingClient
+from spotify_vibe_searcher.infrastructure.embedding import EmbeddingCache
+from spotify_vibe_searcher.utils import Settings
+
+
+def _fake_embed(model: str, input: list[str]) -> dict[str, Any]:  # pylint: disable=redefined-builtin
+    # One distinguishable 2-d vector per document: [len(document), 1]
+    return {"model": model, "embeddings": [[float(len(text)), 1.0] for text in input]}
+
+
+@pytest.fixture
+def mock_ollama_client() -> MagicMock:
+    client = MagicMock()
+    client.embed.side_effect = _fake_embed
+    return client
+
+
+@pytest.fixture
+def embedding_client(mock_ollama_client: MagicMock) -> Generator[EmbeddingClient]:
+    original_batch_size = Settings.EMBEDDING_BATCH_SIZE
+    Settings.EMBEDDING_BATCH_SIZE = 2
+    embedding_client = EmbeddingClient()
+    embedding_client.__dict__["client"] = mock_ollama_client
+    yield embedding_client
+    Settings.EMBEDDING_BATCH_SIZE = original_batch_size
+
+
+@pytest.fixture
+def embedding_cache(tmp_path: pathlib.Path) -> Generator[EmbeddingCache]:
+    original_data_dir = Settings.DATA_DIR
+    Settings.DATA_DIR = tmp_path
+    embedding_cache = EmbeddingCache(max_entries=3)
+    yield embedding_cache
+    embedding_cache.close()
+    Settings.DATA_DIR = original_data_dir
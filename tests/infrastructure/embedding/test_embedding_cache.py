@@ -0,0 +1,56 @@
+import numpy as np
+
+from spotify_vibe_searcher.infrastructure.embedding import EmbeddingCache
+
+
+def test_round_trip(embedding_cache: EmbeddingCache) -> None:
+    embedding_cache.put("model", ["calm", "loud"], np.eye(2, dtype=np.float32))
+
+    calm, loud, unknown = embedding_cache.get("model", ["calm", "loud", "new"])
+
+    assert calm is not None and calm.tolist() == [1.0, 0.0]
+    assert loud is not None and loud.tolist() == [0.0, 1.0]
+    assert unknown is None
+
+
+def test_entries_are_keyed_by_model(embedding_cache: EmbeddingCache) -> None:
+    embedding_cache.put("model", ["calm"], np.ones((1, 2), dtype=np.float32))
+
+    assert embedding_cache.get("other-model", ["calm"]) == [None]
+
+
+def test_least_recently_used_entries_are_evicted(
+    embedding_cache: EmbeddingCache,
+) -> None:
+    for document in ["a", "b", "c"]:
+        embedding_cache.put("model", [document], np.ones((1, 3), dtype=np.float32))
+    embedding_cache.get("model", ["a"])
+
+    embedding_cache.put("model", ["d"], np.ones((1, 3), dtype=np.float32))
+
+    assert embedding_cache.count() == 3
+    assert [
+        vector is not None
+        for vector in embedding_cache.get("model", ["a", "b", "c", "d"])
+    ] == [True, False, True, True]
+
+
+def test_stored_entries_are_not_counted_again(
+    embedding_cache: EmbeddingCache,
+) -> None:
+    for document in ["a", "b", "c", "a", "b"]:
+        embedding_cache.put("model", [document], np.ones((1, 3), dtype=np.float32))
+
+    assert embedding_cache.count() == 3
+    assert all(
+        vector is not None for vector in embedding_cache.get("model", ["a", "b", "c"])
+    )
+
+
+def test_disabled_cache_stores_nothing(embedding_cache: EmbeddingCache) -> None:
+    embedding_cache.max_entries = 0
+
+    embedding_cache.put("model", ["calm"], np.ones((1, 2), dtype=np.float32))
+
+    assert embedding_cache.get("model", ["calm"]) == [None]
+    assert embedding_cache.count() == 0
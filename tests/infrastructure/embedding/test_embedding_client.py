@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock
+
+import httpx
+import numpy as np
+import pytest
+import stamina
+from ollama import ResponseError
+
+from spotify_vibe_searcher.infrastructure import EmbeddingClient
+
+
+def test_client_reuses_instance() -> None:
+    embedding_client = EmbeddingClient()
+    assert embedding_client.client is embedding_client.client
+
+
+def test_embed_batches_documents_in_order(
+    embedding_client: EmbeddingClient, mock_ollama_client: MagicMock
+) -> None:
+    documents = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+    embeddings = embedding_client.embed(documents)
+
+    assert embeddings.dtype == np.float32
+    assert embeddings[:, 0].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert sorted(
+        len(call.kwargs["input"]) for call in mock_ollama_client.embed.call_args_list
+    ) == [1, 2, 2]
+
+
+def test_embed_empty_documents(
+    embedding_client: EmbeddingClient, mock_ollama_client: MagicMock
+) -> None:
+    assert embedding_client.embed([]).size == 0
+    mock_ollama_client.embed.assert_not_called()
+
+
+def test_failed_batch_is_retried_alone(
+    embedding_client: EmbeddingClient, mock_ollama_client: MagicMock
+) -> None:
+    fake_embed = mock_ollama_client.embed.side_effect
+    failures = iter([httpx.ReadTimeout("timed out")])
+
+    def flaky_embed(model: str, input: list[str]) -> dict:  # pylint: disable=redefined-builtin
+        if input == ["ccc"]:
+            error = next(failures, None)
+            if error is not None:
+                raise error
+        return fake_embed(model=model, input=input)  # type: ignore[no-any-return]
+
+    mock_ollama_client.embed.side_effect = flaky_embed
+    with stamina.set_testing(True, attempts=3):
+        embeddings = embedding_client.embed(["a", "bb", "ccc"])
+
+    assert embeddings[:, 0].tolist() == [1.0, 2.0, 3.0]
+    assert mock_ollama_client.embed.call_count == 3
+
+
+def test_server_errors_are_retried_but_client_errors_are_not(
+    embedding_client: EmbeddingClient, mock_ollama_client: MagicMock
+) -> None:
+    fake_embed = mock_ollama_client.embed.side_effect
+    failures = iter([ResponseError("model is loading", 503)])
+
+    def flaky_embed(model: str, input: list[str]) -> dict:  # pylint: disable=redefined-builtin
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        return fake_embed(model=model, input=input)  # type: ignore[no-any-return]
+
+    mock_ollama_client.embed.side_effect = flaky_embed
+    with stamina.set_testing(True, attempts=3):
+        assert embedding_client.embed(["a"])[:, 0].tolist() == [1.0]
+    assert mock_ollama_client.embed.call_count == 2
+
+    mock_ollama_client.embed.side_effect = ResponseError("model not found", 404)
+    with stamina.set_testing(True, attempts=3), pytest.raises(ResponseError):
+        embedding_client.embed(["a"])
+    assert mock_ollama_client.embed.call_count == 3  # One more, not retried
@@ -1,6 +1,13 @@
+import pathlib
+from collections.abc import Generator
+
 import pytest
 
-from spotify_vibe_searcher.infrastructure.spotify import SpotifyClient
+from spotify_vibe_searcher.infrastructure.spotify import (
+    AsyncSpotifyClient,
+    SpotifyClient,
+)
+from spotify_vibe_searcher.utils import Settings
 from tests.helpers.auth import get_spotify_token
 
 
@@ -12,6 +19,15 @@ def spotify_client() -> SpotifyClient:
     return SpotifyClient(access_token=token)
 
 
+@pytest.fixture
+def async_spotify_client(tmp_path: pathlib.Path) -> Generator[AsyncSpotifyClient]:
+    original_data_dir = Settings.DATA_DIR
+    Settings.DATA_DIR = tmp_path  # Keeps the response cache out of ./data
+    token = get_spotify_token() or "MOCKED_TOKEN"
+    yield AsyncSpotifyClient(access_token=token, user_id="tester")
+    Settings.DATA_DIR = original_data_dir
+
+
 @pytest.fixture(
     params=[
         ["3TVXtAsR1Inumwj472S9r4"],  # Single artist (Drake)
@@ -0,0 +1,161 @@
+from unittest.mock import patch
+
+import httpx
+import pytest
+import stamina
+from vcr.cassette import Cassette
+
+from spotify_vibe_searcher.domain import SavedTrack, SpotifyArtist, TrackSummary
+from spotify_vibe_searcher.infrastructure.spotify import AsyncSpotifyClient
+from spotify_vibe_searcher.infrastructure.spotify.config import (
+    SPOTIFY_API_URL,
+    async_retry_backoff,
+)
+from spotify_vibe_searcher.utils import Settings
+
+
+@pytest.mark.vcr
+@pytest.mark.asyncio
+async def test_get_all_liked_songs(async_spotify_client: AsyncSpotifyClient) -> None:
+    async with async_spotify_client:
+        tracks = await async_spotify_client.get_all_liked_songs(max_tracks=10)
+
+    assert all(isinstance(track, SavedTrack) for track in tracks)
+    assert len(tracks) == 10
+
+
+@pytest.mark.vcr
+@pytest.mark.asyncio
+async def test_get_artists(
+    async_spotify_client: AsyncSpotifyClient, artist_ids: list[str]
+) -> None:
+    async with async_spotify_client:
+        artists = await async_spotify_client.get_artists(artist_ids)
+
+    assert sorted(artist.id_ for artist in artists) == sorted(artist_ids)
+    assert all(isinstance(artist, SpotifyArtist) for artist in artists)
+
+
+@pytest.mark.asyncio
+async def test_requests_need_an_open_session(
+    async_spotify_client: AsyncSpotifyClient,
+) -> None:
+    with pytest.raises(RuntimeError, match="async with"):
+        await async_spotify_client.get_liked_songs()
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_and_server_errors_are_retried_but_client_errors_are_not(
+    async_spotify_client: AsyncSpotifyClient,
+) -> None:
+    responses = iter([
+        httpx.Response(429, headers={"Retry-After": "1"}),
+        httpx.Response(503),
+        httpx.Response(200, json={"total": 0, "items": []}),
+        httpx.Response(404),
+    ])
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return next(responses)
+
+    async with async_spotify_client:
+        assert async_spotify_client._http is not None
+        await async_spotify_client._http.aclose()
+        async_spotify_client._http = httpx.AsyncClient(
+            base_url=SPOTIFY_API_URL, transport=httpx.MockTransport(handler)
+        )
+        with stamina.set_testing(True, attempts=3):
+            assert await async_spotify_client.get_liked_songs() == {
+                "total": 0,
+                "items": [],
+            }
+            with pytest.raises(httpx.HTTPStatusError):
+                await async_spotify_client.get_liked_songs()
+
+    assert len(requests) == 4  # One more for the 404, not retried
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [({"Retry-After": "3"}, 3.0), ({}, True), ({"Retry-After": "3600"}, False)],
+    ids=["retry_after", "no_retry_after", "too_long"],
+)
+def test_rate_limits_wait_for_retry_after(
+    headers: dict[str, str], expected: bool | float
+) -> None:
+    request = httpx.Request("GET", SPOTIFY_API_URL)
+    response = httpx.Response(429, headers=headers, request=request)
+    error = httpx.HTTPStatusError("rate limited", request=request, response=response)
+
+    assert async_retry_backoff(error) == expected
+
+
+@pytest.mark.vcr
+@pytest.mark.asyncio
+async def test_unchanged_pages_are_revalidated(
+    async_spotify_client: AsyncSpotifyClient, vcr: Cassette
+) -> None:
+    async with async_spotify_client:
+        tracks = await async_spotify_client.get_all_liked_songs(max_tracks=10)
+    with patch.object(
+        SavedTrack, "from_api_response", wraps=SavedTrack.from_api_response
+    ) as parse:
+        async with async_spotify_client:
+            cached = await async_spotify_client.get_all_liked_songs(max_tracks=10)
+
+    assert (
+        vcr.requests[1].headers["If-None-Match"]
+        == vcr.responses[0]["headers"]["etag"][0]
+    )
+    assert vcr.responses[1]["status"]["code"] == 304
+    parse.assert_not_called()
+    assert cached == tracks
+    assert cached[0].track is not tracks[0].track
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("async_spotify_client")  # Keeps the cache out of ./data
+async def test_anonymous_clients_skip_the_response_cache() -> None:
+    async with AsyncSpotifyClient(access_token="MOCKED_TOKEN") as client:
+        assert client._cache is None
+    assert not Settings.SPOTIFY_CACHE_PATH.exists()
+
+
+@pytest.mark.vcr("test_get_all_liked_songs.yaml")
+@pytest.mark.asyncio
+async def test_offline_mode_serves_cached_pages(
+    async_spotify_client: AsyncSpotifyClient,
+) -> None:
+    async with async_spotify_client:
+        tracks = await async_spotify_client.get_all_liked_songs(max_tracks=10)
+
+    Settings.SPOTIFY_OFFLINE = True
+    try:
+        async with async_spotify_client:
+            cached = await async_spotify_client.get_all_liked_songs(max_tracks=10)
+            with pytest.raises(LookupError, match="is not cached"):
+                await async_spotify_client.get_artists(["3TVXtAsR1Inumwj472S9r4"])
+    finally:
+        Settings.SPOTIFY_OFFLINE = False
+
+    assert cached == tracks
+
+
+@pytest.mark.vcr("test_unchanged_pages_are_revalidated.yaml")
+@pytest.mark.asyncio
+async def test_summaries_then_selected_tracks(
+    async_spotify_client: AsyncSpotifyClient,
+) -> None:
+    async with async_spotify_client:
+        summaries = await async_spotify_client.get_all_track_summaries(max_tracks=10)
+        tracks = await async_spotify_client.get_liked_songs_at([7, 2, 7])
+
+    assert len(summaries) == 10
+    assert all(isinstance(summary, TrackSummary) for summary in summaries)
+    assert [track.track_id for track in tracks] == [
+        summaries[2].track_id,
+        summaries[7].track_id,
+    ]
+    assert TrackSummary.from_saved_track(tracks[0]) == summaries[2]
@@ -1,12 +1,27 @@
-# pylint: disable=line-too-long
+# pylint: disable=line-too-long, protected-access
 import pathlib
+import shutil
+import socket
+import subprocess
+import time
 from collections.abc import Generator
+from unittest.mock import MagicMock
 
+import httpx
+import numpy as np
 import pytest
 from polyfactory.factories.pydantic_factory import ModelFactory
 
 from spotify_vibe_searcher.domain import EnrichedTrack, SavedTrack
 from spotify_vibe_searcher.infrastructure import VectorDBRepository
+from spotify_vibe_searcher.infrastructure.vectordb import (
+    ChromaVectorStore,
+    EmbeddingMatrix,
+    FaissVectorStore,
+    LexicalDocument,
+    LexicalIndex,
+)
+from spotify_vibe_searcher.infrastructure.vectordb.repository import _shared_repository
 from spotify_vibe_searcher.utils import Settings
 
 
@@ -110,3 +125,247 @@ def _populate_with_search_tracks(
     enriched_tracks_for_search: list[EnrichedTrack],
 ) -> None:
     vectordb_repository.add_tracks(enriched_tracks_for_search)
+
+
+@pytest.fixture
+def lexical_index(tmp_path: pathlib.Path) -> Generator[LexicalIndex]:
+    original_data_dir = Settings.DATA_DIR
+    Settings.DATA_DIR = tmp_path
+    index = LexicalIndex(table="tracks")
+    yield index
+    index.close()
+    Settings.DATA_DIR = original_data_dir
+
+
+@pytest.fixture
+def lexical_documents() -> list[LexicalDocument]:
+    return [
+        LexicalDocument(
+            track_id="christmas",
+            track_name="Last Christmas",
+            artist_names="Wham!",
+            album_name="Music from the Edge of Heaven",
+            genres="pop",
+            vibe_description="A bittersweet festive pop song about heartbreak",
+            lyrics="Last Christmas I gave you my heart, but the very next day",
+        ),
+        LexicalDocument(
+            track_id="metal",
+            track_name="Master of Puppets",
+            artist_names="Metallica",
+            album_name="Master of Puppets",
+            genres="thrash metal",
+            vibe_description="An aggressive metal track about addiction and control",
+            lyrics="Master of puppets I'm pulling your strings",
+        ),
+        LexicalDocument(
+            track_id="indie",
+            track_name="Skinny Love",
+            artist_names="Bon Iver",
+            album_name="For Emma, Forever Ago",
+            genres="indie folk",
+            vibe_description="A melancholic indie folk song about a fading love",
+            lyrics="Come on skinny love just last the year",
+        ),
+    ]
+
+
+@pytest.fixture
+def _populate_lexical_index(
+    lexical_index: LexicalIndex, lexical_documents: list[LexicalDocument]
+) -> None:
+    lexical_index.upsert(lexical_documents)
+
+
+@pytest.fixture
+def _populate_with_embeddings(vectordb_repository: VectorDBRepository) -> None:
+    """Store tracks with precomputed embeddings, bypassing the embedding model."""
+    vectordb_repository.store.add(
+        ids=["north", "east", "up"],
+        embeddings=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+        documents=["Pointing north", "Pointing east", "Pointing up"],
+        metadatas=[
+            {"track_id": "north", "artist_names": "Compass", "popularity": 40},
+            {"track_id": "east", "artist_names": "Compass", "popularity": 90},
+            {"track_id": "up", "artist_names": "Balloon"},
+        ],
+    )
+
+
+@pytest.fixture
+def _exact_search_engine() -> Generator[None]:
+    original_engine = Settings.VECTOR_SEARCH_ENGINE
+    Settings.VECTOR_SEARCH_ENGINE = "exact"
+    yield
+    Settings.VECTOR_SEARCH_ENGINE = original_engine
+
+
+@pytest.fixture
+def _int8_quantization() -> Generator[None]:
+    original_quantization = Settings.VECTOR_QUANTIZATION
+    Settings.VECTOR_QUANTIZATION = "int8"
+    yield
+    Settings.VECTOR_QUANTIZATION = original_quantization
+
+
+@pytest.fixture
+def _matryoshka_dimension() -> Generator[None]:
+    original_dimension = Settings.EMBEDDING_DIMENSION
+    Settings.EMBEDDING_DIMENSION = 256
+    yield
+    Settings.EMBEDDING_DIMENSION = original_dimension
+
+
+@pytest.fixture
+def migrating_repository(
+    vectordb_repository: VectorDBRepository,
+    enriched_tracks_batch: list[EnrichedTrack],
+) -> Generator[VectorDBRepository]:
+    """Repository indexed with the default model after EMBEDDING_MODEL changed.
+
+    The fake embedder returns 3-d vectors for the old model and 5-d ones for
+    the new one.
+    """
+    original_model = Settings.EMBEDDING_MODEL
+    embedding_client = MagicMock()
+    embedding_client.embed.side_effect = lambda documents, model: np.ones(
+        (len(documents), 3 if model == original_model else 5), dtype=np.float32
+    )
+    vectordb_repository._embedding_client = embedding_client
+    vectordb_repository.add_tracks(enriched_tracks_batch)
+
+    Settings.EMBEDDING_MODEL = "all-minilm"
+    yield vectordb_repository
+    Settings.EMBEDDING_MODEL = original_model
+
+
+@pytest.fixture
+def _faiss_backend() -> Generator[None]:
+    original_backend = Settings.VECTOR_BACKEND
+    Settings.VECTOR_BACKEND = "faiss"
+    yield
+    Settings.VECTOR_BACKEND = original_backend
+
+
+@pytest.fixture(params=["flat", "ivf", "hnsw"])
+def faiss_store(
+    request: pytest.FixtureRequest, tmp_path: pathlib.Path
+) -> Generator[FaissVectorStore]:
+    original_data_dir = Settings.DATA_DIR
+    Settings.DATA_DIR = tmp_path
+    store = FaissVectorStore(collection_name="tracks", index_type=request.param)
+    yield store
+    store.close()
+    Settings.DATA_DIR = original_data_dir
+
+
+@pytest.fixture
+def _populate_faiss_store(faiss_store: FaissVectorStore) -> None:
+    faiss_store.add(
+        ids=["north", "east", "up"],
+        embeddings=[[2.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+        documents=["Pointing north", "Pointing east", "Pointing up"],
+        metadatas=[
+            {"track_id": "north", "artist_names": "Compass", "has_lyrics": True},
+            {"track_id": "east", "artist_names": "Compass", "has_lyrics": False},
+            {"track_id": "up", "artist_names": "Balloon", "has_lyrics": True},
+        ],
+    )
+
+
+@pytest.fixture
+def chroma_store(tmp_path: pathlib.Path) -> Generator[ChromaVectorStore]:
+    original_data_dir = Settings.DATA_DIR
+    Settings.DATA_DIR = tmp_path
+    yield ChromaVectorStore(collection_name="tracks")
+    Settings.DATA_DIR = original_data_dir
+
+
+@pytest.fixture(scope="session")
+def chroma_server(tmp_path_factory: pytest.TempPathFactory) -> Generator[int]:
+    """A local Chroma server for the HTTP client mode; yields its port."""
+    executable = shutil.which("chroma")
+    if executable is None:
+        pytest.skip("The chroma CLI is not installed")
+    with socket.socket() as probe:
+        probe.bind(("localhost", 0))
+        port = int(probe.getsockname()[1])
+
+    with subprocess.Popen(
+        [executable, "run", "--path", str(tmp_path_factory.mktemp("chroma-server"))]
+        + ["--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    ) as server:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(
+                    f"http://localhost:{port}/api/v2/heartbeat"
+                ).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline or server.poll() is not None:
+                    server.kill()
+                    pytest.skip("The Chroma server did not start")
+                time.sleep(0.2)
+        yield port
+        server.terminate()
+
+
+@pytest.fixture
+def _chroma_http(chroma_server: int, tmp_path: pathlib.Path) -> Generator[None]:
+    original = (Settings.DATA_DIR, Settings.CHROMADB_HOST, Settings.CHROMADB_PORT)
+    Settings.DATA_DIR = tmp_path
+    Settings.CHROMADB_HOST, Settings.CHROMADB_PORT = "localhost", chroma_server
+    yield
+    # The server outlives the test, so leave no collections behind
+    for collection in ChromaVectorStore(
+        collection_name="tracks"
+    ).client.list_collections():
+        ChromaVectorStore(collection_name=collection.name).drop()
+    Settings.DATA_DIR, Settings.CHROMADB_HOST, Settings.CHROMADB_PORT = original
+
+
+@pytest.fixture
+def embedding_matrix(tmp_path: pathlib.Path) -> Generator[EmbeddingMatrix]:
+    original_data_dir = Settings.DATA_DIR
+    Settings.DATA_DIR = tmp_path
+    matrix = EmbeddingMatrix(collection_name="tracks")
+    yield matrix
+    matrix.close()
+    Settings.DATA_DIR = original_data_dir
+
+
+@pytest.fixture
+def _populate_embedding_matrix(embedding_matrix: EmbeddingMatrix) -> None:
+    embedding_matrix.add(
+        ["north", "east", "up", "south"],
+        [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0], [-1.0, 0.0, 0.0]],
+    )
+
+
+@pytest.fixture
+def _embedding_matrix_enabled() -> Generator[None]:
+    original = Settings.EMBEDDING_MATRIX
+    Settings.EMBEDDING_MATRIX = True
+    yield
+    Settings.EMBEDDING_MATRIX = original
+
+
+@pytest.fixture
+def _multi_tenant(tmp_path: pathlib.Path) -> Generator[None]:
+    original_data_dir, original_multi_tenant = Settings.DATA_DIR, Settings.MULTI_TENANT
+    Settings.DATA_DIR, Settings.MULTI_TENANT = tmp_path, True
+    _shared_repository.cache_clear()
+    yield
+    _shared_repository.cache_clear()
+    Settings.DATA_DIR, Settings.MULTI_TENANT = original_data_dir, original_multi_tenant
+
+
+@pytest.fixture
+def _uncached_collection_version() -> Generator[None]:
+    original_ttl = Settings.COLLECTION_VERSION_TTL
+    Settings.COLLECTION_VERSION_TTL = 0.0
+    yield
+    Settings.COLLECTION_VERSION_TTL = original_ttl
@@ -0,0 +1,185 @@
+# pylint: disable=protected-access
+import pathlib
+
+import pytest
+from chromadb.api import ClientAPI
+
+from spotify_vibe_searcher.infrastructure.vectordb import ChromaVectorStore
+from spotify_vibe_searcher.infrastructure.vectordb.chroma_store import (
+    get_embedding_function,
+)
+from spotify_vibe_searcher.utils import Settings
+
+
+@pytest.fixture
+def _populate_chroma_store(chroma_store: ChromaVectorStore) -> None:
+    chroma_store.add(
+        ids=["north", "east", "up"],
+        embeddings=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+        documents=["Pointing north", "Pointing east", "Pointing up"],
+        metadatas=[
+            {"track_id": "north", "artist_names": "Compass", "has_lyrics": True},
+            {"track_id": "east", "artist_names": "Compass", "has_lyrics": False},
+            {"track_id": "up", "artist_names": "Balloon", "has_lyrics": True},
+        ],
+    )
+
+
+def test_client_lazy_loading(chroma_store: ChromaVectorStore) -> None:
+    assert chroma_store._client is None
+    client = chroma_store.client
+    assert chroma_store._client is client
+
+
+def test_collection_creation(chroma_store: ChromaVectorStore) -> None:
+    assert chroma_store.collection.name == "tracks"
+
+
+def test_collection_handle_is_reused(chroma_store: ChromaVectorStore) -> None:
+    collection = chroma_store.collection
+
+    assert chroma_store.collection is collection
+    assert chroma_store.count() == 0
+    assert chroma_store._collection is collection
+
+
+def test_collection_handle_follows_embedding_model(
+    chroma_store: ChromaVectorStore,
+) -> None:
+    collection = chroma_store.collection
+    original_model = Settings.EMBEDDING_MODEL
+    Settings.EMBEDDING_MODEL = "all-minilm"
+    try:
+        reloaded = chroma_store.collection
+    finally:
+        Settings.EMBEDDING_MODEL = original_model
+
+    assert reloaded is not collection
+    assert reloaded._embedding_function is get_embedding_function("all-minilm")
+
+
+@pytest.mark.usefixtures("_populate_chroma_store")
+def test_collection_handle_reloaded_after_recreation(
+    chroma_store: ChromaVectorStore,
+) -> None:
+    stale = chroma_store.collection
+    chroma_store.client.delete_collection("tracks")
+
+    assert chroma_store.count() == 0
+    assert chroma_store.collection is not stale
+
+
+def test_collection_created_with_hnsw_settings(
+    chroma_store: ChromaVectorStore,
+) -> None:
+    original_m, original_search_ef = (
+        Settings.CHROMADB_HNSW_M,
+        Settings.CHROMADB_HNSW_SEARCH_EF,
+    )
+    Settings.CHROMADB_HNSW_M, Settings.CHROMADB_HNSW_SEARCH_EF = 32, 64
+    try:
+        hnsw = chroma_store.collection.configuration_json["hnsw"]
+    finally:
+        Settings.CHROMADB_HNSW_M = original_m
+        Settings.CHROMADB_HNSW_SEARCH_EF = original_search_ef
+
+    assert hnsw["space"] == "cosine"
+    assert hnsw["max_neighbors"] == 32
+    assert hnsw["ef_search"] == 64
+    assert hnsw["ef_construction"] == Settings.CHROMADB_HNSW_CONSTRUCTION_EF
+
+
+@pytest.mark.usefixtures("_populate_chroma_store")
+def test_query_returns_matches(chroma_store: ChromaVectorStore) -> None:
+    results = chroma_store.query(
+        [[0.9, 0.3, 0.0]], n_results=2, include_embeddings=True
+    )
+
+    assert [match.id for match in results[0]] == ["north", "east"]
+    assert results[0][0].document == "Pointing north"
+    assert results[0][0].metadata["artist_names"] == "Compass"
+    assert results[0][0].embedding is not None
+
+
+@pytest.mark.usefixtures("_populate_chroma_store")
+def test_where_filters_combine(chroma_store: ChromaVectorStore) -> None:
+    records = chroma_store.get(where={"artist_names": "Compass", "has_lyrics": False})
+    results = chroma_store.query(
+        [[1.0, 0.0, 0.0]], n_results=3, where={"artist_names": "Compass"}
+    )
+
+    assert [record.id for record in records] == ["east"]
+    assert [match.id for match in results[0]] == ["north", "east"]
+
+
+@pytest.mark.usefixtures("_populate_chroma_store")
+def test_upsert_and_delete(chroma_store: ChromaVectorStore) -> None:
+    chroma_store.upsert(
+        ["north"], [[0.0, -1.0, 0.0]], ["Pointing south"], [{"track_id": "north"}]
+    )
+    chroma_store.delete(["east"])
+
+    assert chroma_store.count() == 2
+    assert chroma_store.get(ids=["north"])[0].document == "Pointing south"
+
+
+@pytest.mark.usefixtures("_populate_chroma_store")
+def test_get_pages_with_limit_and_offset(chroma_store: ChromaVectorStore) -> None:
+    first = chroma_store.get(limit=2)
+    rest = chroma_store.get(offset=2)
+
+    assert len(first) == 2
+    assert {record.id for record in first + rest} == {"north", "east", "up"}
+    assert chroma_store.get(include_documents=False)[0].document == ""
+
+
+def test_collection_metadata_round_trip(chroma_store: ChromaVectorStore) -> None:
+    assert chroma_store.get_collection_metadata() == {}
+
+    chroma_store.update_collection_metadata({"embedding_dimension": 256})
+    chroma_store.update_collection_metadata({"model": "nomic-embed-text"})
+
+    assert chroma_store.get_collection_metadata() == {
+        "embedding_dimension": 256,
+        "model": "nomic-embed-text",
+    }
+    assert chroma_store.collection.configuration_json["hnsw"]["space"] == "cosine"
+
+
+@pytest.mark.usefixtures("_populate_chroma_store")
+def test_drop_deletes_collection(chroma_store: ChromaVectorStore) -> None:
+    chroma_store.drop()
+
+    assert chroma_store.client.list_collections() == []
+    assert chroma_store.count() == 0
+
+
+@pytest.mark.usefixtures("_chroma_http")
+def test_http_store_round_trips_through_server(tmp_path: pathlib.Path) -> None:
+    store = ChromaVectorStore(collection_name="tracks")
+    store.add(
+        ids=["north", "east"],
+        embeddings=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]],
+        documents=["Pointing north", "Pointing east"],
+        metadatas=[{"track_id": "north"}, {"track_id": "east"}],
+    )
+
+    results = store.query([[0.9, 0.3, 0.0]], n_results=1)
+    store.drop()
+
+    assert [match.id for match in results[0]] == ["north"]
+    assert store.count() == 0
+    assert not Settings.CHROMADB_PATH.exists()
+    assert not (tmp_path / "chromadb").exists()
+
+
+@pytest.mark.usefixtures("_chroma_http")
+def test_http_stores_share_one_pooled_client() -> None:
+    store = ChromaVectorStore(collection_name="tracks")
+    other = ChromaVectorStore(collection_name="tracks_other")
+
+    session = store.client._server._session  # type: ignore[attr-defined]
+
+    assert other.client is store.client
+    assert session.timeout.read == Settings.CHROMADB_HTTP_TIMEOUT
+    assert isinstance(store.client, ClientAPI)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from spotify_vibe_searcher.infrastructure.vectordb import EmbeddingMatrix
+from spotify_vibe_searcher.utils import Settings
+
+
+def test_empty_matrix(embedding_matrix: EmbeddingMatrix) -> None:
+    ids, vectors = embedding_matrix.read()
+
+    assert ids == []
+    assert embedding_matrix.count() == 0
+    assert vectors.shape == (0, 0)
+
+
+@pytest.mark.usefixtures("_populate_embedding_matrix")
+def test_read_maps_file_zero_copy(embedding_matrix: EmbeddingMatrix) -> None:
+    ids, vectors = embedding_matrix.read()
+
+    assert ids == ["north", "east", "up", "south"]
+    assert isinstance(vectors, np.memmap)
+    assert not vectors.flags.writeable
+    np.testing.assert_array_equal(vectors[3], [-1.0, 0.0, 0.0])
+
+
+@pytest.mark.usefixtures("_populate_embedding_matrix")
+def test_add_overwrites_known_ids_in_place(
+    embedding_matrix: EmbeddingMatrix,
+) -> None:
+    embedding_matrix.add(["east", "west"], [[0.0, 2.0, 0.0], [0.0, -1.0, 0.0]])
+
+    ids, vectors = embedding_matrix.read()
+    assert ids == ["north", "east", "up", "south", "west"]
+    np.testing.assert_array_equal(vectors[1], [0.0, 2.0, 0.0])
+
+
+@pytest.mark.usefixtures("_populate_embedding_matrix")
+def test_delete_compacts_once_enough_rows_are_dead(
+    embedding_matrix: EmbeddingMatrix,
+) -> None:
+    embedding_matrix.delete(["east"])
+    ids, vectors = embedding_matrix.read()
+    assert ids == ["north", "up", "south"]
+    assert not isinstance(vectors, np.memmap)  # Live rows gathered around the hole
+
+    embedding_matrix.delete(["north"])
+    ids, vectors = embedding_matrix.read()
+    assert ids == ["up", "south"]
+    assert isinstance(vectors, np.memmap)
+    np.testing.assert_array_equal(vectors, [[0.0, 0.0, 1.0], [-1.0, 0.0, 0.0]])
+    assert sorted(path.name for path in Settings.EMBEDDING_MATRIX_PATH.iterdir()) == [
+        "tracks.1.f32",
+        "tracks.db",
+    ]
+
+
+@pytest.mark.usefixtures("_populate_embedding_matrix")
+def test_other_readers_share_the_matrix(embedding_matrix: EmbeddingMatrix) -> None:
+    reader = EmbeddingMatrix(collection_name="tracks")
+
+    embedding_matrix.add(["west"], [[0.0, -1.0, 0.0]])
+
+    ids, vectors = reader.read()
+    assert ids[-1] == "west"
+    assert vectors.shape == (5, 3)
+    reader.close()
+
+
+@pytest.mark.usefixtures("_populate_embedding_matrix")
+def test_mismatched_dimension_is_refused(embedding_matrix: EmbeddingMatrix) -> None:
+    with pytest.raises(ValueError, match="dimension"):
+        embedding_matrix.add(["wide"], [[1.0, 0.0, 0.0, 0.0]])
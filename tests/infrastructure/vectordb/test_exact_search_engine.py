@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+
+from spotify_vibe_searcher.infrastructure.vectordb import ExactSearchEngine
+from spotify_vibe_searcher.infrastructure.vectordb.exact import Quantization, rescore
+
+
+@pytest.fixture
+def exact_engine() -> ExactSearchEngine:
+    engine = ExactSearchEngine()
+    engine.load(
+        ["north", "east", "up"],
+        [[2.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 3.0]],
+    )
+    return engine
+
+
+def test_load_normalizes_embeddings(exact_engine: ExactSearchEngine) -> None:
+    assert exact_engine.size == 3
+    assert exact_engine.dimension == 3
+    np.testing.assert_allclose(np.linalg.norm(exact_engine.vectors, axis=1), 1.0)
+
+
+def test_search_returns_nearest_first(exact_engine: ExactSearchEngine) -> None:
+    ids, distances = exact_engine.search([[0.9, 0.3, 0.0]], n_results=2)
+
+    assert ids == [["north", "east"]]
+    assert distances[0][0] < distances[0][1]
+
+
+def test_search_identical_vector_has_zero_distance(
+    exact_engine: ExactSearchEngine,
+) -> None:
+    _, distances = exact_engine.search([[0.0, 0.0, 1.0]], n_results=1)
+
+    assert distances == [[0.0]]
+
+
+def test_search_multiple_queries(exact_engine: ExactSearchEngine) -> None:
+    ids, _ = exact_engine.search([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]], n_results=1)
+
+    assert ids == [["north"], ["up"]]
+
+
+def test_search_restricted_to_track_ids(exact_engine: ExactSearchEngine) -> None:
+    ids, _ = exact_engine.search(
+        [[1.0, 0.0, 0.0]], n_results=5, track_ids=["east", "up", "unknown"]
+    )
+
+    assert sorted(ids[0]) == ["east", "up"]
+
+
+def test_search_empty_engine() -> None:
+    assert ExactSearchEngine().search([[1.0, 0.0]], n_results=3) == ([[]], [[]])
+
+
+def test_add_overwrites_existing_id(exact_engine: ExactSearchEngine) -> None:
+    exact_engine.add(["north"], [[0.0, -1.0, 0.0]])
+
+    ids, _ = exact_engine.search([[0.0, -1.0, 0.0]], n_results=1)
+    assert exact_engine.size == 3
+    assert ids == [["north"]]
+
+
+def test_add_grows_matrix(exact_engine: ExactSearchEngine) -> None:
+    exact_engine.add(
+        [f"track-{i}" for i in range(10)], np.ones((10, 3), dtype=np.float32)
+    )
+
+    assert exact_engine.size == 13
+    _, distances = exact_engine.search([[1.0, 1.0, 1.0]], n_results=1)
+    assert distances[0] == pytest.approx([0.0], abs=1e-6)
+
+
+def test_delete_moves_last_row_into_gap(exact_engine: ExactSearchEngine) -> None:
+    exact_engine.delete(["north", "missing"])
+
+    assert exact_engine.ids == ["up", "east"]
+    ids, _ = exact_engine.search([[0.0, 0.0, 1.0]], n_results=3)
+    assert ids == [["up", "east"]]
+
+
+def test_get_returns_normalized_rows(exact_engine: ExactSearchEngine) -> None:
+    np.testing.assert_allclose(exact_engine.get(["up", "missing"]), [[0.0, 0.0, 1.0]])
+
+
+def test_dimension_mismatch_raises(exact_engine: ExactSearchEngine) -> None:
+    with pytest.raises(ValueError, match="dimension"):
+        exact_engine.add(["flat"], [[1.0, 0.0]])
+
+
+@pytest.mark.parametrize(("quantization", "reduction"), [("float16", 2), ("int8", 3.5)])
+def test_quantization_reduces_memory(
+    quantization: Quantization, reduction: float
+) -> None:
+    embeddings = np.random.default_rng(0).standard_normal((100, 768))
+    ids = [f"track-{i}" for i in range(100)]
+    full, quantized = ExactSearchEngine(), ExactSearchEngine(quantization=quantization)
+    full.load(ids, embeddings)
+    quantized.load(ids, embeddings)
+
+    assert full.nbytes / quantized.nbytes >= reduction
+    np.testing.assert_allclose(quantized.vectors, full.vectors, atol=1e-2)
+
+
+@pytest.mark.parametrize("quantization", ["float16", "int8"])
+def test_quantized_search_keeps_order(quantization: Quantization) -> None:
+    engine = ExactSearchEngine(quantization=quantization)
+    engine.load(
+        ["north", "east", "up"],
+        [[2.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 3.0]],
+    )
+    engine.delete(["north"])
+
+    ids, distances = engine.search([[0.1, 0.3, 0.9]], n_results=3)
+    assert ids == [["up", "east"]]
+    assert distances[0][0] < distances[0][1]
+    np.testing.assert_allclose(engine.get(["up"]), [[0.0, 0.0, 1.0]], atol=1e-2)
+
+
+def test_rescore_ranks_candidates_by_float32_distance() -> None:
+    ids, distances = rescore(
+        [[1.0, 0.1, 0.0]],
+        [["east", "north", "unknown"]],
+        {"north": np.array([2.0, 0.0, 0.0]), "east": np.array([0.0, 1.0, 0.0])},
+        n_results=1,
+    )
+
+    assert ids == [["north"]]
+    assert distances[0] == pytest.approx([1 - 1 / np.sqrt(1.01)], abs=1e-6)
@@ -0,0 +1,203 @@
+import numpy as np
+import pytest
+
+from spotify_vibe_searcher.infrastructure.vectordb import FaissVectorStore
+
+pytest.importorskip("faiss")
+
+
+def test_empty_store(faiss_store: FaissVectorStore) -> None:
+    assert faiss_store.count() == 0
+    assert faiss_store.get() == []
+    assert faiss_store.query([[1.0, 0.0, 0.0]], n_results=3) == [[]]
+
+
+@pytest.mark.usefixtures("_populate_faiss_store")
+def test_query_returns_nearest_first(faiss_store: FaissVectorStore) -> None:
+    results = faiss_store.query([[0.9, 0.3, 0.0], [0.0, 0.0, 1.0]], n_results=2)
+
+    assert [match.id for match in results[0]] == ["north", "east"]
+    assert results[0][0].document == "Pointing north"
+    assert results[0][0].metadata["artist_names"] == "Compass"
+    assert results[1][0].id == "up"
+    assert results[1][0].distance == pytest.approx(0.0, abs=1e-6)
+
+
+@pytest.mark.usefixtures("_populate_faiss_store")
+def test_query_with_ids_and_where(faiss_store: FaissVectorStore) -> None:
+    by_ids = faiss_store.query([[1.0, 0.0, 0.0]], n_results=3, ids=["east", "up"])
+    by_where = faiss_store.query(
+        [[1.0, 0.0, 0.0]], n_results=3, where={"artist_names": "Compass"}
+    )
+    combined = faiss_store.query(
+        [[1.0, 0.0, 0.0]],
+        n_results=3,
+        where={"artist_names": "Compass", "has_lyrics": False},
+    )
+
+    assert {match.id for match in by_ids[0]} == {"east", "up"}
+    assert [match.id for match in by_where[0]] == ["north", "east"]
+    assert [match.id for match in combined[0]] == ["east"]
+
+
+@pytest.mark.usefixtures("_populate_faiss_store")
+def test_query_includes_embeddings(faiss_store: FaissVectorStore) -> None:
+    match = faiss_store.query([[1.0, 0.0, 0.0]], n_results=1, include_embeddings=True)
+    assert match[0][0].embedding is not None
+    np.testing.assert_allclose(match[0][0].embedding, [2.0, 0.0, 0.0])
+
+
+@pytest.mark.usefixtures("_populate_faiss_store")
+def test_add_skips_existing_and_upsert_overwrites(
+    faiss_store: FaissVectorStore,
+) -> None:
+    faiss_store.add(["north"], [[0.0, -1.0, 0.0]], ["Ignored"], [{"track_id": "x"}])
+    assert faiss_store.get(ids=["north"])[0].document == "Pointing north"
+
+    faiss_store.upsert(
+        ["north"], [[0.0, -1.0, 0.0]], ["Pointing south"], [{"track_id": "north"}]
+    )
+
+    assert faiss_store.count() == 3
+    assert faiss_store.query([[0.0, -1.0, 0.0]], n_results=1)[0][0].document == (
+        "Pointing south"
+    )
+
+
+@pytest.mark.usefixtures("_populate_faiss_store")
+def test_update_metadata_keeps_embeddings(faiss_store: FaissVectorStore) -> None:
+    faiss_store.update_metadata(["up"], [{"track_id": "up", "popularity": 5}])
+
+    (record,) = faiss_store.get(ids=["up"], include_embeddings=True)
+    assert record.metadata == {"track_id": "up", "popularity": 5}
+    assert record.document == "Pointing up"
+    assert record.embedding.tolist() == [0.0, 0.0, 1.0]  # type: ignore[union-attr]
+    assert faiss_store.query([[0.0, 0.0, 1.0]], n_results=1)[0][0].id == "up"
+
+
+@pytest.mark.usefixtures("_populate_faiss_store")
+def test_delete_removes_from_index(faiss_store: FaissVectorStore) -> None:
+    faiss_store.delete(["north", "missing"])
+
+    results = faiss_store.query([[1.0, 0.0, 0.0]], n_results=3)
+    assert faiss_store.count() == 2
+    assert {match.id for match in results[0]} == {"east", "up"}
+
+
+@pytest.mark.usefixtures("_populate_faiss_store")
+def test_get_by_ids_and_where(faiss_store: FaissVectorStore) -> None:
+    assert [record.id for record in faiss_store.get()] == ["north", "east", "up"]
+    assert [record.id for record in faiss_store.get(ids=["up", "nope"])] == ["up"]
+    assert [
+        record.id for record in faiss_store.get(where={"artist_names": "Balloon"})
+    ] == ["up"]
+    assert faiss_store.get()[0].embedding is None
+
+
+@pytest.mark.usefixtures("_populate_faiss_store")
+def test_get_pages_with_limit_and_offset(faiss_store: FaissVectorStore) -> None:
+    assert [record.id for record in faiss_store.get(limit=2)] == ["north", "east"]
+    assert [record.id for record in faiss_store.get(offset=1)] == ["east", "up"]
+    assert [
+        record.id
+        for record in faiss_store.get(where={"artist_names": "Compass"}, offset=1)
+    ] == ["east"]
+    assert faiss_store.get(include_documents=False)[0].document == ""
+
+
+@pytest.mark.usefixtures("_populate_faiss_store")
+def test_index_is_persisted_and_reloaded(faiss_store: FaissVectorStore) -> None:
+    faiss_store.query([[1.0, 0.0, 0.0]], n_results=1)
+    assert faiss_store.index_path.exists()
+
+    reopened = FaissVectorStore(
+        collection_name=faiss_store.collection_name,
+        index_type=faiss_store.index_type,
+    )
+    results = reopened.query([[0.0, 1.0, 0.0]], n_results=1)
+    reopened.close()
+
+    assert results[0][0].id == "east"
+
+
+@pytest.mark.usefixtures("_populate_faiss_store")
+def test_stale_index_is_rebuilt(faiss_store: FaissVectorStore) -> None:
+    faiss_store.query([[1.0, 0.0, 0.0]], n_results=1)
+    stale = FaissVectorStore(
+        collection_name=faiss_store.collection_name,
+        index_type=faiss_store.index_type,
+    )
+    faiss_store.delete(["north"])
+
+    results = stale.query([[1.0, 0.0, 0.0]], n_results=3)
+    stale.close()
+
+    assert "north" not in {match.id for match in results[0]}
+
+
+@pytest.mark.usefixtures("_populate_faiss_store")
+def test_additions_are_saved_lazily(faiss_store: FaissVectorStore) -> None:
+    faiss_store.query([[1.0, 0.0, 0.0]], n_results=1)  # Builds and saves the index
+    saved = faiss_store.index_path.read_bytes()
+
+    faiss_store.add(
+        ids=["down"],
+        embeddings=[[0.0, 0.0, -1.0]],
+        documents=["Pointing down"],
+        metadatas=[{"track_id": "down"}],
+    )
+    reopened = FaissVectorStore(
+        collection_name=faiss_store.collection_name,
+        index_type=faiss_store.index_type,
+    )
+    saved_before_load = faiss_store.index_path.read_bytes()
+    results = reopened.query([[0.0, 0.0, -1.0]], n_results=1)
+    reopened.close()
+
+    assert saved_before_load == saved
+    assert results[0][0].id == "down"
+
+
+def test_ivf_lists_are_retrained_as_the_library_grows(
+    faiss_store: FaissVectorStore,
+) -> None:
+    if faiss_store.index_type != "ivf":
+        pytest.skip("Only IVF indexes are trained")
+    faiss = pytest.importorskip("faiss")
+    rng = np.random.default_rng(0)
+
+    def add(start: int, count: int) -> None:
+        ids = [f"track-{i}" for i in range(start, start + count)]
+        faiss_store.add(
+            ids=ids,
+            embeddings=rng.standard_normal((count, 8)).tolist(),
+            documents=ids,
+            metadatas=[{"track_id": track_id} for track_id in ids],
+        )
+
+    add(0, 10)
+    assert faiss.extract_index_ivf(faiss_store.index).nlist == 1
+
+    add(10, 70)  # 80 tracks call for two lists
+
+    retrained = faiss.extract_index_ivf(faiss_store.index)
+    assert retrained.nlist == 2
+    assert retrained.ntotal == 80
+
+
+def test_collection_metadata_round_trip(faiss_store: FaissVectorStore) -> None:
+    faiss_store.update_collection_metadata({"embedding_dimension": 256})
+    faiss_store.update_collection_metadata({"embedding_dimension": 128})
+
+    assert faiss_store.get_collection_metadata() == {"embedding_dimension": 128}
+
+
+@pytest.mark.usefixtures("_populate_faiss_store")
+def test_drop_removes_records_and_index(faiss_store: FaissVectorStore) -> None:
+    faiss_store.query([[1.0, 0.0, 0.0]])  # Builds and saves the index
+
+    faiss_store.drop()
+
+    assert not faiss_store.records_path.exists()
+    assert not faiss_store.index_path.exists()
+    assert faiss_store.count() == 0
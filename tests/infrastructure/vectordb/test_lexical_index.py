@@ -0,0 +1,120 @@
+import pytest
+
+from spotify_vibe_searcher.infrastructure.vectordb import LexicalDocument, LexicalIndex
+
+
+@pytest.mark.usefixtures("_populate_lexical_index")
+def test_search_ranks_exact_terms_first(lexical_index: LexicalIndex) -> None:
+    matches = lexical_index.search("christmas", n_results=10)
+
+    assert [match.track_id for match in matches] == ["christmas"]
+    assert matches[0].score > 0
+
+
+@pytest.mark.usefixtures("_populate_lexical_index")
+def test_search_matches_any_term(lexical_index: LexicalIndex) -> None:
+    matches = lexical_index.search("metallica love", n_results=10)
+
+    assert {match.track_id for match in matches} == {"metal", "indie"}
+
+
+@pytest.mark.usefixtures("_populate_lexical_index")
+def test_search_respects_n_results(lexical_index: LexicalIndex) -> None:
+    matches = lexical_index.search("song track love metal", n_results=1)
+
+    assert len(matches) == 1
+
+
+@pytest.mark.usefixtures("_populate_lexical_index")
+@pytest.mark.parametrize(
+    "query",
+    ['"unbalanced quote', "AND OR NOT", "metal*) (", "***"],
+    ids=["quote", "operators", "syntax", "punctuation_only"],
+)
+def test_search_tolerates_fts_syntax_in_query(
+    lexical_index: LexicalIndex, query: str
+) -> None:
+    assert isinstance(lexical_index.search(query), list)
+
+
+@pytest.mark.usefixtures("_populate_lexical_index")
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("Last Christmas", True),
+        ("metallica", True),
+        ("for emma forever ago", True),
+        ("i gave you my heart", True),
+        ("my heart", False),
+        ("sad songs about heartbreak", False),
+        ("love", False),
+        ("Christmas", False),
+    ],
+    ids=[
+        "title",
+        "artist",
+        "album",
+        "lyric_line",
+        "short_lyric",
+        "vibe",
+        "one_word_vibe",
+        "word_of_title",
+    ],
+)
+def test_has_exact_match(
+    lexical_index: LexicalIndex, query: str, expected: bool
+) -> None:
+    assert lexical_index.has_exact_match(query) is expected
+
+
+@pytest.mark.usefixtures("_populate_lexical_index")
+def test_upsert_replaces_existing_document(lexical_index: LexicalIndex) -> None:
+    lexical_index.upsert([
+        LexicalDocument(track_id="metal", track_name="Enter Sandman")
+    ])
+
+    assert lexical_index.count() == 3
+    assert not lexical_index.search("puppets")
+    assert lexical_index.search("sandman")[0].track_id == "metal"
+
+
+@pytest.mark.usefixtures("_populate_lexical_index")
+def test_delete_removes_documents(lexical_index: LexicalIndex) -> None:
+    lexical_index.delete(["christmas", "indie"])
+
+    assert lexical_index.count() == 1
+    assert not lexical_index.search("christmas")
+
+
+@pytest.mark.usefixtures("_populate_lexical_index")
+def test_clear_removes_all_documents(lexical_index: LexicalIndex) -> None:
+    lexical_index.clear()
+
+    assert lexical_index.count() == 0
+
+
+@pytest.mark.usefixtures("_populate_lexical_index")
+def test_update_metadata_keeps_vibes_and_lyrics(lexical_index: LexicalIndex) -> None:
+    lexical_index.update_metadata([
+        LexicalDocument(track_id="metal", track_name="Enter Sandman"),
+        LexicalDocument(track_id="unknown", track_name="Unknown"),
+    ])
+
+    assert lexical_index.count() == 3
+    assert lexical_index.has_exact_match("enter sandman")
+    assert lexical_index.search("addiction")[0].track_id == "metal"
+    assert lexical_index.search("strings")[0].track_id == "metal"
+
+
+@pytest.mark.usefixtures("_populate_lexical_index")
+def test_index_without_row_table_is_migrated(lexical_index: LexicalIndex) -> None:
+    with lexical_index.connection as connection:
+        connection.execute('DROP TABLE "tracks_rows"')
+    lexical_index.close()
+
+    lexical_index.upsert([
+        LexicalDocument(track_id="metal", track_name="Enter Sandman")
+    ])
+
+    assert lexical_index.count() == 3
+    assert not lexical_index.search("puppets")
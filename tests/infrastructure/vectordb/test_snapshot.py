@@ -0,0 +1,88 @@
+import pathlib
+
+import numpy as np
+import pytest
+
+from spotify_vibe_searcher.domain import EnrichedTrack
+from spotify_vibe_searcher.infrastructure import VectorDBRepository
+from spotify_vibe_searcher.infrastructure.vectordb import Snapshot
+
+
+@pytest.fixture
+def snapshot_path(tmp_path: pathlib.Path) -> pathlib.Path:
+    return tmp_path / "snapshot"
+
+
+def test_snapshot_round_trip(
+    vectordb_repository: VectorDBRepository,
+    enriched_tracks_batch: list[EnrichedTrack],
+    snapshot_path: pathlib.Path,
+) -> None:
+    vectordb_repository.add_tracks(enriched_tracks_batch, np.eye(3, 4))
+    exported = vectordb_repository.get_all_tracks()
+    list(vectordb_repository.export_snapshot(snapshot_path))
+
+    vectordb_repository.reset()
+    progress = list(vectordb_repository.import_snapshot(snapshot_path, batch_size=1))
+
+    assert [(step.current, step.total) for step in progress] == [(1, 2), (2, 2)]
+    assert vectordb_repository.embedding_dimension == 4
+    imported = {
+        record.id: record
+        for record in vectordb_repository.get_tracks(
+            [record.id for record in exported], include_embeddings=True
+        )
+    }
+    for record in exported:
+        assert imported[record.id].document == record.document
+        assert imported[record.id].metadata == record.metadata
+    assert imported[enriched_tracks_batch[1].track_id].embedding.tolist() == [  # type: ignore[union-attr]
+        0.0,
+        1.0,
+        0.0,
+        0.0,
+    ]
+    track_name = enriched_tracks_batch[0].track.track.name
+    assert vectordb_repository.search_lexical(track_name)[0].track_id == (
+        enriched_tracks_batch[0].track_id
+    )
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings")
+def test_export_streams_batches(
+    vectordb_repository: VectorDBRepository, snapshot_path: pathlib.Path
+) -> None:
+    progress = list(vectordb_repository.export_snapshot(snapshot_path, batch_size=2))
+
+    assert [step.current for step in progress] == [2, 3]
+    manifest = Snapshot(path=snapshot_path).read_manifest()
+    assert (manifest.count, manifest.collection) == (3, "tracks")
+    assert np.load(snapshot_path / "embeddings.npy").shape == (3, 3)
+
+
+def test_import_refuses_other_embedding_model(
+    vectordb_repository: VectorDBRepository,
+    enriched_tracks_batch: list[EnrichedTrack],
+    snapshot_path: pathlib.Path,
+) -> None:
+    vectordb_repository.add_tracks(enriched_tracks_batch, np.eye(3, 4))
+    list(vectordb_repository.export_snapshot(snapshot_path))
+    manifest_path = Snapshot(path=snapshot_path).manifest_path
+    manifest_path.write_text(
+        manifest_path.read_text().replace(
+            vectordb_repository.embedding_model, "other-model"
+        )
+    )
+
+    with pytest.raises(ValueError, match="other-model"):
+        list(vectordb_repository.import_snapshot(snapshot_path))
+
+
+def test_incomplete_snapshot_is_refused(
+    vectordb_repository: VectorDBRepository, snapshot_path: pathlib.Path
+) -> None:
+    snapshot_path.mkdir()
+    (snapshot_path / "records.jsonl").write_text("")
+
+    with pytest.raises(ValueError, match="No complete snapshot"):
+        list(vectordb_repository.import_snapshot(snapshot_path))
@@ -1,23 +1,80 @@
 # pylint: disable=protected-access
+import re
+from unittest.mock import MagicMock
+
+import numpy as np
 import pytest
+from polyfactory.factories.pydantic_factory import ModelFactory
 
-from spotify_vibe_searcher.domain import EnrichedTrack
+from spotify_vibe_searcher.domain import EnrichedTrack, SavedTrack, TrackSummary
 from spotify_vibe_searcher.infrastructure import VectorDBRepository
+from spotify_vibe_searcher.infrastructure.vectordb import (
+    ChromaVectorStore,
+    FaissVectorStore,
+    UpsertResult,
+)
+from spotify_vibe_searcher.infrastructure.vectordb.config import (
+    METADATA_HASH_KEY,
+    WRITE_VERSION_KEY,
+)
+from spotify_vibe_searcher.utils import Settings
+
+
+def test_store_lazy_loading(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    assert vectordb_repository._store is None
+    store = vectordb_repository.store
+    assert vectordb_repository._store is store
+    assert isinstance(store, ChromaVectorStore)
+
+
+def test_embedding_client_lazy_loading(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    assert vectordb_repository._embedding_client is None
+    client = vectordb_repository.embedding_client
+    assert vectordb_repository.embedding_client is client
+
+
+def test_embed_documents_reads_through_cache(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    embedding_client = MagicMock()
+    embedding_client.embed.side_effect = lambda documents, _model: np.ones(
+        (len(documents), 4), dtype=np.float32
+    )
+    vectordb_repository._embedding_client = embedding_client
+
+    vectordb_repository.embed_documents(["calm", "loud"])
+    embeddings = vectordb_repository.embed_documents(["loud", "calm", "new"])
+
+    assert embeddings.shape == (3, 4)
+    assert [call.args[0] for call in embedding_client.embed.call_args_list] == [
+        ["calm", "loud"],
+        ["new"],
+    ]
 
 
-def test_client_lazy_loading(
+def test_queries_stay_out_of_the_embedding_cache(
     vectordb_repository: VectorDBRepository,
 ) -> None:
-    assert vectordb_repository._client is None
-    client = vectordb_repository.client
-    assert vectordb_repository._client is client
+    embedding_client = MagicMock()
+    embedding_client.embed.side_effect = lambda documents, _model: np.ones(
+        (len(documents), 4), dtype=np.float32
+    )
+    vectordb_repository._embedding_client = embedding_client
+
+    assert vectordb_repository.embed_queries(["calm piano"]) == [[1.0] * 4]
 
+    assert vectordb_repository.embedding_cache.count() == 0
 
-def test_collection_creation(
+
+@pytest.mark.usefixtures("_faiss_backend")
+def test_store_selected_by_backend_setting(
     vectordb_repository: VectorDBRepository,
 ) -> None:
-    collection = vectordb_repository.collection
-    assert collection.name == "tracks"
+    assert isinstance(vectordb_repository.store, FaissVectorStore)
 
 
 @pytest.mark.vcr
@@ -25,24 +82,24 @@ def test_add_track_with_vibe_description(
     vectordb_repository: VectorDBRepository,
     enriched_track_with_vibe: EnrichedTrack,
 ) -> None:
-    initial_count = vectordb_repository.collection.count()
+    initial_count = vectordb_repository.count_tracks()
     vectordb_repository.add_track(enriched_track_with_vibe)
 
-    assert vectordb_repository.collection.count() == initial_count + 1
-    result = vectordb_repository.collection.get(ids=[enriched_track_with_vibe.track_id])
-    assert len(result["ids"]) == 1
-    assert result["ids"][0] == enriched_track_with_vibe.track_id
-    assert result["metadatas"][0]["track_id"] == enriched_track_with_vibe.track_id
+    assert vectordb_repository.count_tracks() == initial_count + 1
+    records = vectordb_repository.store.get(ids=[enriched_track_with_vibe.track_id])
+    assert len(records) == 1
+    assert records[0].id == enriched_track_with_vibe.track_id
+    assert records[0].metadata["track_id"] == enriched_track_with_vibe.track_id
 
 
 def test_add_track_without_vibe_skips(
     vectordb_repository: VectorDBRepository,
     enriched_track_without_vibe: EnrichedTrack,
 ) -> None:
-    initial_count = vectordb_repository.collection.count()
+    initial_count = vectordb_repository.count_tracks()
     vectordb_repository.add_track(enriched_track_without_vibe)
 
-    assert vectordb_repository.collection.count() == initial_count
+    assert vectordb_repository.count_tracks() == initial_count
 
 
 @pytest.mark.vcr
@@ -50,9 +107,167 @@ def test_add_tracks_batch(
     vectordb_repository: VectorDBRepository,
     enriched_tracks_batch: list[EnrichedTrack],
 ) -> None:
-    initial_count = vectordb_repository.collection.count()
+    initial_count = vectordb_repository.count_tracks()
+    vectordb_repository.add_tracks(enriched_tracks_batch)
+    assert vectordb_repository.count_tracks() == initial_count + 2
+    assert vectordb_repository.collection_version is not None
+
+
+def test_add_tracks_with_precomputed_embeddings(
+    vectordb_repository: VectorDBRepository,
+    enriched_tracks_batch: list[EnrichedTrack],
+) -> None:
+    embeddings = np.eye(3, dtype=np.float32)
+
+    vectordb_repository.add_tracks(enriched_tracks_batch, embeddings)
+
+    stored = vectordb_repository.get_tracks(
+        [track.track_id for track in enriched_tracks_batch], include_embeddings=True
+    )
+    assert {record.id: record.embedding.tolist() for record in stored} == {  # type: ignore[union-attr]
+        enriched_tracks_batch[0].track_id: [1.0, 0.0, 0.0],
+        enriched_tracks_batch[1].track_id: [0.0, 1.0, 0.0],
+    }
+
+
+def test_add_tracks_skips_unchanged_and_refreshes_metadata(
+    vectordb_repository: VectorDBRepository,
+    enriched_tracks_batch: list[EnrichedTrack],
+) -> None:
+    embedding_client = MagicMock()
+    embedding_client.embed.side_effect = lambda documents, _model: np.ones(
+        (len(documents), 3), dtype=np.float32
+    )
+    vectordb_repository._embedding_client = embedding_client
+    first, second = enriched_tracks_batch[:2]
+    vectordb_repository.add_tracks([first, second])
+    version = vectordb_repository.collection_version
+
+    unchanged = vectordb_repository.add_tracks([first, second])
+    assert unchanged == UpsertResult(unchanged=2)
+    assert vectordb_repository.collection_version == version
+
+    first.track.track.popularity = 99
+    second.vibe_description = "A brand new vibe"
+    result = vectordb_repository.add_tracks([first, second])
+
+    assert result == UpsertResult(updated=1, refreshed=1)
+    assert [call.args[0] for call in embedding_client.embed.call_args_list] == [
+        ["Generic vibe 1", "Generic vibe 2"],
+        ["A brand new vibe"],
+    ]
+    stored = {
+        record.id: record
+        for record in vectordb_repository.get_tracks([first.track_id, second.track_id])
+    }
+    assert stored[first.track_id].metadata["popularity"] == 99
+    assert stored[second.track_id].document == "A brand new vibe"
+    assert vectordb_repository.count_tracks() == 2
+
+
+def test_refresh_metadata_updates_changed_tracks_only(
+    vectordb_repository: VectorDBRepository,
+    enriched_tracks_batch: list[EnrichedTrack],
+    saved_track_factory: ModelFactory[SavedTrack],
+) -> None:
+    first, second = enriched_tracks_batch[:2]
+    vectordb_repository.add_tracks([first, second], np.eye(2, 3))
+    first.track.track.popularity = 7
+
+    result = vectordb_repository.refresh_metadata([
+        TrackSummary.from_saved_track(first.track),
+        TrackSummary.from_saved_track(second.track),
+        TrackSummary.from_saved_track(saved_track_factory.build()),
+    ])
+
+    assert result == UpsertResult(refreshed=1, unchanged=1)
+    (record,) = vectordb_repository.get_tracks([first.track_id])
+    assert record.metadata["popularity"] == 7
+    # The vibe description is still recognized as unchanged
+    assert vectordb_repository.add_tracks([first]) == UpsertResult(unchanged=1)
+
+
+def test_refresh_metadata_updates_lexical_index(
+    vectordb_repository: VectorDBRepository,
+    enriched_tracks_batch: list[EnrichedTrack],
+) -> None:
+    track = enriched_tracks_batch[0]
+    vectordb_repository.add_tracks([track], np.eye(1, 3))
+    track.track.track.name = "Xylophone Serenade"
+
+    vectordb_repository.refresh_metadata([TrackSummary.from_saved_track(track.track)])
+
+    assert vectordb_repository.has_exact_match("xylophone serenade")
+
+
+def test_metadata_hash_ignores_genre_order(
+    vectordb_repository: VectorDBRepository,
+    saved_track_factory: ModelFactory[SavedTrack],
+) -> None:
+    summary = TrackSummary.from_saved_track(saved_track_factory.build())
+
+    metadata = [
+        vectordb_repository._track_metadata(
+            summary._replace(genres=genres), has_lyrics=True
+        )
+        for genres in ("rock, pop, indie", "indie, rock, pop")
+    ]
+
+    assert metadata[0][METADATA_HASH_KEY] == metadata[1][METADATA_HASH_KEY]
+    assert metadata[0]["genres"] == "indie, pop, rock"
+
+
+@pytest.mark.vcr
+@pytest.mark.usefixtures("_matryoshka_dimension")
+def test_add_tracks_truncates_embeddings(
+    vectordb_repository: VectorDBRepository,
+    enriched_tracks_batch: list[EnrichedTrack],
+) -> None:
     vectordb_repository.add_tracks(enriched_tracks_batch)
-    assert vectordb_repository.collection.count() == initial_count + 2
+
+    assert vectordb_repository.embedding_dimension == 256
+    assert vectordb_repository.store.get_collection_metadata() == {
+        "embedding_dimension": 256,
+        "embedding_model": Settings.EMBEDDING_MODEL,
+        WRITE_VERSION_KEY: vectordb_repository.collection_version,
+    }
+    embeddings = [
+        record.embedding
+        for record in vectordb_repository.store.get(include_embeddings=True)
+        if record.embedding is not None
+    ]
+    assert np.asarray(embeddings).shape == (2, 256)
+    np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), 1.0, rtol=1e-5)
+
+
+@pytest.mark.usefixtures("_matryoshka_dimension")
+def test_truncate_renormalizes_prefix(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    vectors = np.zeros((1, 768))
+    vectors[0, :2] = [3.0, 4.0]
+    vectors[0, 300] = 12.0
+
+    truncated = vectordb_repository._truncate(vectors)
+
+    assert truncated.shape == (1, 256)
+    np.testing.assert_allclose(truncated[0, :2], [0.6, 0.8])
+
+    with pytest.raises(ValueError, match="exceeds"):
+        vectordb_repository._truncate(np.ones((1, 128)))
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings")
+def test_mismatched_dimensions_are_refused(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    vectordb_repository.store.update_collection_metadata({"embedding_dimension": 3})
+
+    with pytest.raises(ValueError, match="Query embedding has 2 dimensions"):
+        vectordb_repository.search_by_embedding([1.0, 0.0])
+    with pytest.raises(ValueError, match="Cannot add 256-d embeddings"):
+        vectordb_repository._record_dimension(256)
+    assert len(vectordb_repository.search_by_embedding([1.0, 0.0, 0.0], 1)) == 1
 
 
 @pytest.mark.vcr
@@ -61,12 +276,10 @@ def test_delete_tracks(
     vectordb_repository: VectorDBRepository,
     enriched_track_with_vibe: EnrichedTrack,
 ) -> None:
-    result = vectordb_repository.collection.get(ids=[enriched_track_with_vibe.track_id])
-    assert len(result["ids"]) == 1
+    assert vectordb_repository.track_exists(enriched_track_with_vibe.track_id)
 
     vectordb_repository.delete_tracks([enriched_track_with_vibe.track_id])
-    result = vectordb_repository.collection.get(ids=[enriched_track_with_vibe.track_id])
-    assert len(result["ids"]) == 0
+    assert not vectordb_repository.track_exists(enriched_track_with_vibe.track_id)
 
 
 @pytest.mark.vcr
@@ -80,9 +293,7 @@ def test_delete_multiple_tracks(
     ]
 
     vectordb_repository.delete_tracks(track_ids)
-    result = vectordb_repository.collection.get(ids=track_ids)
-
-    assert len(result["ids"]) == 0
+    assert not vectordb_repository.store.get(ids=track_ids)
 
 
 @pytest.mark.vcr
@@ -94,13 +305,11 @@ def test_search_by_vibe_finds_matching_tracks(
         "sad songs about heartbreak", n_results=3
     )
 
-    assert "ids" in results
-    assert "documents" in results
-    assert "metadatas" in results
-    assert "distances" in results
-
-    assert len(results["ids"][0]) > 0
-    assert len(results["documents"][0]) > 0
+    assert len(results) > 0
+    assert all(match.document for match in results)
+    assert [match.distance for match in results] == sorted(
+        match.distance for match in results
+    )
 
 
 @pytest.mark.vcr
@@ -111,7 +320,7 @@ def test_search_by_vibe_returns_correct_number_of_results(
     """Test that search respects the n_results parameter."""
     results = vectordb_repository.search_by_vibe("energetic music", n_results=2)
 
-    assert len(results["ids"][0]) <= 2
+    assert len(results) <= 2
 
 
 @pytest.mark.vcr
@@ -120,8 +329,7 @@ def test_search_by_vibe_empty_collection(
 ) -> None:
     results = vectordb_repository.search_by_vibe("any query", n_results=10)
 
-    assert len(results["ids"][0]) == 0
-    assert len(results["documents"][0]) == 0
+    assert results == []
 
 
 @pytest.mark.vcr
@@ -131,8 +339,8 @@ def test_search_by_vibe_returns_metadata(
 ) -> None:
     results = vectordb_repository.search_by_vibe("happy upbeat songs", n_results=3)
 
-    if len(results["metadatas"][0]) > 0:
-        metadata = results["metadatas"][0][0]
+    if results:
+        metadata = results[0].metadata
         assert "track_id" in metadata
         assert "track_name" in metadata
         assert "artist_names" in metadata
@@ -144,8 +352,8 @@ def test_search_by_vibe_returns_metadata(
 def test_get_all_tracks(
     vectordb_repository: VectorDBRepository,
 ) -> None:
-    results = vectordb_repository.get_all_tracks()
-    assert len(results["ids"]) > 0
+    records = vectordb_repository.get_all_tracks()
+    assert len(records) > 0
 
 
 @pytest.mark.vcr
@@ -174,3 +382,438 @@ def test_track_exists(
     vectordb_repository.add_track(enriched_track_with_vibe)
 
     assert vectordb_repository.track_exists(enriched_track_with_vibe.track_id)
+
+
+@pytest.mark.vcr("test_delete_tracks.yaml")
+@pytest.mark.usefixtures("_populate_with_single_track")
+def test_existing_track_ids(
+    vectordb_repository: VectorDBRepository,
+    enriched_track_with_vibe: EnrichedTrack,
+) -> None:
+    track_id = enriched_track_with_vibe.track_id
+
+    assert vectordb_repository.existing_track_ids([track_id, "missing"]) == {track_id}
+    assert vectordb_repository.existing_track_ids([]) == set()
+
+
+@pytest.mark.vcr
+def test_add_track_updates_lexical_index(
+    vectordb_repository: VectorDBRepository,
+    enriched_track_with_vibe: EnrichedTrack,
+) -> None:
+    vectordb_repository.add_track(enriched_track_with_vibe)
+
+    matches = vectordb_repository.search_lexical("testing embeddings")
+    assert [match.track_id for match in matches] == [enriched_track_with_vibe.track_id]
+
+    vectordb_repository.delete_tracks([enriched_track_with_vibe.track_id])
+    assert not vectordb_repository.search_lexical("testing embeddings")
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings")
+def test_search_by_embeddings_returns_one_row_per_query(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    results = vectordb_repository.search_by_embeddings(
+        [[0.9, 0.1, 0.0], [0.0, 0.1, 0.9]], n_results=1
+    )
+
+    assert [[match.id for match in matches] for matches in results] == [
+        ["north"],
+        ["up"],
+    ]
+    assert results[0][0].embedding is None
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings")
+def test_search_by_embedding_restricted_to_track_ids(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    results = vectordb_repository.search_by_embedding(
+        [1.0, 0.0, 0.0], n_results=3, track_ids=["east", "up"], include_embeddings=True
+    )
+
+    assert {match.id for match in results} == {"east", "up"}
+    assert all(match.embedding is not None for match in results)
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings")
+def test_exact_engine_matches_hnsw_results(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    queries = [[0.9, 0.2, 0.1], [0.1, 0.2, 0.9]]
+    hnsw_results = vectordb_repository.search_by_embeddings(queries, n_results=3)
+
+    Settings.VECTOR_SEARCH_ENGINE = "exact"
+    try:
+        exact_results = vectordb_repository.search_by_embeddings(queries, n_results=3)
+    finally:
+        Settings.VECTOR_SEARCH_ENGINE = "hnsw"
+
+    for exact_matches, hnsw_matches in zip(exact_results, hnsw_results, strict=True):
+        assert [m.id for m in exact_matches] == [m.id for m in hnsw_matches]
+        assert [m.metadata for m in exact_matches] == [m.metadata for m in hnsw_matches]
+        np.testing.assert_allclose(
+            [m.distance for m in exact_matches],
+            [m.distance for m in hnsw_matches],
+            atol=1e-5,
+        )
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings", "_exact_search_engine")
+def test_exact_engine_restricted_with_embeddings(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    results = vectordb_repository.search_by_embedding(
+        [1.0, 0.0, 0.0], n_results=3, track_ids=["east", "up"], include_embeddings=True
+    )
+
+    assert {match.id for match in results} == {"east", "up"}
+    assert all(match.embedding is not None for match in results)
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings", "_exact_search_engine")
+def test_exact_engine_follows_deletes(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    assert vectordb_repository.search_by_embedding([1.0, 0.0, 0.0], 1)[0].id == "north"
+
+    vectordb_repository.delete_tracks(["north"])
+
+    assert vectordb_repository.exact_engine.size == 2
+    results = vectordb_repository.search_by_embedding([1.0, 0.0, 0.0], 3)
+    assert "north" not in {match.id for match in results}
+
+
+@pytest.mark.usefixtures(
+    "_populate_with_embeddings", "_exact_search_engine", "_int8_quantization"
+)
+def test_quantized_exact_engine_rescores_in_float32(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    results = vectordb_repository.search_by_embedding(
+        [0.9, 0.3, 0.0], n_results=2, include_embeddings=True
+    )
+
+    assert vectordb_repository.exact_engine.quantization == "int8"
+    assert [match.id for match in results] == ["north", "east"]
+    np.testing.assert_allclose(
+        [match.distance for match in results],
+        [1 - 0.9 / np.sqrt(0.9), 1 - 0.3 / np.sqrt(0.9)],
+        atol=1e-6,
+    )
+    assert results[0].embedding is not None
+    np.testing.assert_allclose(results[0].embedding, [1.0, 0.0, 0.0])
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings")
+def test_collection_version_bumped_on_delete(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    version = vectordb_repository.collection_version
+
+    vectordb_repository.delete_tracks(["north"])
+
+    assert vectordb_repository.collection_version != version
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings")
+def test_collection_version_is_reused_within_ttl(
+    vectordb_repository: VectorDBRepository, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(Settings, "COLLECTION_VERSION_TTL", 60.0)
+    version = vectordb_repository.collection_version
+
+    VectorDBRepository().delete_tracks(["east"])
+    assert vectordb_repository.collection_version == version
+
+    # The process's own writes are seen at once
+    vectordb_repository.delete_tracks(["north"])
+    assert vectordb_repository.collection_version != version
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings", "_uncached_collection_version")
+def test_collection_version_follows_writes_of_other_processes(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    version = vectordb_repository.collection_version
+    vectordb_repository.browse_tracks(sort_by="popularity")
+
+    # A separate repository stands in for the snapshot CLI or another replica
+    VectorDBRepository().delete_tracks(["east"])
+
+    assert vectordb_repository.collection_version != version
+    page = vectordb_repository.browse_tracks(sort_by="popularity")
+    assert [record.id for record in page.records] == ["north", "up"]
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings")
+def test_browse_tracks_pages_in_storage_order(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    first = vectordb_repository.browse_tracks(limit=2)
+    second = vectordb_repository.browse_tracks(limit=2, offset=2)
+
+    assert (first.total, first.offset, second.offset) == (3, 0, 2)
+    assert len(first.records) == 2
+    assert len(second.records) == 1
+    assert {record.id for record in first.records + second.records} == {
+        "north",
+        "east",
+        "up",
+    }
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings")
+def test_browse_tracks_sorted_by_metadata(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    descending = vectordb_repository.browse_tracks(sort_by="popularity")
+    ascending = vectordb_repository.browse_tracks(
+        limit=1, offset=1, sort_by="popularity", descending=False
+    )
+
+    # Tracks without the field come last in either direction
+    assert [record.id for record in descending.records] == ["east", "north", "up"]
+    assert [record.id for record in ascending.records] == ["east"]
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings")
+def test_browse_tracks_without_documents(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    page = vectordb_repository.browse_tracks(
+        sort_by="popularity", include_documents=False
+    )
+
+    assert [record.document for record in page.records] == ["", "", ""]
+    assert page.records[0].metadata["popularity"] == 90
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings")
+def test_browse_tracks_sort_order_follows_writes(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    vectordb_repository.browse_tracks(sort_by="popularity")
+
+    vectordb_repository.delete_tracks(["east"])
+
+    page = vectordb_repository.browse_tracks(sort_by="popularity")
+    assert [record.id for record in page.records] == ["north", "up"]
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings", "_exact_search_engine")
+def test_reset_empties_collection_and_derived_indexes(
+    vectordb_repository: VectorDBRepository,
+    enriched_tracks_batch: list[EnrichedTrack],
+) -> None:
+    vectordb_repository.search_by_embedding([1.0, 0.0, 0.0], n_results=1)
+    version = vectordb_repository.collection_version
+
+    vectordb_repository.reset()
+
+    assert vectordb_repository.count_tracks() == 0
+    assert vectordb_repository.lexical_index.count() == 0
+    assert vectordb_repository.embedding_dimension is None
+    assert vectordb_repository.collection_version != version
+    assert not vectordb_repository.search_by_embedding([1.0, 0.0, 0.0])
+
+    # The recreated collection accepts embeddings of any size again
+    vectordb_repository.add_tracks(enriched_tracks_batch, np.eye(2, 4))
+    assert vectordb_repository.count_tracks() == 2
+    assert vectordb_repository.embedding_dimension == 4
+
+
+@pytest.mark.usefixtures("_faiss_backend", "_populate_with_embeddings")
+def test_faiss_backend_reset(vectordb_repository: VectorDBRepository) -> None:
+    vectordb_repository.reset()
+
+    assert vectordb_repository.count_tracks() == 0
+    assert not vectordb_repository.search_by_embedding([1.0, 0.0, 0.0])
+
+
+@pytest.mark.usefixtures("_populate_with_embeddings")
+def test_embedding_matrix_backfilled_from_store(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    ids, vectors = vectordb_repository.embedding_matrix.read()
+
+    assert sorted(ids) == ["east", "north", "up"]
+    assert vectors.shape == (3, 3)
+
+
+@pytest.mark.usefixtures("_embedding_matrix_enabled", "_exact_search_engine")
+def test_embedding_matrix_follows_writes(
+    vectordb_repository: VectorDBRepository,
+    enriched_tracks_batch: list[EnrichedTrack],
+) -> None:
+    first, second = enriched_tracks_batch[:2]
+    vectordb_repository.add_tracks([first, second], np.eye(2, 3))
+    vectordb_repository.delete_tracks([first.track_id])
+
+    ids, vectors = vectordb_repository.embedding_matrix.read()
+    assert ids == [second.track_id]
+    np.testing.assert_array_equal(vectors, [[0.0, 1.0, 0.0]])
+    # The exact engine is loaded from the matrix
+    results = vectordb_repository.search_by_embedding([0.0, 1.0, 0.0])
+    assert [match.id for match in results] == [second.track_id]
+
+    vectordb_repository.reset()
+    assert vectordb_repository.embedding_matrix.read()[0] == []
+
+
+@pytest.mark.usefixtures("_faiss_backend", "_populate_with_embeddings")
+def test_faiss_backend_search_by_embeddings(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    results = vectordb_repository.search_by_embeddings(
+        [[0.9, 0.1, 0.0], [0.0, 0.1, 0.9]], n_results=1
+    )
+
+    assert [[match.id for match in matches] for matches in results] == [
+        ["north"],
+        ["up"],
+    ]
+    assert results[0][0].metadata["artist_names"] == "Compass"
+
+
+@pytest.mark.usefixtures("_multi_tenant")
+def test_user_libraries_are_partitioned(
+    enriched_tracks_batch: list[EnrichedTrack],
+) -> None:
+    alice = VectorDBRepository(user_id="alice")
+    bob = VectorDBRepository(user_id="bob.smith")
+    alice.add_tracks(enriched_tracks_batch, np.eye(3, 3))
+    bob.add_tracks(enriched_tracks_batch[:1], np.eye(1, 3))
+
+    assert alice.base_collection == "tracks__u_alice"
+    assert re.fullmatch(r"tracks__h_[0-9a-f]{16}", bob.base_collection)
+    assert (alice.count_tracks(), bob.count_tracks()) == (2, 1)
+    assert [
+        match.id for match in bob.search_by_embedding([0.0, 1.0, 0.0], n_results=5)
+    ] == [enriched_tracks_batch[0].track_id]
+
+    bob.reset()
+
+    assert (alice.count_tracks(), bob.count_tracks()) == (2, 0)
+    assert alice.lexical_index.count() == 2
+
+
+@pytest.mark.usefixtures("_multi_tenant")
+def test_for_user_shares_one_repository_per_user() -> None:
+    alice = VectorDBRepository.for_user("alice")
+
+    assert VectorDBRepository.for_user("alice") is alice
+    assert VectorDBRepository.for_user("bob") is not alice
+    assert VectorDBRepository.for_user(None).user_id is None
+
+    Settings.MULTI_TENANT = False
+    assert VectorDBRepository.for_user("carol") is VectorDBRepository.for_user(None)
+
+
+@pytest.mark.usefixtures("_multi_tenant")
+def test_active_collections_are_tracked_per_user() -> None:
+    shared, alice = VectorDBRepository(), VectorDBRepository(user_id="alice")
+
+    shared._activate_collection("tracks_v2", shared._make_store("tracks_v2"))
+    alice._activate_collection(
+        "tracks__u_alice_v2", alice._make_store("tracks__u_alice_v2")
+    )
+
+    assert VectorDBRepository().active_collection == "tracks_v2"
+    assert VectorDBRepository(user_id="alice").active_collection == "tracks__u_alice_v2"
+    assert VectorDBRepository(user_id="bob").active_collection == "tracks__u_bob"
+
+
+@pytest.mark.usefixtures("_multi_tenant")
+def test_user_collections_never_look_like_migrated_ones() -> None:
+    shared = VectorDBRepository()
+    shared._activate_collection("tracks_v2", shared._make_store("tracks_v2"))
+
+    # A user named "v2" must not share the migrated default library
+    assert VectorDBRepository(user_id="v2").active_collection == "tracks__u_v2"
+    assert VectorDBRepository(user_id="v2")._next_collection_name() == (
+        "tracks__u_v2_v2"
+    )
+    assert shared._next_collection_name() == "tracks_v3"
+
+
+def test_migrate_embeddings_switches_collection(
+    migrating_repository: VectorDBRepository,
+    enriched_track_with_vibe: EnrichedTrack,
+) -> None:
+    old_ids = [record.id for record in migrating_repository.get_all_tracks()]
+    assert migrating_repository.needs_migration
+    assert migrating_repository.embedding_model != Settings.EMBEDDING_MODEL
+
+    migration = migrating_repository.migrate_embeddings(batch_size=1)
+    first = next(migration)
+    # Writes during the migration still go to (and are served from) the old
+    # collection, and are carried over before the switch
+    migrating_repository.add_track(enriched_track_with_vibe)
+    migrating_repository.delete_tracks([old_ids[1]])
+    assert migrating_repository.active_collection == "tracks"
+    assert migrating_repository.embedding_dimension == 3
+    progress = [first, *migration]
+
+    assert [(p.current, p.total) for p in progress] == [(1, 2), (2, 2)]
+    assert migrating_repository.active_collection == "tracks_v2"
+    assert VectorDBRepository().active_collection == "tracks_v2"
+    assert not migrating_repository.needs_migration
+    assert migrating_repository.embedding_dimension == 5
+    assert sorted(r.id for r in migrating_repository.get_all_tracks()) == sorted([
+        old_ids[0],
+        enriched_track_with_vibe.track_id,
+    ])
+    assert "tracks" not in {
+        collection.name
+        for collection in migrating_repository.store.client.list_collections()
+    }
+
+
+def test_migrate_embeddings_carries_over_changed_tracks(
+    migrating_repository: VectorDBRepository,
+    enriched_tracks_batch: list[EnrichedTrack],
+) -> None:
+    described, refreshed = enriched_tracks_batch[:2]
+
+    migration = migrating_repository.migrate_embeddings(batch_size=2)
+    next(migration)  # Both tracks are copied
+    described.vibe_description = "A brand new vibe"
+    refreshed.track.track.popularity = 1
+    migrating_repository.add_tracks([described, refreshed])
+    list(migration)
+
+    stored = {
+        record.id: record
+        for record in migrating_repository.get_tracks(
+            [described.track_id, refreshed.track_id], include_embeddings=True
+        )
+    }
+    assert stored[described.track_id].document == "A brand new vibe"
+    assert stored[described.track_id].embedding.shape == (5,)  # type: ignore[union-attr]
+    assert stored[refreshed.track_id].metadata["popularity"] == 1
+
+
+def test_other_processes_follow_a_finished_migration(
+    migrating_repository: VectorDBRepository,
+) -> None:
+    # A separate repository stands in for another replica with a cached store
+    replica = VectorDBRepository()
+    assert replica.count_tracks() == 2
+
+    list(migrating_repository.migrate_embeddings())
+
+    assert replica.store.collection_name == "tracks_v2"
+    assert replica.count_tracks() == 2
+    assert not replica.needs_migration
+
+
+@pytest.mark.usefixtures("_chroma_http", "_populate_with_embeddings")
+def test_repository_searches_through_chroma_server(
+    vectordb_repository: VectorDBRepository,
+) -> None:
+    results = vectordb_repository.search_by_embedding([0.9, 0.1, 0.0], n_results=2)
+
+    assert [match.id for match in results] == ["north", "east"]
+    assert vectordb_repository.count_tracks() == 3
@@ -1,6 +1,16 @@
-from spotify_vibe_searcher.infrastructure import GeniusClient, SpotifyClient
+from collections.abc import Generator
+
+import pytest
+
+from spotify_vibe_searcher.infrastructure import (
+    AsyncSpotifyClient,
+    GeniusClient,
+    SpotifyClient,
+    VectorDBRepository,
+)
 from spotify_vibe_searcher.injections import Container, container
 from spotify_vibe_searcher.services import LibrarySyncService
+from spotify_vibe_searcher.utils import Settings
 
 
 def test_container_initialization() -> None:
@@ -29,3 +39,54 @@ def test_library_sync_service_creation() -> None:
 
     service = container.services.library_sync_service()
     assert isinstance(service, LibrarySyncService)
+    assert isinstance(service.spotify_client, AsyncSpotifyClient)
+
+
+def test_search_services_share_result_cache() -> None:
+    first = container.services.search_service()
+    second = container.services.search_service()
+
+    assert first is not second
+    assert first.result_cache is second.result_cache
+
+
+def test_embedding_migration_service_is_shared() -> None:
+    assert (
+        container.services.embedding_migration_service()
+        is container.services.embedding_migration_service()
+    )
+
+
+@pytest.fixture
+def _multi_tenant() -> Generator[None]:
+    original = Settings.MULTI_TENANT
+    Settings.MULTI_TENANT = True
+    yield
+    Settings.MULTI_TENANT = original
+
+
+@pytest.mark.usefixtures("_multi_tenant")
+def test_library_dependencies_follow_the_given_repository() -> None:
+    alice = VectorDBRepository.for_user("alice")
+    bob = VectorDBRepository.for_user("bob")
+
+    alice_search = container.services.search_service(vectordb_repository=alice)
+    alice_migration = container.services.embedding_migration_service(
+        vectordb_repository=alice
+    )
+    alice_sync = container.services.library_sync_service(vectordb_repository=alice)
+    bob_search = container.services.search_service(vectordb_repository=bob)
+
+    assert alice_search.vectordb_repository.base_collection == "tracks__u_alice"
+    assert bob_search.vectordb_repository.base_collection == "tracks__u_bob"
+    assert alice_search.result_cache is not bob_search.result_cache
+    assert (
+        alice_search.result_cache
+        is container.services.search_service(vectordb_repository=alice).result_cache
+    )
+    assert alice_migration.vectordb_repository is alice
+    assert alice_sync.vectordb_repository is alice
+    assert (
+        container.services.embedding_migration_service(vectordb_repository=bob)
+        is not alice_migration
+    )
@@ -0,0 +1,24 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from spotify_vibe_searcher.domain import MigrationProgress
+from spotify_vibe_searcher.infrastructure import VectorDBRepository
+from spotify_vibe_searcher.services import EmbeddingMigrationService
+
+
+@pytest.fixture
+def mock_vectordb_repository() -> MagicMock:
+    repository = MagicMock(spec=VectorDBRepository)
+    repository.migrate_embeddings.return_value = iter([
+        MigrationProgress(current=1, total=2),
+        MigrationProgress(current=2, total=2),
+    ])
+    return repository
+
+
+@pytest.fixture
+def embedding_migration_service(
+    mock_vectordb_repository: MagicMock,
+) -> EmbeddingMigrationService:
+    return EmbeddingMigrationService(vectordb_repository=mock_vectordb_repository)
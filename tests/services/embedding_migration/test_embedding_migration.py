@@ -0,0 +1,27 @@
+from unittest.mock import MagicMock
+
+from spotify_vibe_searcher.services import EmbeddingMigrationService
+
+
+def test_migration_runs_in_background(
+    embedding_migration_service: EmbeddingMigrationService,
+) -> None:
+    assert embedding_migration_service.start()
+    embedding_migration_service.wait(timeout=5)
+
+    assert not embedding_migration_service.running
+    assert embedding_migration_service.progress is not None
+    assert embedding_migration_service.progress.current == 2
+    assert embedding_migration_service.error is None
+
+
+def test_migration_failure_is_reported(
+    embedding_migration_service: EmbeddingMigrationService,
+    mock_vectordb_repository: MagicMock,
+) -> None:
+    mock_vectordb_repository.migrate_embeddings.side_effect = RuntimeError("offline")
+
+    embedding_migration_service.start()
+    embedding_migration_service.wait(timeout=5)
+
+    assert embedding_migration_service.error == "offline"
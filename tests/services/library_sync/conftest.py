@@ -12,7 +12,10 @@ from spotify_vibe_searcher.domain import (
     SpotifyArtist,
     SpotifyTrack,
 )
-from spotify_vibe_searcher.infrastructure import SpotifyClient, VectorDBRepository
+from spotify_vibe_searcher.infrastructure import (
+    AsyncSpotifyClient,
+    VectorDBRepository,
+)
 from spotify_vibe_searcher.injections import container
 from spotify_vibe_searcher.services import LibrarySyncService, TrackAnalysisService
 from spotify_vibe_searcher.utils import Settings
@@ -137,7 +140,7 @@ def realistic_liked_songs(
 def mock_spotify_client(
     realistic_liked_songs: list[SavedTrack],
 ) -> MagicMock:
-    client = MagicMock(spec=SpotifyClient)
+    client = MagicMock(spec=AsyncSpotifyClient)
     client.get_all_liked_songs.return_value = realistic_liked_songs
     return client
 
@@ -146,10 +149,14 @@ def mock_spotify_client(
 def library_sync_service(
     mock_spotify_client: MagicMock,
     vectordb_repository: VectorDBRepository,
-) -> LibrarySyncService:
-    return LibrarySyncService(
+) -> Generator[LibrarySyncService]:
+    # The cassettes were recorded with one vibe description per embed request
+    original_batch_size = Settings.EMBEDDING_BATCH_SIZE
+    Settings.EMBEDDING_BATCH_SIZE = 1
+    yield LibrarySyncService(
         spotify_client=mock_spotify_client,
         genius_client=container.infrastructure.genius_client(),
         track_analysis_service=container.services.track_analysis_service(),
         vectordb_repository=vectordb_repository,
     )
+    Settings.EMBEDDING_BATCH_SIZE = original_batch_size
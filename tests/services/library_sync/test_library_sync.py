@@ -1,9 +1,17 @@
+from collections.abc import Iterable
 from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
 
-from spotify_vibe_searcher.domain import EnrichedTrack, SyncProgress
+from spotify_vibe_searcher.domain import (
+    EnrichedTrack,
+    SavedTrack,
+    SyncProgress,
+    TrackSummary,
+)
 from spotify_vibe_searcher.services import LibrarySyncService
+from spotify_vibe_searcher.utils import Settings
 
 
 @pytest.mark.vcr
@@ -16,6 +24,50 @@ def test_sync_library_yields_progress_and_tracks(
     assert isinstance(results[1], EnrichedTrack)
 
 
+@pytest.mark.vcr("test_sync_library_tracks_with_and_without_lyrics.yaml")
+def test_sync_library_indexes_enriched_tracks(
+    library_sync_service: LibrarySyncService,
+) -> None:
+    results = list(library_sync_service.sync_library(limit=3))
+
+    described = [
+        result.track_id
+        for result in results
+        if isinstance(result, EnrichedTrack) and result.vibe_description
+    ]
+    repository = library_sync_service.vectordb_repository
+    assert described
+    assert repository.count_tracks() == len(described)
+    assert all(repository.track_exists(track_id) for track_id in described)
+
+
+@pytest.mark.vcr("test_sync_library_tracks_with_and_without_lyrics.yaml")
+def test_sync_library_embeds_descriptions_in_batches(
+    library_sync_service: LibrarySyncService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repository = library_sync_service.vectordb_repository
+    embedding_client = MagicMock()
+    embedding_client.embed.side_effect = lambda documents, _model: np.ones(
+        (len(documents), 4), dtype=np.float32
+    )
+    repository._embedding_client = embedding_client  # pylint: disable=protected-access
+
+    monkeypatch.setattr(Settings, "EMBEDDING_BATCH_SIZE", 2)
+    results = list(library_sync_service.sync_library(limit=3))
+
+    described = [
+        result.track_id
+        for result in results
+        if isinstance(result, EnrichedTrack) and result.vibe_description
+    ]
+    assert len(described) == 3
+    assert [len(call.args[0]) for call in embedding_client.embed.call_args_list] == [
+        2,
+        1,
+    ]
+    assert repository.count_tracks() == 3
+
+
 @pytest.mark.vcr
 def test_sync_library_progress_increments(
     library_sync_service: LibrarySyncService,
@@ -97,3 +149,71 @@ def test_sync_library_skips_existing_tracks(
 
     enriched_tracks = [r for r in results if isinstance(r, EnrichedTrack)]
     assert len(enriched_tracks) == 2
+
+
+@pytest.mark.vcr("test_sync_library_skips_existing_tracks.yaml")
+@pytest.mark.usefixtures("_populate_tracks")
+def test_lean_sync_parses_only_new_tracks(
+    library_sync_service: LibrarySyncService,
+    mock_spotify_client: MagicMock,
+    realistic_liked_songs: list[SavedTrack],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    mock_spotify_client.get_all_track_summaries.return_value = [
+        TrackSummary.from_saved_track(track)._replace(genres="")
+        for track in realistic_liked_songs
+    ]
+    mock_spotify_client.get_artists.return_value = [
+        artist for track in realistic_liked_songs for artist in track.track.artists
+    ]
+    requested: list[int] = []
+
+    def liked_songs_at(positions: Iterable[int]) -> list[SavedTrack]:
+        requested.extend(positions)
+        return [realistic_liked_songs[position] for position in requested]
+
+    mock_spotify_client.get_liked_songs_at.side_effect = liked_songs_at
+
+    monkeypatch.setattr(Settings, "SPOTIFY_LEAN_PARSING", True)
+
+    results = list(library_sync_service.sync_library(limit=3))
+
+    mock_spotify_client.get_all_liked_songs.assert_not_called()
+    assert requested == [0, 2]  # Stairway to Heaven is already indexed
+    assert len([r for r in results if isinstance(r, SyncProgress)]) == 3
+    enriched_tracks = [r for r in results if isinstance(r, EnrichedTrack)]
+    assert [t.track_id for t in enriched_tracks] == [
+        realistic_liked_songs[0].track_id,
+        realistic_liked_songs[2].track_id,
+    ]
+    # Genres of indexed tracks are refreshed from the artist details
+    (stored,) = library_sync_service.vectordb_repository.store.get(
+        ids=[realistic_liked_songs[1].track_id]
+    )
+    assert "hard rock" in stored.metadata["genres"]
+
+
+@pytest.mark.vcr("test_sync_library_skips_existing_tracks.yaml")
+@pytest.mark.usefixtures("_populate_tracks")
+def test_lean_sync_rescans_when_the_library_shifts(
+    library_sync_service: LibrarySyncService,
+    mock_spotify_client: MagicMock,
+    realistic_liked_songs: list[SavedTrack],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    mock_spotify_client.get_all_track_summaries.return_value = [
+        TrackSummary.from_saved_track(track) for track in realistic_liked_songs
+    ]
+    # A song liked after the summaries were read moves every position by one
+    mock_spotify_client.get_liked_songs_at.side_effect = lambda positions: [
+        realistic_liked_songs[position - 1] for position in positions
+    ]
+    monkeypatch.setattr(Settings, "SPOTIFY_LEAN_PARSING", True)
+
+    results = list(library_sync_service.sync_library(limit=3))
+
+    mock_spotify_client.get_all_liked_songs.assert_called_once_with(max_tracks=3)
+    assert [r.track_id for r in results if isinstance(r, EnrichedTrack)] == [
+        realistic_liked_songs[0].track_id,
+        realistic_liked_songs[2].track_id,
+    ]
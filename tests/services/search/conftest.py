@@ -1,13 +1,16 @@
 # pylint: disable=line-too-long, duplicate-code
 import pathlib
 from collections.abc import Generator
+from unittest.mock import AsyncMock, MagicMock
 
+import numpy as np
 import pytest
 from polyfactory.factories.pydantic_factory import ModelFactory
 
 from spotify_vibe_searcher.domain import EnrichedTrack, SavedTrack
 from spotify_vibe_searcher.infrastructure import LLMClient, VectorDBRepository
-from spotify_vibe_searcher.services import SearchService
+from spotify_vibe_searcher.infrastructure.vectordb import LexicalMatch, VectorMatch
+from spotify_vibe_searcher.services import SearchService, SemanticResultCache
 from spotify_vibe_searcher.utils import Settings
 
 
@@ -28,7 +31,9 @@ def llm_client() -> LLMClient:
 @pytest.fixture
 def search_service(vectordb_repository: VectorDBRepository) -> SearchService:
     return SearchService(
-        vectordb_repository=vectordb_repository, llm_client=LLMClient()
+        vectordb_repository=vectordb_repository,
+        llm_client=LLMClient(),
+        result_cache=SemanticResultCache(),
     )
 
 
@@ -62,3 +67,132 @@ def _populate_search_tracks(vectordb_repository: VectorDBRepository) -> None:
     ]
 
     vectordb_repository.add_tracks(tracks)
+
+
+@pytest.fixture
+def _populate_seed_tracks(vectordb_repository: VectorDBRepository) -> None:
+    """Two seeds on the x and y axes with neighbours near each and in between."""
+    embeddings = {
+        "north": [1.0, 0.0, 0.0],
+        "east": [0.0, 1.0, 0.0],
+        "nearly_north": [1.0, 0.05, 0.0],
+        "nearly_east": [0.05, 1.0, 0.0],
+        "northeast": [0.7, 0.7, 0.1],
+        "up": [0.0, 0.0, 1.0],
+    }
+    vectordb_repository.store.add(
+        ids=list(embeddings),
+        embeddings=list(embeddings.values()),
+        documents=[f"Vibe of {track_id}" for track_id in embeddings],
+        metadatas=[
+            {
+                "track_id": track_id,
+                "track_name": track_id.title(),
+                "artist_names": "Compass",
+                "album_name": "Album",
+                "genres": "pop",
+                "popularity": 50,
+                "spotify_url": f"https://open.spotify.com/track/{track_id}",
+            }
+            for track_id in embeddings
+        ],
+    )
+
+
+@pytest.fixture
+def seed_search_service(
+    vectordb_repository: VectorDBRepository, mock_llm_client: MagicMock
+) -> SearchService:
+    return SearchService(
+        vectordb_repository=vectordb_repository,
+        llm_client=mock_llm_client,
+        result_cache=SemanticResultCache(),
+    )
+
+
+def _matches(
+    track_ids: list[str],
+    artists: list[str] | None = None,
+    embeddings: list[list[float]] | None = None,
+) -> list[VectorMatch]:
+    artists = artists or ["Artist"] * len(track_ids)
+    return [
+        VectorMatch(
+            id=track_id,
+            document=f"Vibe of {track_id}",
+            metadata={
+                "track_name": track_id,
+                "artist_names": artist,
+                "album_name": "Album",
+                "genres": "pop",
+                "popularity": 50,
+                "spotify_url": f"https://open.spotify.com/track/{track_id}",
+            },
+            distance=0.1 * (i + 1),
+            embedding=np.asarray(embeddings[i]) if embeddings else None,
+        )
+        for i, (track_id, artist) in enumerate(zip(track_ids, artists, strict=True))
+    ]
+
+
+def _batch_matches(
+    embeddings: list[list[float]], n_results: int, **_: object
+) -> list[list[VectorMatch]]:
+    """One distinct match per query embedding, as a multi-query lookup returns."""
+    return [_matches([f"track-{i}"]) for i, _ in enumerate(embeddings)]
+
+
+@pytest.fixture
+def mock_vectordb_repository() -> MagicMock:
+    """Repository stub where "both" is found by both retrievers."""
+    repository = MagicMock(spec=VectorDBRepository)
+    repository.embed_query.return_value = [0.1, 0.2, 0.3]
+    repository.has_exact_match.return_value = False
+    repository.search_lexical.return_value = [
+        LexicalMatch(track_id="lexical", score=4.0),
+        LexicalMatch(track_id="both", score=2.0),
+    ]
+    repository.search_by_embedding.side_effect = (
+        lambda embedding, n_results, track_ids=None, **_: _matches(
+            track_ids or ["vector", "both"]
+        )
+    )
+    repository.embed_queries.side_effect = lambda queries: [
+        [float(i), 1.0, 0.0] for i, _ in enumerate(queries)
+    ]
+    repository.search_by_embeddings.side_effect = _batch_matches
+    return repository
+
+
+@pytest.fixture
+def mock_llm_client() -> MagicMock:
+    llm_client = MagicMock(spec=LLMClient)
+    llm_client.generate = AsyncMock(return_value="refined vibe query")
+    return llm_client
+
+
+@pytest.fixture
+def hybrid_search_service(
+    mock_vectordb_repository: MagicMock, mock_llm_client: MagicMock
+) -> SearchService:
+    return SearchService(
+        vectordb_repository=mock_vectordb_repository,
+        llm_client=mock_llm_client,
+        result_cache=SemanticResultCache(),
+    )
+
+
+@pytest.fixture
+def near_duplicate_results() -> list[VectorMatch]:
+    """Three near-identical tracks by one artist, then two distinct ones."""
+    return _matches(
+        ["a1", "a2", "a3", "b1", "c1"],
+        artists=["Artist A", "Artist A", "Artist A", "Artist B", "Artist C"],
+        embeddings=[
+            [1.0, 0.0, 0.0],
+            [0.99, 0.01, 0.0],
+            [0.98, 0.02, 0.0],
+            [0.6, 0.8, 0.0],
+            [0.6, 0.0, 0.8],
+        ],
+    )
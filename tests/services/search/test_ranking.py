@@ -0,0 +1,97 @@
+import numpy as np
+
+from spotify_vibe_searcher.services.ranking import (
+    maximal_marginal_relevance,
+    reciprocal_rank_fusion,
+    rocchio,
+)
+
+
+def test_reciprocal_rank_fusion_promotes_shared_items() -> None:
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["d", "c", "e"]])
+
+    assert fused[0] == "c"
+    assert set(fused) == {"a", "b", "c", "d", "e"}
+
+
+def test_reciprocal_rank_fusion_keeps_single_ranking_order() -> None:
+    assert reciprocal_rank_fusion([["a", "b", "c"]]) == ["a", "b", "c"]
+
+
+def test_reciprocal_rank_fusion_empty() -> None:
+    assert not reciprocal_rank_fusion([[], []])
+
+
+def test_mmr_relevance_only_keeps_relevance_order() -> None:
+    relevance = np.array([0.5, 0.9, 0.7])
+    embeddings = np.eye(3)
+
+    assert maximal_marginal_relevance(relevance, embeddings, 3, lambda_mult=1.0) == [
+        1,
+        2,
+        0,
+    ]
+
+
+def test_mmr_skips_near_duplicates() -> None:
+    relevance = np.array([0.9, 0.89, 0.8])
+    embeddings = np.array([[1.0, 0.0], [1.0, 0.01], [0.0, 1.0]])
+
+    selected = maximal_marginal_relevance(relevance, embeddings, 2, lambda_mult=0.5)
+
+    assert selected == [0, 2]
+
+
+def test_mmr_caps_picks_per_group() -> None:
+    relevance = np.array([0.9, 0.8, 0.7, 0.1])
+    embeddings = np.eye(4)
+
+    selected = maximal_marginal_relevance(
+        relevance,
+        embeddings,
+        4,
+        lambda_mult=1.0,
+        groups=[["a"], ["a"], ["a"], ["b"]],
+        max_per_group=2,
+    )
+
+    assert selected == [0, 1, 3]
+
+
+def test_mmr_counts_picks_against_every_group_of_a_candidate() -> None:
+    relevance = np.array([0.9, 0.8, 0.7, 0.1])
+    embeddings = np.eye(4)
+
+    selected = maximal_marginal_relevance(
+        relevance,
+        embeddings,
+        4,
+        lambda_mult=1.0,
+        groups=[["a", "b"], ["a"], ["b"], ["c"]],
+        max_per_group=1,
+    )
+
+    assert selected == [0, 3]
+
+
+def test_mmr_empty_candidates() -> None:
+    assert not maximal_marginal_relevance(np.array([]), np.empty((0, 3)), 5)
+
+
+def test_rocchio_moves_towards_liked_and_away_from_disliked() -> None:
+    adjusted = rocchio(
+        np.array([1.0, 0.0, 0.0]),
+        relevant=np.array([[0.0, 2.0, 0.0]]),
+        non_relevant=np.array([[0.0, 0.0, 1.0]]),
+        alpha=1.0,
+        beta=1.0,
+        gamma=0.5,
+    )
+
+    np.testing.assert_allclose(adjusted, np.array([1.0, 1.0, -0.5]) / 1.5)
+
+
+def test_rocchio_without_feedback_keeps_query_direction() -> None:
+    empty = np.empty((0, 2))
+
+    np.testing.assert_allclose(rocchio(np.array([3.0, 4.0]), empty, empty), [0.6, 0.8])
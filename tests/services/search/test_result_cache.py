@@ -0,0 +1,54 @@
+from spotify_vibe_searcher.infrastructure.vectordb import VectorMatch
+from spotify_vibe_searcher.services import SemanticResultCache
+
+
+def _matches(*track_ids: str) -> list[VectorMatch]:
+    return [
+        VectorMatch(id=track_id, metadata={}, distance=0.1 * i)
+        for i, track_id in enumerate(track_ids)
+    ]
+
+
+def test_identical_query_hits() -> None:
+    cache = SemanticResultCache(max_entries=4, tolerance=0.0)
+    cache.put([1.0, 0.0], 2, version="v0", matches=_matches("a", "b"))
+
+    assert [m.id for m in cache.get([2.0, 0.0], 2, version="v0") or []] == ["a", "b"]
+
+
+def test_near_duplicate_query_within_tolerance_hits() -> None:
+    cache = SemanticResultCache(max_entries=4, tolerance=0.01)
+    cache.put([1.0, 0.0], 2, version="v0", matches=_matches("a", "b"))
+
+    assert cache.get([1.0, 0.1], 2, version="v0") is not None
+    assert cache.get([1.0, 0.5], 2, version="v0") is None
+
+
+def test_larger_cached_search_serves_prefix() -> None:
+    cache = SemanticResultCache(max_entries=4, tolerance=0.0)
+    cache.put([1.0, 0.0], 3, version="v0", matches=_matches("a", "b", "c"))
+
+    assert [m.id for m in cache.get([1.0, 0.0], 1, version="v0") or []] == ["a"]
+    assert cache.get([1.0, 0.0], 5, version="v0") is None
+    assert cache.get([1.0, 0.0], 1, version="v0", include_embeddings=True) is None
+
+
+def test_new_collection_version_invalidates() -> None:
+    cache = SemanticResultCache(max_entries=4, tolerance=0.0)
+    cache.put([1.0, 0.0], 2, version="v0", matches=_matches("a"))
+
+    assert cache.get([1.0, 0.0], 2, version="v1") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = SemanticResultCache(max_entries=2, tolerance=0.0)
+    cache.put([1.0, 0.0], 1, version="v0", matches=_matches("x"))
+    cache.put([0.0, 1.0], 1, version="v0", matches=_matches("y"))
+    cache.get([1.0, 0.0], 1, version="v0")
+
+    cache.put([-1.0, 0.0], 1, version="v0", matches=_matches("z"))
+
+    assert len(cache) == 2
+    assert cache.get([0.0, 1.0], 1, version="v0") is None
+    assert cache.get([1.0, 0.0], 1, version="v0") is not None
@@ -1,7 +1,17 @@
+import pathlib
+from unittest.mock import MagicMock
+
+import numpy as np
 import pytest
 
-from spotify_vibe_searcher.domain import SearchResults
+from spotify_vibe_searcher.domain import SearchMode, SearchResults, SeedStrategy
+from spotify_vibe_searcher.infrastructure.vectordb import (
+    LexicalDocument,
+    LexicalIndex,
+    VectorMatch,
+)
 from spotify_vibe_searcher.services import SearchService
+from spotify_vibe_searcher.utils import Settings
 
 
 @pytest.mark.vcr
@@ -41,3 +51,313 @@ async def test_empty_results_returns_valid_domain_model(
     assert result.total_results == 0
     assert not result.has_results
     assert result.query == "nonexistent vibe"
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_fuses_lexical_and_vector_rankings(
+    hybrid_search_service: SearchService,
+) -> None:
+    result = await hybrid_search_service.search_by_vibe(
+        "christmas", n_results=3, mode=SearchMode.HYBRID
+    )
+
+    track_ids = [search_result.track_id for search_result in result.results]
+    assert track_ids[0] == "both"
+    assert set(track_ids) == {"both", "vector", "lexical"}
+    assert result.total_results == 3
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_fetches_distance_for_lexical_only_hits(
+    hybrid_search_service: SearchService,
+    mock_vectordb_repository: MagicMock,
+) -> None:
+    await hybrid_search_service.search_by_vibe(
+        "christmas", n_results=3, mode=SearchMode.HYBRID
+    )
+
+    mock_vectordb_repository.embed_query.assert_called_once()
+    mock_vectordb_repository.search_by_embedding.assert_called_with(
+        [0.1, 0.2, 0.3], 1, ["lexical"], include_embeddings=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_refines_vibe_queries(
+    hybrid_search_service: SearchService,
+    mock_vectordb_repository: MagicMock,
+    mock_llm_client: MagicMock,
+) -> None:
+    await hybrid_search_service.search_by_vibe(
+        "sad songs about heartbreak", mode=SearchMode.HYBRID
+    )
+
+    mock_llm_client.generate.assert_awaited_once()
+    mock_vectordb_repository.embed_query.assert_called_once_with("refined vibe query")
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_skips_refinement_on_exact_match(
+    hybrid_search_service: SearchService,
+    mock_vectordb_repository: MagicMock,
+    mock_llm_client: MagicMock,
+) -> None:
+    mock_vectordb_repository.has_exact_match.return_value = True
+
+    await hybrid_search_service.search_by_vibe("Last Christmas", mode=SearchMode.HYBRID)
+
+    mock_llm_client.generate.assert_not_awaited()
+    mock_vectordb_repository.embed_query.assert_called_once_with("Last Christmas")
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_refines_one_word_vibe_found_in_a_title(
+    hybrid_search_service: SearchService,
+    mock_vectordb_repository: MagicMock,
+    mock_llm_client: MagicMock,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(Settings, "DATA_DIR", tmp_path)
+    lexical_index = LexicalIndex(table="tracks")
+    lexical_index.upsert([LexicalDocument(track_id="indie", track_name="Skinny Love")])
+    mock_vectordb_repository.has_exact_match.side_effect = lexical_index.has_exact_match
+
+    await hybrid_search_service.search_by_vibe("love", mode=SearchMode.HYBRID)
+    lexical_index.close()
+
+    mock_llm_client.generate.assert_awaited_once()
+    mock_vectordb_repository.embed_query.assert_called_once_with("refined vibe query")
+
+
+@pytest.mark.asyncio
+async def test_diversified_search_caps_tracks_per_artist(
+    hybrid_search_service: SearchService,
+    mock_vectordb_repository: MagicMock,
+    near_duplicate_results: list[VectorMatch],
+) -> None:
+    mock_vectordb_repository.search_by_embedding.side_effect = None
+    mock_vectordb_repository.search_by_embedding.return_value = near_duplicate_results
+
+    result = await hybrid_search_service.search_by_vibe(
+        "sad songs", n_results=4, diversify=True
+    )
+
+    artists = [search_result.artist_names for search_result in result.results]
+    assert artists.count("Artist A") <= Settings.MMR_MAX_PER_ARTIST
+    assert {"Artist B", "Artist C"} <= set(artists)
+    assert result.results[0].track_id == "a1"
+
+
+@pytest.mark.asyncio
+async def test_diversified_search_over_fetches_with_embeddings(
+    hybrid_search_service: SearchService,
+    mock_vectordb_repository: MagicMock,
+    near_duplicate_results: list[VectorMatch],
+) -> None:
+    mock_vectordb_repository.search_by_embedding.side_effect = None
+    mock_vectordb_repository.search_by_embedding.return_value = near_duplicate_results
+
+    await hybrid_search_service.search_by_vibe("sad songs", n_results=2, diversify=True)
+
+    mock_vectordb_repository.search_by_embedding.assert_called_once_with(
+        [0.1, 0.2, 0.3],
+        2 * Settings.MMR_CANDIDATE_FACTOR,
+        include_embeddings=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_many_returns_one_result_per_query(
+    hybrid_search_service: SearchService,
+) -> None:
+    queries = ["sad songs", "party anthems", "rainy day"]
+
+    results = await hybrid_search_service.search_many(queries, n_results=5)
+
+    assert [result.query for result in results] == queries
+    assert [result.results[0].track_id for result in results] == [
+        "track-0",
+        "track-1",
+        "track-2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_many_batches_embedding_and_lookup(
+    hybrid_search_service: SearchService,
+    mock_vectordb_repository: MagicMock,
+    mock_llm_client: MagicMock,
+) -> None:
+    await hybrid_search_service.search_many(["sad songs", "party anthems"])
+
+    assert mock_llm_client.generate.await_count == 2
+    mock_vectordb_repository.embed_queries.assert_called_once_with([
+        "refined vibe query",
+        "refined vibe query",
+    ])
+    mock_vectordb_repository.search_by_embeddings.assert_called_once()
+    mock_vectordb_repository.embed_query.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_many_empty(hybrid_search_service: SearchService) -> None:
+    assert not await hybrid_search_service.search_many([])
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_populate_seed_tracks")
+async def test_search_similar_queries_seed_centroid(
+    seed_search_service: SearchService, mock_llm_client: MagicMock
+) -> None:
+    results = await seed_search_service.search_similar(["north", "east"], n_results=3)
+
+    assert results.query == "More like: North, East"
+    assert [result.track_id for result in results.results] == [
+        "northeast",
+        "nearly_north",
+        "nearly_east",
+    ]
+    mock_llm_client.generate.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_populate_seed_tracks")
+async def test_search_similar_fuses_per_seed_rankings(
+    seed_search_service: SearchService,
+) -> None:
+    results = await seed_search_service.search_similar(
+        ["north", "east"], n_results=2, strategy=SeedStrategy.FUSION
+    )
+
+    assert {result.track_id for result in results.results} == {
+        "nearly_north",
+        "nearly_east",
+    }
+    assert all(result.distance < 0.01 for result in results.results)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_populate_seed_tracks")
+async def test_search_similar_excludes_seeds(
+    seed_search_service: SearchService,
+) -> None:
+    results = await seed_search_service.search_similar(["north"], n_results=10)
+
+    assert results.results[0].track_id == "nearly_north"
+    assert "north" not in {result.track_id for result in results.results}
+    assert results.total_results == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_populate_seed_tracks")
+async def test_search_similar_unknown_seeds(
+    seed_search_service: SearchService,
+) -> None:
+    results = await seed_search_service.search_similar(["missing"])
+
+    assert not results.has_results
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_populate_seed_tracks")
+async def test_refine_with_feedback_follows_liked_tracks(
+    seed_search_service: SearchService, mock_llm_client: MagicMock
+) -> None:
+    results = SearchResults(query="cold", total_results=0, query_embedding=[1, 0, 0])
+
+    refined = await seed_search_service.refine_with_feedback(
+        results, liked=["east"], disliked=["north"], n_results=3
+    )
+
+    assert refined.query == "cold"
+    assert [result.track_id for result in refined.results] == [
+        "northeast",
+        "nearly_north",
+        "nearly_east",
+    ]
+    assert refined.query_embedding is not None
+    np.testing.assert_allclose(
+        refined.query_embedding, np.array([0.85, 0.75, 0.0]) / np.hypot(0.85, 0.75)
+    )
+    mock_llm_client.generate.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_refine_with_feedback_requires_query_embedding(
+    seed_search_service: SearchService,
+) -> None:
+    with pytest.raises(ValueError, match="No query embedding"):
+        await seed_search_service.refine_with_feedback(
+            SearchResults(query="cold", total_results=0), liked=["east"]
+        )
+
+
+@pytest.mark.asyncio
+async def test_search_results_carry_query_embedding(
+    hybrid_search_service: SearchService,
+) -> None:
+    results = await hybrid_search_service.search_by_vibe("sad songs")
+
+    assert results.query_embedding == [0.1, 0.2, 0.3]
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_skips_sampled_refinement(
+    hybrid_search_service: SearchService,
+    mock_vectordb_repository: MagicMock,
+    mock_llm_client: MagicMock,
+) -> None:
+    # Refinement is sampled, so the same query is rewritten differently
+    mock_llm_client.generate.side_effect = ["gloomy ballads", "melancholic songs"]
+    mock_vectordb_repository.embed_query.side_effect = lambda text: (
+        [1.0, 0.0, 0.0] if text == "gloomy ballads" else [0.0, 1.0, 0.0]
+    )
+    mock_vectordb_repository.collection_version = "v0"
+
+    first = await hybrid_search_service.search_by_vibe("sad songs")
+    second = await hybrid_search_service.search_by_vibe("  sad songs ")
+
+    assert second.query_embedding == first.query_embedding
+    mock_llm_client.generate.assert_awaited_once()
+    mock_vectordb_repository.search_by_embedding.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_repeated_search_is_served_from_cache_until_collection_changes(
+    hybrid_search_service: SearchService,
+    mock_vectordb_repository: MagicMock,
+) -> None:
+    mock_vectordb_repository.collection_version = "v0"
+    first = await hybrid_search_service.search_by_vibe("sad songs")
+    second = await hybrid_search_service.search_by_vibe("sad songs")
+
+    assert second.results == first.results
+    mock_vectordb_repository.search_by_embedding.assert_called_once()
+
+    mock_vectordb_repository.collection_version = "v1"
+    await hybrid_search_service.search_by_vibe("sad songs")
+
+    assert mock_vectordb_repository.search_by_embedding.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_search_many_only_queries_cache_misses(
+    hybrid_search_service: SearchService,
+    mock_vectordb_repository: MagicMock,
+    mock_llm_client: MagicMock,
+) -> None:
+    mock_vectordb_repository.collection_version = "v0"
+    await hybrid_search_service.search_many(["sad songs"])
+    mock_vectordb_repository.embed_queries.side_effect = lambda queries: [
+        [1.0, 0.0, 0.0]
+    ]
+
+    results = await hybrid_search_service.search_many(["sad songs", "party"])
+
+    assert len(results) == 2
+    # "sad songs" is neither refined nor embedded again
+    assert mock_llm_client.generate.await_count == 2
+    assert mock_vectordb_repository.embed_queries.call_count == 2
+    misses = mock_vectordb_repository.search_by_embeddings.call_args_list[-1]
+    assert misses.args[0] == [[1.0, 0.0, 0.0]]